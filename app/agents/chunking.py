@@ -0,0 +1,77 @@
+"""Split long press releases into chunks and merge per-chunk enhancements"""
+
+import re
+from typing import Iterable, List, Optional, Sequence
+
+
+def split_paragraphs(content: str) -> List[str]:
+    """Split content on blank lines, dropping empty paragraphs"""
+    return [p.strip() for p in re.split(r"\n\s*\n", content.strip()) if p.strip()]
+
+
+def chunk_paragraphs(paragraphs: Sequence[str], max_chars: int) -> List[str]:
+    """Group consecutive paragraphs into chunks of at most ``max_chars``.
+
+    Paragraphs are never split, so a single paragraph longer than
+    ``max_chars`` becomes a chunk of its own.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for paragraph in paragraphs:
+        if current and size + len(paragraph) > max_chars:
+            chunks.append("\n\n".join(current))
+            current, size = [], 0
+        current.append(paragraph)
+        size += len(paragraph) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _suggestion_key(suggestion: str) -> str:
+    return re.sub(r"\s+", " ", suggestion).strip().rstrip(".!;").casefold()
+
+
+def dedupe_suggestions(groups: Iterable[Iterable[str]]) -> List[str]:
+    """Flatten suggestion lists, dropping case/whitespace/punctuation duplicates"""
+    seen = set()
+    merged = []
+    for group in groups:
+        for suggestion in group:
+            key = _suggestion_key(suggestion)
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(suggestion)
+    return merged
+
+
+def merge_enhancements(enhancements: Sequence, chunks: Sequence[str]):
+    """Reduce per-chunk ``PREnhancement`` results into one for the whole release.
+
+    The headline suggestion comes from the first chunk (the one holding the
+    headline), improved bodies are stitched back together in order (falling
+    back to the original text for chunks without a rewrite), suggestion
+    lists are deduplicated and scores are averaged weighted by chunk length.
+    """
+    if not enhancements:
+        raise ValueError("No enhancements to merge")
+    model = type(enhancements[0])
+
+    improved_body: Optional[str] = None
+    if any(e.improved_body for e in enhancements):
+        improved_body = "\n\n".join(
+            (e.improved_body or chunk).strip() for e, chunk in zip(enhancements, chunks)
+        )
+
+    weights = [max(len(chunk), 1) for chunk in chunks]
+    overall_score = sum(e.overall_score * w for e, w in zip(enhancements, weights)) / sum(weights)
+
+    return model(
+        improved_headline=enhancements[0].improved_headline,
+        improved_body=improved_body,
+        seo_suggestions=dedupe_suggestions(e.seo_suggestions for e in enhancements),
+        grammar_corrections=dedupe_suggestions(e.grammar_corrections for e in enhancements),
+        style_improvements=dedupe_suggestions(e.style_improvements for e in enhancements),
+        overall_score=round(overall_score, 1),
+    )
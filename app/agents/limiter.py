@@ -0,0 +1,323 @@
+"""Per-provider rate limiting and adaptive (AIMD) concurrency for AI calls"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import statistics
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+
+# Provider responses that mean "slow down" rather than "this request is bad"
+THROTTLE_STATUS_CODES = {429, 503, 529}
+
+DEFAULT_OUTPUT_TOKENS = 1024
+
+
+class TokenBucket:
+    """A bucket refilling at ``rate_per_minute`` units, holding at most one minute's worth.
+
+    ``take`` may drive the balance negative (e.g. when a response used more
+    tokens than estimated); later callers then wait for the debt to refill.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (amounts above capacity wait for a full bucket)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= amount
+
+    def credit(self, amount: float) -> None:
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def drain(self) -> None:
+        """Empty the bucket so the next caller waits for a refill"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class ProviderLimiter:
+    """Request/token buckets plus an AIMD concurrency limit for one provider.
+
+    Callers queue in FIFO order until a concurrency slot is free and both
+    buckets hold enough for the request. The concurrency limit grows by
+    roughly one per ``limit`` successful calls and is multiplied by
+    ``backoff`` on a throttling response (429/503/529) or when a call's
+    latency exceeds ``latency_spike_factor`` times the running baseline.
+    Spikes still move the baseline, only more slowly, so a lasting change
+    in latency (a slower model, longer prompts) becomes the new normal and
+    the limit grows back. Decreases are spaced at least ``decrease_interval``
+    apart so one burst of 429s only backs off once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 32,
+        backoff: float = 0.5,
+        latency_spike_factor: float = 2.0,
+        latency_min_samples: int = 10,
+        decrease_interval: float = 1.0,
+        window_size: int = 200,
+    ):
+        self.name = name
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.limit = float(initial_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.backoff = backoff
+        self.latency_spike_factor = latency_spike_factor
+        self.latency_min_samples = latency_min_samples
+        self.decrease_interval = decrease_interval
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.latency_baseline: Optional[float] = None
+        self.latency_samples = 0
+        self.wait_times: Deque[float] = deque(maxlen=window_size)
+        self.requests = 0
+        self.throttled = 0
+        self.backoffs = 0
+        self._last_decrease = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._released: Optional[asyncio.Event] = None
+
+    def _bind(self) -> None:
+        # asyncio primitives belong to one loop; rebuild them if the limiter moves
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._released = asyncio.Event()
+
+    @property
+    def concurrency_limit(self) -> int:
+        return max(self.min_concurrency, int(self.limit))
+
+    def _delay(self, tokens: int) -> float:
+        delays = [0.0]
+        if self.request_bucket is not None:
+            delays.append(self.request_bucket.time_until(1))
+        if self.token_bucket is not None:
+            delays.append(self.token_bucket.time_until(tokens))
+        return max(delays)
+
+    async def _acquire(self, tokens: int) -> None:
+        self._bind()
+        # Holding the lock while waiting keeps callers in arrival order
+        async with self._lock:
+            while True:
+                if self.in_flight >= self.concurrency_limit:
+                    self._released.clear()
+                    await self._released.wait()
+                    continue
+                delay = self._delay(tokens)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+                if self.request_bucket is not None:
+                    self.request_bucket.take(1)
+                if self.token_bucket is not None:
+                    self.token_bucket.take(tokens)
+                self.in_flight += 1
+                return
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0) -> AsyncIterator[None]:
+        """Hold one concurrency slot (and bucket capacity) for the duration of a call"""
+        queued_at = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._acquire(estimated_tokens)
+        finally:
+            self.waiting -= 1
+        self.wait_times.append(time.monotonic() - queued_at)
+        self.requests += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            if self._released is not None:
+                self._released.set()
+
+    def record_success(
+        self,
+        latency: Optional[float] = None,
+        estimated_tokens: int = 0,
+        used_tokens: int = 0
+    ) -> None:
+        """Reconcile token usage and grow the limit, or back off on a latency spike"""
+        if self.token_bucket is not None and used_tokens:
+            self.token_bucket.credit(estimated_tokens - used_tokens)
+
+        if latency is not None:
+            spike = (
+                self.latency_baseline is not None
+                and self.latency_samples >= self.latency_min_samples
+                and latency > self.latency_spike_factor * self.latency_baseline
+            )
+            self.latency_samples += 1
+            if self.latency_baseline is None:
+                self.latency_baseline = latency
+            else:
+                # A spike counts for a fifth of a normal sample: one outlier barely moves the
+                # baseline, but a few dozen in a row mean latency has changed
+                weight = 0.02 if spike else 0.1
+                self.latency_baseline += weight * (latency - self.latency_baseline)
+            if spike:
+                self._decrease()
+                return
+
+        self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+
+    def record_throttled(self) -> None:
+        """The provider pushed back: pause new requests briefly and cut concurrency"""
+        self.throttled += 1
+        if self.request_bucket is not None:
+            self.request_bucket.drain()
+        self._decrease()
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_interval:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_concurrency), self.limit * self.backoff)
+        self.backoffs += 1
+
+    def stats(self) -> Dict[str, Any]:
+        waits = list(self.wait_times)
+        return {
+            "concurrency_limit": self.concurrency_limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "wait_seconds_p50": round(statistics.median(waits), 4) if waits else 0.0,
+            "wait_seconds_p95": round(statistics.quantiles(waits, n=20)[-1], 4) if len(waits) >= 2 else 0.0,
+            "wait_seconds_max": round(max(waits), 4) if waits else 0.0,
+            "latency_baseline": round(self.latency_baseline, 4) if self.latency_baseline is not None else None,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "backoffs": self.backoffs,
+        }
+
+
+def estimate_tokens(
+    messages: list[ModelMessage],
+    model_settings: ModelSettings | None,
+    model_request_parameters: ModelRequestParameters,
+) -> int:
+    """Rough prompt-plus-completion token estimate (~4 characters per token)"""
+    chars = 0
+    for message in messages:
+        for part in message.parts:
+            content = getattr(part, "content", None) or getattr(part, "args", None) or ""
+            chars += len(content if isinstance(content, str) else json.dumps(content, default=str))
+    for tool in model_request_parameters.output_tools + model_request_parameters.function_tools:
+        chars += len(json.dumps(tool.parameters_json_schema))
+    max_tokens = (model_settings or {}).get("max_tokens") or DEFAULT_OUTPUT_TOKENS
+    return chars // 4 + max_tokens
+
+
+def _used_tokens(usage: Any) -> int:
+    return (getattr(usage, "input_tokens", 0) or 0) + (getattr(usage, "output_tokens", 0) or 0)
+
+
+class RateLimitedModel(WrapperModel):
+    """A provider model whose calls go through a ``ProviderLimiter``.
+
+    Throttling errors are recorded and re-raised, so a ``RouterModel``
+    wrapping several limited providers still fails over to the next one.
+    """
+
+    def __init__(self, wrapped: Model, limiter: ProviderLimiter):
+        super().__init__(wrapped)
+        self.limiter = limiter
+
+    @property
+    def base_url(self) -> Optional[str]:
+        return self.wrapped.base_url
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        estimated = estimate_tokens(messages, model_settings, model_request_parameters)
+        async with self.limiter.slot(estimated):
+            started = time.monotonic()
+            try:
+                response = await self.wrapped.request(messages, model_settings, model_request_parameters)
+            except ModelHTTPError as e:
+                if e.status_code in THROTTLE_STATUS_CODES:
+                    self.limiter.record_throttled()
+                raise
+            self.limiter.record_success(time.monotonic() - started, estimated, _used_tokens(response.usage))
+        return response
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        run_context: Any = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        estimated = estimate_tokens(messages, model_settings, model_request_parameters)
+        async with self.limiter.slot(estimated):
+            try:
+                async with self.wrapped.request_stream(
+                    messages, model_settings, model_request_parameters, run_context
+                ) as response:
+                    yield response
+            except ModelHTTPError as e:
+                if e.status_code in THROTTLE_STATUS_CODES:
+                    self.limiter.record_throttled()
+                raise
+            # Stream duration depends on how the caller consumes it, so only usage is reconciled
+            self.limiter.record_success(None, estimated, _used_tokens(response.usage()))
+
+
+provider_limiters: Dict[str, ProviderLimiter] = {}
+
+
+def get_provider_limiter(name: str, **config: Any) -> ProviderLimiter:
+    """The shared limiter for provider ``name``, created with ``config`` on first use"""
+    if name not in provider_limiters:
+        provider_limiters[name] = ProviderLimiter(name, **config)
+    return provider_limiters[name]
+
+
+def limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Queue depth, wait times and concurrency per provider"""
+    return {name: limiter.stats() for name, limiter in provider_limiters.items()}
@@ -3,10 +3,23 @@
 from pydantic_ai import Agent
 from pydantic_ai.models.openai import OpenAIModel
 from pydantic_ai.models.anthropic import AnthropicModel
-from pydantic import BaseModel, Field
-from typing import Optional, List, Union
+from pydantic_ai.providers.openai import OpenAIProvider
+from pydantic_ai.providers.anthropic import AnthropicProvider
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Union, AsyncIterator
 from datetime import datetime
+from functools import lru_cache
 from app.core.config import get_settings
+from app.core.cache import get_response_cache, make_cache_key
+from app.core.concurrency import bounded_as_completed
+from app.agents.chunking import chunk_paragraphs, merge_enhancements, split_paragraphs
+from app.services.readability import overall_score, readability_score
+from app.agents.limiter import RateLimitedModel, get_provider_limiter
+from app.agents.registry import agent_registry, get_http_client
+from app.agents.repair import repair_output, run_with_repair
+from app.agents.router import RouterModel
+from app.agents.streaming import PartialFieldDiffer, StreamEvent, partial_output_args
+from app.agents.telemetry import RunTrace
 
 settings = get_settings()
 
@@ -27,6 +40,12 @@ class PRContent(BaseModel):
     suggested_improvements: List[str] = Field(default_factory=list)
     readability_score: float = Field(..., ge=0, le=100)
 
+    @model_validator(mode="before")
+    @classmethod
+    def repair_constraints(cls, data):
+        """Truncate/normalize fields locally instead of failing validation"""
+        return repair_output(cls, data)
+
 
 class PREnhancement(BaseModel):
     """Suggestions for improving existing press release"""
@@ -37,35 +56,102 @@ class PREnhancement(BaseModel):
     style_improvements: List[str] = Field(default_factory=list)
     overall_score: float = Field(..., ge=0, le=100)
 
+    @model_validator(mode="before")
+    @classmethod
+    def repair_constraints(cls, data):
+        """Clamp the score and normalize fields locally instead of failing validation"""
+        return repair_output(cls, data)
+
+
+def with_rate_limit(provider_name: str, model):
+    """Wrap ``model`` in the shared rate limiter for ``provider_name``"""
+    if not settings.ai_limit_enabled:
+        return model
+    config = {
+        "requests_per_minute": settings.ai_limit_requests_per_minute,
+        "tokens_per_minute": settings.ai_limit_tokens_per_minute,
+        "initial_concurrency": settings.ai_limit_initial_concurrency,
+        "min_concurrency": settings.ai_limit_min_concurrency,
+        "max_concurrency": settings.ai_limit_max_concurrency,
+        "latency_spike_factor": settings.ai_limit_latency_spike_factor,
+        **settings.ai_limit_overrides.get(provider_name, {}),
+    }
+    return RateLimitedModel(model, get_provider_limiter(provider_name, **config))
+
 
 # Configure the model based on available API keys
-def get_ai_model():
-    """Get the appropriate AI model based on configuration"""
+def get_configured_models() -> list:
+    """Build a model for every provider with an API key, in priority order"""
+    models = []
     if settings.openai_api_key:
-        return OpenAIModel(
+        models.append(with_rate_limit("openai", OpenAIModel(
             "gpt-4o-mini",
-            api_key=settings.openai_api_key
-        )
-    elif settings.openrouter_api_key:
+            provider=OpenAIProvider(
+                api_key=settings.openai_api_key,
+                http_client=get_http_client()
+            )
+        )))
+    if settings.openrouter_api_key:
         # OpenRouter uses OpenAI-compatible API
-        return OpenAIModel(
+        models.append(with_rate_limit("openrouter", OpenAIModel(
             settings.pydantic_ai_model,
-            api_key=settings.openrouter_api_key,
-            base_url="https://openrouter.ai/api/v1"
-        )
-    else:
+            provider=OpenAIProvider(
+                base_url="https://openrouter.ai/api/v1",
+                api_key=settings.openrouter_api_key,
+                http_client=get_http_client()
+            )
+        )))
+    if settings.anthropic_api_key or not models:
         # Default to Anthropic if available
-        return AnthropicModel(
+        models.append(with_rate_limit("anthropic", AnthropicModel(
             "claude-3-5-haiku-latest",
-            api_key=settings.anthropic_api_key if hasattr(settings, 'anthropic_api_key') else None
-        )
+            provider=AnthropicProvider(
+                api_key=settings.anthropic_api_key,
+                http_client=get_http_client()
+            )
+        )))
+    return models
+
+
+def get_ai_model():
+    """Get the appropriate AI model based on configuration
+
+    With more than one provider configured (and routing enabled) this is a
+    ``RouterModel`` that sends each request to the fastest healthy provider
+    and fails over between them; otherwise it is the single provider model.
+    """
+    models = get_configured_models()
+    if len(models) == 1 or not settings.ai_router_enabled:
+        return models[0]
+    return RouterModel(
+        *models,
+        hedge=settings.ai_router_hedge_enabled,
+        hedge_min_samples=settings.ai_router_hedge_min_samples,
+        window_size=settings.ai_router_window_size,
+        failure_threshold=settings.ai_router_failure_threshold,
+        cooldown_seconds=settings.ai_router_cooldown_seconds,
+        explore_rate=settings.ai_router_explore_rate
+    )
+
+
+@lru_cache()
+def get_shared_model():
+    """The model shared by every agent, built once on first use"""
+    return get_ai_model()
+
+
+# Rebuilt with the agents, e.g. when the shared HTTP client is closed
+agent_registry.on_reset(get_shared_model.cache_clear)
+
+
+def get_model_identity(model) -> str:
+    """Stable identifier for a model, used to scope cached responses"""
+    return f"{getattr(model, 'system', type(model).__name__)}:{getattr(model, 'model_name', '')}"
 
 
-# Initialize PR Generation Agent
-pr_generator = Agent(
-    model=get_ai_model(),
-    result_type=PRContent,
-    system_prompt="""You are an expert press release writer for Irish businesses.
+# Agents are built lazily through the registry, so importing this module
+# needs no API keys and every agent shares one model and HTTP client
+GENERATOR_SYSTEM_PROMPT = """You are an expert press release writer for Irish businesses.
     Create compelling, newsworthy press releases that follow AP style guidelines.
     Focus on:
     - Clear, impactful headlines
@@ -75,14 +161,25 @@ pr_generator = Agent(
     - SEO optimization for Irish search terms
     Include relevant Irish media angles where appropriate.
     """
-)
 
 
-# Initialize PR Enhancement Agent
-pr_enhancer = Agent(
-    model=get_ai_model(),
-    result_type=PREnhancement,
-    system_prompt="""You are an expert press release editor and SEO specialist.
+def _build_pr_generator() -> Agent:
+    return Agent(
+        model=get_shared_model(),
+        name="pr_generator",
+        output_type=PRContent,
+        output_retries=0,  # Invalid output is repaired or re-asked per field
+        system_prompt=GENERATOR_SYSTEM_PROMPT
+    )
+
+
+def _build_pr_enhancer() -> Agent:
+    return Agent(
+        model=get_shared_model(),
+        name="pr_enhancer",
+        output_type=PREnhancement,
+        output_retries=0,  # Invalid output is repaired or re-asked per field
+        system_prompt="""You are an expert press release editor and SEO specialist.
     Analyze and enhance press releases for Irish businesses to maximize their impact.
     Focus on:
     - Improving headline impact and newsworthiness
@@ -92,18 +189,59 @@ pr_enhancer = Agent(
     - Making content more appealing to Irish journalists
     Provide specific, actionable improvements.
     """
-)
+    )
 
 
-async def generate_press_release(
+def _build_seo_agent() -> Agent:
+    return Agent(
+        model=get_shared_model(),
+        name="seo",
+        output_type=SEOMetadata,
+        output_retries=0,  # Invalid output is repaired or re-asked per field
+        system_prompt="Generate SEO metadata optimized for Irish search queries and news distribution."
+    )
+
+
+agent_registry.register("pr_generator", _build_pr_generator)
+agent_registry.register("pr_enhancer", _build_pr_enhancer)
+agent_registry.register("seo", _build_seo_agent)
+
+
+def get_pr_generator() -> Agent:
+    """PR Generation Agent"""
+    return agent_registry.get("pr_generator")
+
+
+def get_pr_enhancer() -> Agent:
+    """PR Enhancement Agent"""
+    return agent_registry.get("pr_enhancer")
+
+
+def get_seo_agent() -> Agent:
+    """SEO Metadata Agent"""
+    return agent_registry.get("seo")
+
+
+def get_publisher() -> Agent:
+    """Combined press release + SEO metadata Agent"""
+    return agent_registry.get("publisher")
+
+
+def apply_local_scores(content: PRContent) -> PRContent:
+    """Replace the model's self-reported readability score with a local Flesch score"""
+    if settings.ai_local_scoring:
+        content.readability_score = readability_score(content.body)
+    return content
+
+
+def build_generation_prompt(
     company_name: str,
     announcement: str,
     company_info: str,
-    target_audience: str = "Irish media and business community"
-) -> PRContent:
-    """Generate a complete press release using AI"""
-
-    prompt = f"""
+    target_audience: str
+) -> str:
+    """Build the user prompt for press release generation"""
+    return f"""
     Company: {company_name}
     Announcement: {announcement}
     Company Info: {company_info}
@@ -120,12 +258,128 @@ async def generate_press_release(
     Optimize for Irish media distribution.
     """
 
-    result = await pr_generator.run(prompt)
-    return result.data
 
+async def generate_press_release(
+    company_name: str,
+    announcement: str,
+    company_info: str,
+    target_audience: str = "Irish media and business community"
+) -> PRContent:
+    """Generate a complete press release using AI"""
+
+    cache_key = make_cache_key(
+        "generate_press_release",
+        get_model_identity(get_shared_model()),
+        company_name=company_name,
+        announcement=announcement,
+        company_info=company_info,
+        target_audience=target_audience,
+    )
+    if settings.ai_cache_enabled:
+        cached = get_response_cache().get(cache_key)
+        if cached is not None:
+            return PRContent.model_validate(cached)
+
+    prompt = build_generation_prompt(company_name, announcement, company_info, target_audience)
 
-async def enhance_press_release(existing_content: str) -> PREnhancement:
-    """Enhance an existing press release"""
+    content = apply_local_scores(await run_with_repair(get_pr_generator(), prompt, PRContent))
+    if settings.ai_cache_enabled:
+        get_response_cache().set(cache_key, content.model_dump())
+    return content
+
+
+async def stream_press_release(
+    company_name: str,
+    announcement: str,
+    company_info: str,
+    target_audience: str = "Irish media and business community"
+) -> AsyncIterator[StreamEvent]:
+    """Generate a press release, yielding fields as the model produces them.
+
+    Yields ``(event, data)`` pairs: ``field`` events for complete fields,
+    ``delta`` events for body text as it is written, and a final ``done``
+    event carrying the validated ``PRContent``.
+    """
+
+    cache_key = make_cache_key(
+        "generate_press_release",
+        get_model_identity(get_shared_model()),
+        company_name=company_name,
+        announcement=announcement,
+        company_info=company_info,
+        target_audience=target_audience,
+    )
+    differ = PartialFieldDiffer()
+
+    if settings.ai_cache_enabled:
+        cached = get_response_cache().get(cache_key)
+        if cached is not None:
+            content = PRContent.model_validate(cached)
+            for event in differ.feed(content.model_dump(), final=True):
+                yield event
+            yield "done", content.model_dump()
+            return
+
+    prompt = build_generation_prompt(company_name, announcement, company_info, target_audience)
+    agent = get_pr_generator()
+    with RunTrace(agent.name) as trace:
+        async with agent.run_stream(prompt) as result:
+            async for response, _ in result.stream_responses(debounce_by=0.05):
+                partial = partial_output_args(response)
+                if partial:
+                    for event in differ.feed(partial):
+                        yield event
+            content = apply_local_scores(await result.get_output())
+            trace.add_messages(result.all_messages())
+
+    if settings.ai_cache_enabled:
+        get_response_cache().set(cache_key, content.model_dump())
+    for event in differ.feed(content.model_dump(), final=True):
+        yield event
+    yield "done", content.model_dump()
+
+
+async def enhance_press_release(
+    existing_content: str,
+    chunked: Optional[bool] = None,
+    incremental: bool = False
+) -> PREnhancement:
+    """Enhance an existing press release
+
+    Releases longer than ``ai_enhance_chunk_threshold`` characters (or any
+    release when ``chunked`` is true) go through the chunked map-reduce path.
+    With ``incremental`` only paragraphs changed since a previous call are
+    re-sent to the model. ``overall_score`` is computed locally from the
+    submitted text rather than taken from the model.
+    """
+
+    if incremental:
+        enhancement = await enhance_press_release_incremental(existing_content)
+    else:
+        if chunked is None:
+            chunked = len(existing_content) > settings.ai_enhance_chunk_threshold
+        if chunked:
+            enhancement = await enhance_press_release_chunked(existing_content)
+        else:
+            enhancement = await _enhance_whole(existing_content)
+
+    if settings.ai_local_scoring:
+        enhancement.overall_score = overall_score(existing_content)
+    return enhancement
+
+
+async def _enhance_whole(existing_content: str) -> PREnhancement:
+    """Enhance a press release in a single model call"""
+
+    cache_key = make_cache_key(
+        "enhance_press_release",
+        get_model_identity(get_shared_model()),
+        existing_content=existing_content,
+    )
+    if settings.ai_cache_enabled:
+        cached = get_response_cache().get(cache_key)
+        if cached is not None:
+            return PREnhancement.model_validate(cached)
 
     prompt = f"""
     Please analyze and enhance this press release:
@@ -142,8 +396,129 @@ async def enhance_press_release(existing_content: str) -> PREnhancement:
     Score the content quality from 0-100.
     """
 
-    result = await pr_enhancer.run(prompt)
-    return result.data
+    enhancement = await run_with_repair(get_pr_enhancer(), prompt, PREnhancement)
+    if settings.ai_cache_enabled:
+        get_response_cache().set(cache_key, enhancement.model_dump())
+    return enhancement
+
+
+def _chunk_cache_key(chunk: str, is_first: bool) -> str:
+    return make_cache_key(
+        "enhance_press_release_chunk",
+        get_model_identity(get_shared_model()),
+        chunk=chunk,
+        is_first=is_first,
+    )
+
+
+async def _enhance_chunk(chunk: str, index: int, total: int) -> PREnhancement:
+    """Enhance one chunk of a longer press release"""
+
+    cache_key = _chunk_cache_key(chunk, index == 0)
+    if settings.ai_cache_enabled:
+        cached = get_response_cache().get(cache_key)
+        if cached is not None:
+            return PREnhancement.model_validate(cached)
+
+    headline_note = (
+        "It begins with the headline; suggest an improved headline."
+        if index == 0 else
+        "It does not include the headline; leave improved_headline empty."
+    )
+    prompt = f"""
+    Please analyze and enhance section {index + 1} of {total} of a longer press release.
+    {headline_note}
+
+    {chunk}
+
+    Provide specific improvements for:
+    1. Content structure and flow within this section
+    2. SEO optimization for Irish market
+    3. Grammar and style
+
+    Return improved_body as a rewrite of this section only.
+    Score this section's quality from 0-100.
+    """
+
+    enhancement = await run_with_repair(get_pr_enhancer(), prompt, PREnhancement)
+    if settings.ai_cache_enabled:
+        get_response_cache().set(cache_key, enhancement.model_dump())
+    return enhancement
+
+
+async def enhance_press_release_chunked(existing_content: str) -> PREnhancement:
+    """Enhance a long press release chunk by chunk, in parallel
+
+    The release is split on paragraph boundaries into chunks of at most
+    ``ai_enhance_chunk_chars`` characters. Chunks are enhanced concurrently
+    and merged into one ``PREnhancement``, so latency tracks the longest
+    chunk rather than the whole document.
+    """
+
+    chunks = chunk_paragraphs(split_paragraphs(existing_content), settings.ai_enhance_chunk_chars)
+    if len(chunks) <= 1:
+        return await _enhance_whole(existing_content)
+
+    factories = [
+        lambda chunk=chunk, index=index: _enhance_chunk(chunk, index, len(chunks))
+        for index, chunk in enumerate(chunks)
+    ]
+    results: List[Optional[PREnhancement]] = [None] * len(chunks)
+    async for index, enhancement, error in bounded_as_completed(
+        factories, settings.ai_enhance_chunk_concurrency
+    ):
+        if error is not None:
+            raise error
+        results[index] = enhancement
+
+    return merge_enhancements(results, chunks)
+
+
+# Paragraph reuse counters for incremental enhancement
+incremental_stats = {"paragraphs_reused": 0, "paragraphs_sent": 0}
+
+
+async def enhance_press_release_incremental(existing_content: str) -> PREnhancement:
+    """Enhance a draft paragraph by paragraph, re-sending only changed paragraphs
+
+    Each paragraph's enhancement is cached under a hash of its normalized
+    text (and whether it is the opening, headline paragraph). On repeated
+    calls for the same draft, unchanged paragraphs are served from the cache
+    and only edited or new ones reach ``pr_enhancer``, in parallel. Results
+    are merged exactly as in the chunked path. Reuse requires the response
+    cache to be enabled.
+    """
+
+    paragraphs = split_paragraphs(existing_content)
+    if not paragraphs:
+        return await _enhance_whole(existing_content)
+
+    results: List[Optional[PREnhancement]] = [None] * len(paragraphs)
+    changed = []
+    for index, paragraph in enumerate(paragraphs):
+        cached = None
+        if settings.ai_cache_enabled:
+            cached = get_response_cache().get(_chunk_cache_key(paragraph, index == 0))
+        if cached is not None:
+            results[index] = PREnhancement.model_validate(cached)
+        else:
+            changed.append(index)
+
+    incremental_stats["paragraphs_reused"] += len(paragraphs) - len(changed)
+    incremental_stats["paragraphs_sent"] += len(changed)
+
+    factories = [
+        lambda index=index: _enhance_chunk(paragraphs[index], index, len(paragraphs))
+        for index in changed
+    ]
+    async for position, enhancement, error in bounded_as_completed(
+        factories, settings.ai_enhance_chunk_concurrency
+    ):
+        if error is not None:
+            raise error
+        results[changed[position]] = enhancement
+
+    return merge_enhancements(results, paragraphs)
 
 
 class SEOMetadata(BaseModel):
@@ -156,16 +531,16 @@ class SEOMetadata(BaseModel):
     og_type: str = Field(default="article")
     schema_markup: dict = Field(...)
 
+    @model_validator(mode="before")
+    @classmethod
+    def repair_constraints(cls, data):
+        """Truncate titles and dedupe/pad keywords locally instead of failing validation"""
+        return repair_output(cls, data)
+
 
 async def generate_seo_metadata(headline: str, body: str, company: str) -> SEOMetadata:
     """Generate SEO metadata for a press release"""
 
-    seo_agent = Agent(
-        model=get_ai_model(),
-        result_type=SEOMetadata,
-        system_prompt="Generate SEO metadata optimized for Irish search queries and news distribution."
-    )
-
     prompt = f"""
     Headline: {headline}
     Company: {company}
@@ -179,5 +554,82 @@ async def generate_seo_metadata(headline: str, body: str, company: str) -> SEOMe
     - Schema.org NewsArticle markup structure
     """
 
-    result = await seo_agent.run(prompt)
-    return result.data
\ No newline at end of file
+    return await run_with_repair(get_seo_agent(), prompt, SEOMetadata)
+
+
+class PRContentWithSEO(PRContent):
+    """Press release content plus the full SEO metadata, produced in one call"""
+    keywords: List[str] = Field(..., description="5-10 relevant keywords for SEO", min_length=5, max_length=10)
+    og_title: str = Field(..., description="Open Graph title")
+    og_description: str = Field(..., description="Open Graph description")
+    og_type: str = Field(default="article")
+    schema_markup: dict = Field(..., description="Schema.org NewsArticle markup")
+
+    def to_publishable(self) -> "PublishableRelease":
+        """Split into the separate content and SEO models used elsewhere"""
+        content = PRContent.model_validate(self.model_dump(include=set(PRContent.model_fields)))
+        seo = SEOMetadata.model_validate(self.model_dump(include=set(SEOMetadata.model_fields)))
+        return PublishableRelease(content=content, seo=seo)
+
+
+class PublishableRelease(BaseModel):
+    """A press release together with the SEO metadata needed to publish it"""
+    content: PRContent
+    seo: SEOMetadata
+
+
+def _build_publisher() -> Agent:
+    return Agent(
+        model=get_shared_model(),
+        name="publisher",
+        output_type=PRContentWithSEO,
+        output_retries=0,  # Invalid output is repaired or re-asked per field
+        system_prompt=GENERATOR_SYSTEM_PROMPT + """
+    Also produce the release's SEO metadata: Open Graph tags and Schema.org
+    NewsArticle markup consistent with the headline and body you write.
+    """
+    )
+
+
+agent_registry.register("publisher", _build_publisher)
+
+
+async def generate_publishable_release(
+    company_name: str,
+    announcement: str,
+    company_info: str,
+    target_audience: str = "Irish media and business community"
+) -> PublishableRelease:
+    """Generate a press release and its SEO metadata in a single model call
+
+    Replaces calling ``generate_press_release`` followed by
+    ``generate_seo_metadata``, which costs two serial round trips and
+    re-sends the body to the second one.
+    """
+
+    cache_key = make_cache_key(
+        "generate_publishable_release",
+        get_model_identity(get_shared_model()),
+        company_name=company_name,
+        announcement=announcement,
+        company_info=company_info,
+        target_audience=target_audience,
+    )
+    if settings.ai_cache_enabled:
+        cached = get_response_cache().get(cache_key)
+        if cached is not None:
+            return PublishableRelease.model_validate(cached)
+
+    prompt = build_generation_prompt(company_name, announcement, company_info, target_audience) + """
+    Also provide:
+    - 5-10 relevant keywords for Irish market
+    - Open Graph title and description
+    - Schema.org NewsArticle markup structure
+    """
+
+    output = await run_with_repair(get_publisher(), prompt, PRContentWithSEO)
+    release = output.to_publishable()
+    apply_local_scores(release.content)
+    if settings.ai_cache_enabled:
+        get_response_cache().set(cache_key, release.model_dump())
+    return release
@@ -1,8 +1,125 @@
-"""Mock PR Generator for testing without PydanticAI"""
+"""Mock PR Generator for testing without PydanticAI
 
+Responses are canned, but ``simulator`` can make them behave like a real
+provider: latency drawn from a configurable distribution, injected errors
+and paced streaming. It is configured from the ``ai_mock_*`` settings and
+is a no-op by default.
+"""
+
+import asyncio
+import math
+import random
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Awaitable, Callable, Optional, List, AsyncIterator
 from datetime import datetime
+from app.core.config import get_settings
+from app.services.readability import overall_score, readability_score
+from app.agents.chunking import chunk_paragraphs, merge_enhancements, split_paragraphs
+from app.agents.streaming import PartialFieldDiffer, StreamEvent
+
+settings = get_settings()
+
+
+class SimulatedProviderError(RuntimeError):
+    """An injected provider failure (rate limit or server error)"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Simulated provider error (HTTP {status_code})")
+        self.status_code = status_code
+
+
+class LatencySimulator:
+    """Draws provider-like latencies and failures for the mock generator.
+
+    Distributions:
+
+    - ``none``: no delay (the default, so tests stay instant)
+    - ``fixed``: always ``median_seconds``
+    - ``lognormal``: median ``median_seconds``, shape ``sigma``
+    - ``long_tail``: lognormal, but with probability ``tail_probability``
+      the latency is multiplied by ``tail_multiplier`` (slow provider
+      replicas, cold caches, queueing upstream)
+
+    ``error_rate`` is the probability that a call fails with a
+    ``SimulatedProviderError``; a ``throttle_share`` of those are 429s and
+    the rest 500s. Streams spend ``first_token_share`` of the latency before
+    the first chunk and spread the rest over the chunks. Every wait goes
+    through ``sleep``, which tests can replace with a fake clock.
+    """
+
+    DISTRIBUTIONS = ("none", "fixed", "lognormal", "long_tail")
+
+    def __init__(
+        self,
+        distribution: str = "none",
+        median_seconds: float = 2.0,
+        sigma: float = 0.5,
+        tail_probability: float = 0.02,
+        tail_multiplier: float = 8.0,
+        error_rate: float = 0.0,
+        throttle_share: float = 0.5,
+        first_token_share: float = 0.2,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{distribution}'")
+        self.distribution = distribution
+        self.median_seconds = median_seconds
+        self.sigma = sigma
+        self.tail_probability = tail_probability
+        self.tail_multiplier = tail_multiplier
+        self.error_rate = error_rate
+        self.throttle_share = throttle_share
+        self.first_token_share = first_token_share
+        self.random = random.Random(seed)
+        self.sleep = sleep
+
+    @classmethod
+    def from_settings(cls, settings) -> "LatencySimulator":
+        return cls(
+            distribution=settings.ai_mock_latency,
+            median_seconds=settings.ai_mock_latency_median_seconds,
+            sigma=settings.ai_mock_latency_sigma,
+            tail_probability=settings.ai_mock_tail_probability,
+            tail_multiplier=settings.ai_mock_tail_multiplier,
+            error_rate=settings.ai_mock_error_rate,
+            seed=settings.ai_mock_seed
+        )
+
+    def sample(self, scale: float = 1.0) -> float:
+        """One latency in seconds; ``scale`` stretches it for heavier calls"""
+        if self.distribution == "none":
+            return 0.0
+        if self.distribution == "fixed":
+            latency = self.median_seconds
+        else:
+            latency = self.random.lognormvariate(math.log(self.median_seconds), self.sigma)
+            if self.distribution == "long_tail" and self.random.random() < self.tail_probability:
+                latency *= self.tail_multiplier
+        return latency * scale
+
+    def maybe_fail(self) -> None:
+        if self.error_rate and self.random.random() < self.error_rate:
+            status_code = 429 if self.random.random() < self.throttle_share else 500
+            raise SimulatedProviderError(status_code)
+
+    async def call(self, scale: float = 1.0) -> None:
+        """Wait like a provider call would, then fail with probability ``error_rate``"""
+        latency = self.sample(scale)
+        if latency:
+            await self.sleep(latency)
+        self.maybe_fail()
+
+    def stream_delays(self, chunks: int, scale: float = 1.0) -> List[float]:
+        """Time before the first chunk, then between chunks, for a ``chunks``-part stream"""
+        latency = self.sample(scale)
+        first = latency * self.first_token_share
+        rest = (latency - first) / max(chunks - 1, 1)
+        return [first] + [rest] * (chunks - 1)
+
+
+simulator = LatencySimulator.from_settings(settings)
 
 
 class PRContent(BaseModel):
@@ -32,6 +149,23 @@ class PREnhancement(BaseModel):
     overall_score: float = Field(..., ge=0, le=100)
 
 
+class SEOMetadata(BaseModel):
+    """SEO metadata for press releases"""
+    seo_title: str = Field(..., max_length=60)
+    meta_description: str = Field(..., max_length=160)
+    keywords: List[str] = Field(..., min_length=5, max_length=10)
+    og_title: str = Field(...)
+    og_description: str = Field(...)
+    og_type: str = Field(default="article")
+    schema_markup: dict = Field(...)
+
+
+class PublishableRelease(BaseModel):
+    """A press release together with the SEO metadata needed to publish it"""
+    content: PRContent
+    seo: SEOMetadata
+
+
 async def generate_press_release(
     company_name: str,
     announcement: str,
@@ -40,10 +174,17 @@ async def generate_press_release(
 ) -> PRContent:
     """Mock function to generate a press release"""
 
-    return PRContent(
-        headline=f"{company_name} Announces {announcement[:50]}...",
-        subheadline=f"Leading Irish company makes significant announcement for {target_audience}",
-        body=f"""
+    await simulator.call()
+    return _mock_press_release(company_name, announcement, company_info, target_audience)
+
+
+def _mock_press_release(
+    company_name: str,
+    announcement: str,
+    company_info: str,
+    target_audience: str
+) -> PRContent:
+    body = f"""
 {company_name} today announced {announcement}
 
 Dublin, Ireland - {datetime.now().strftime('%B %d, %Y')} - {company_name}, {company_info}, today announced {announcement}. This significant development demonstrates the company's commitment to innovation and growth in the Irish market.
@@ -59,7 +200,12 @@ For more information, please contact:
 [Contact information to be added]
 
 ###
-        """.strip(),
+        """.strip()
+
+    return PRContent(
+        headline=f"{company_name} Announces {announcement[:50]}...",
+        subheadline=f"Leading Irish company makes significant announcement for {target_audience}",
+        body=body,
         boilerplate=f"{company_name} is {company_info}",
         seo_title=f"{company_name} News: {announcement[:25]}",
         meta_description=f"{company_name} announces {announcement[:100]}... Learn more about this development.",
@@ -75,13 +221,106 @@ For more information, please contact:
             "Include a relevant quote from company leadership",
             "Add context about market positioning"
         ],
-        readability_score=75.5
+        readability_score=readability_score(body)
     )
 
 
-async def enhance_press_release(existing_content: str) -> PREnhancement:
+async def generate_publishable_release(
+    company_name: str,
+    announcement: str,
+    company_info: str,
+    target_audience: str = "Irish media and business community"
+) -> PublishableRelease:
+    """Mock function to generate a press release and its SEO metadata together"""
+
+    await simulator.call(scale=1.3)  # Larger structured output than /generate
+    content = _mock_press_release(company_name, announcement, company_info, target_audience)
+    seo = SEOMetadata(
+        seo_title=content.seo_title,
+        meta_description=content.meta_description,
+        keywords=content.keywords,
+        og_title=content.headline,
+        og_description=content.meta_description,
+        schema_markup={
+            "@context": "https://schema.org",
+            "@type": "NewsArticle",
+            "headline": content.headline,
+            "datePublished": datetime.now().date().isoformat(),
+            "publisher": {"@type": "Organization", "name": company_name}
+        }
+    )
+    return PublishableRelease(content=content, seo=seo)
+
+
+async def stream_press_release(
+    company_name: str,
+    announcement: str,
+    company_info: str,
+    target_audience: str = "Irish media and business community",
+    chunk_size: int = 80,
+    chunk_delay: Optional[float] = None
+) -> AsyncIterator[StreamEvent]:
+    """Mock streaming generation that emits the mock release field by field
+
+    Chunks are paced by ``simulator`` unless ``chunk_delay`` is given.
+    """
+
+    content = _mock_press_release(
+        company_name, announcement, company_info, target_audience
+    ).model_dump()
+    differ = PartialFieldDiffer()
+    partial = {}
+
+    # Text fields grow a chunk at a time, as a model would write them
+    steps = []
+    for name, value in content.items():
+        if name in differ.text_fields and isinstance(value, str):
+            steps.extend((name, value[:end]) for end in range(chunk_size, len(value) + chunk_size, chunk_size))
+        else:
+            steps.append((name, value))
+    if chunk_delay is None:
+        delays = simulator.stream_delays(len(steps))
+    else:
+        delays = [0.0] + [chunk_delay] * (len(steps) - 1)
+
+    for index, ((name, value), delay) in enumerate(zip(steps, delays)):
+        await simulator.sleep(delay)
+        if index == 0:
+            simulator.maybe_fail()  # Fail before anything is sent, like a refused stream
+        partial[name] = value
+        for event in differ.feed(partial):
+            yield event
+
+    for event in differ.feed(partial, final=True):
+        yield event
+    yield "done", content
+
+
+async def enhance_press_release(
+    existing_content: str,
+    chunked: Optional[bool] = None,
+    incremental: bool = False
+) -> PREnhancement:
     """Mock function to enhance an existing press release"""
 
+    if chunked is None:
+        chunked = len(existing_content) > settings.ai_enhance_chunk_threshold
+    if incremental:
+        chunks = split_paragraphs(existing_content)
+    elif chunked:
+        chunks = chunk_paragraphs(split_paragraphs(existing_content), settings.ai_enhance_chunk_chars)
+    else:
+        chunks = []
+    if len(chunks) > 1:
+        enhancements = await asyncio.gather(
+            *(enhance_press_release(chunk, chunked=False) for chunk in chunks)
+        )
+        merged = merge_enhancements(enhancements, chunks)
+        merged.overall_score = overall_score(existing_content)
+        return merged
+
+    # Latency grows with the amount of text the model has to read and rewrite
+    await simulator.call(scale=max(1.0, len(existing_content) / 2000))
     return PREnhancement(
         improved_headline="[Enhanced] " + existing_content.split('\n')[0][:80],
         improved_body=f"Enhanced version:\n\n{existing_content}\n\n[This is a mock enhancement]",
@@ -99,5 +338,5 @@ async def enhance_press_release(existing_content: str) -> PREnhancement:
             "Strengthen the opening paragraph",
             "Add more specific details"
         ],
-        overall_score=82.0
+        overall_score=overall_score(existing_content)
     )
\ No newline at end of file
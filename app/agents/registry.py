@@ -0,0 +1,85 @@
+"""Registry of lazily-built, reusable PydanticAI agents"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+
+class AgentRegistry:
+    """Build each registered agent once, on first use, and reuse it.
+
+    Factories are registered at import time but not called, so importing
+    the agents module stays cheap and does not require API keys. ``warm()``
+    builds everything up front (e.g. from the FastAPI lifespan) so the first
+    request does not pay construction cost.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._agents: Dict[str, Any] = {}
+        self._reset_hooks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """Register a zero-argument factory that builds the agent called ``name``"""
+        self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        """Return the agent called ``name``, building it on first use"""
+        agent = self._agents.get(name)
+        if agent is not None:
+            return agent
+        with self._lock:
+            if name not in self._agents:
+                if name not in self._factories:
+                    raise KeyError(f"No agent registered as '{name}'")
+                self._agents[name] = self._factories[name]()
+            return self._agents[name]
+
+    def warm(self) -> List[str]:
+        """Build every registered agent and return their names"""
+        return [name for name in self._factories if self.get(name) is not None]
+
+    def is_built(self, name: str) -> bool:
+        return name in self._agents
+
+    def on_reset(self, hook: Callable[[], None]) -> None:
+        """Call ``hook`` on every reset, e.g. to drop a cached model the agents share"""
+        self._reset_hooks.append(hook)
+
+    def reset(self) -> None:
+        """Forget built agents so they are rebuilt on next use (e.g. after a config change)"""
+        with self._lock:
+            self._agents.clear()
+            for hook in self._reset_hooks:
+                hook()
+
+
+agent_registry = AgentRegistry()
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared HTTP client for every AI provider, so connections are pooled and reused"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout=600, connect=5),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (call on application shutdown)
+
+    Built agents and models hold the client, so the registry is reset too:
+    anything used afterwards is rebuilt around a new client.
+    """
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+    agent_registry.reset()
@@ -0,0 +1,287 @@
+"""Local repair of structured agent output before validation"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+import annotated_types
+from pydantic import BaseModel, ValidationError, create_model
+from pydantic_ai import Agent, capture_run_messages
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+
+from app.agents.telemetry import RunTrace
+
+# Fields rendered on one line (titles, descriptions); everything else keeps its line breaks
+SINGLE_LINE_FIELDS = {
+    "headline", "subheadline", "seo_title", "meta_description",
+    "og_title", "og_description", "improved_headline",
+}
+
+FALLBACK_KEYWORDS = ["ireland", "irish business", "press release", "news", "announcement"]
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "is",
+    "it", "its", "new", "of", "on", "or", "that", "the", "to", "was", "with", "will",
+}
+
+
+@dataclass
+class RepairStats:
+    """Counters for local repairs and field-level retries"""
+    runs: int = 0
+    repaired_outputs: int = 0
+    field_retries: int = 0
+    full_retries: int = 0
+    failed_runs: int = 0
+    repairs: Counter = field(default_factory=Counter)
+
+    @property
+    def retry_rate(self) -> float:
+        return self.field_retries / self.runs if self.runs else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "repaired_outputs": self.repaired_outputs,
+            "field_retries": self.field_retries,
+            "full_retries": self.full_retries,
+            "failed_runs": self.failed_runs,
+            "retry_rate": round(self.retry_rate, 4),
+            "repairs": dict(self.repairs),
+        }
+
+
+repair_stats = RepairStats()
+
+
+def _limits(model: Type[BaseModel], name: str):
+    min_len = max_len = ge = le = None
+    for constraint in model.model_fields[name].metadata:
+        if isinstance(constraint, annotated_types.MinLen):
+            min_len = constraint.min_length
+        elif isinstance(constraint, annotated_types.MaxLen):
+            max_len = constraint.max_length
+        elif isinstance(constraint, annotated_types.Ge):
+            ge = constraint.ge
+        elif isinstance(constraint, annotated_types.Le):
+            le = constraint.le
+    return min_len, max_len, ge, le
+
+
+def truncate_at_word(text: str, max_length: int) -> str:
+    """Cut ``text`` to ``max_length`` at the last word boundary, dropping dangling punctuation"""
+    if len(text) <= max_length:
+        return text
+    cut = text[:max_length + 1]
+    boundary = cut.rfind(" ")
+    cut = cut[:boundary] if boundary > max_length // 2 else text[:max_length]
+    return cut.rstrip(" ,;:-–—&/").rstrip()
+
+
+def normalize_whitespace(name: str, text: str) -> str:
+    if name in SINGLE_LINE_FIELDS:
+        return " ".join(text.split())
+    lines = [re.sub(r"[ \t]+", " ", line).rstrip() for line in text.strip().splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+
+def _keyword_candidates(data: Dict[str, Any]) -> List[str]:
+    """Padding keywords drawn from the release's own titles, then generic fallbacks"""
+    words = []
+    for source in ("seo_title", "headline", "og_title"):
+        value = data.get(source)
+        if isinstance(value, str):
+            words.extend(w.lower() for w in re.findall(r"[A-Za-z][A-Za-z'-]{3,}", value))
+    return [w for w in words if w not in _STOPWORDS] + FALLBACK_KEYWORDS
+
+
+def _dedupe(values: Sequence[Any]) -> List[str]:
+    seen = set()
+    result = []
+    for value in values:
+        if not isinstance(value, str):
+            continue
+        item = " ".join(value.split())
+        if item and item.casefold() not in seen:
+            seen.add(item.casefold())
+            result.append(item)
+    return result
+
+
+def repair_string_list(
+    values: Sequence[Any],
+    data: Dict[str, Any],
+    min_length: Optional[int],
+    max_length: Optional[int]
+) -> List[str]:
+    """Deduplicate a keyword list, trim it to ``max_length`` and pad it to ``min_length``"""
+    items = _dedupe(values)
+    if min_length and len(items) < min_length:
+        items = _dedupe(items + _keyword_candidates(data))[:min_length]
+    return items[:max_length] if max_length else items
+
+
+def repair_output(model: Type[BaseModel], data: Any) -> Any:
+    """Fix constraint violations that can be repaired locally, in place of a retry.
+
+    Strings get whitespace normalization and word-boundary truncation to
+    their ``max_length``; string lists are deduplicated, trimmed to their
+    maximum and padded to their minimum; bounded numbers are clamped.
+    Anything else is left for normal validation to report.
+    """
+    if not isinstance(data, dict):
+        return data
+    data = dict(data)
+    repaired = False
+
+    for name in model.model_fields:
+        value = data.get(name)
+        if value is None:
+            continue
+        min_len, max_len, ge, le = _limits(model, name)
+
+        if isinstance(value, str):
+            fixed = normalize_whitespace(name, value)
+            if max_len and len(fixed) > max_len:
+                fixed = truncate_at_word(fixed, max_len)
+                repair_stats.repairs[f"{name}:truncated"] += 1
+            elif fixed != value:
+                repair_stats.repairs[f"{name}:whitespace"] += 1
+            if fixed != value:
+                data[name] = fixed
+                repaired = True
+        elif isinstance(value, list) and (min_len or max_len or name == "keywords"):
+            fixed = repair_string_list(value, data, min_len, max_len)
+            if fixed != value:
+                if len(fixed) > len(value):
+                    kind = "padded"
+                elif max_len and len(value) > max_len:
+                    kind = "trimmed"
+                else:
+                    kind = "deduplicated"
+                repair_stats.repairs[f"{name}:{kind}"] += 1
+                data[name] = fixed
+                repaired = True
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            clamped = value
+            if ge is not None and value < ge:
+                clamped = ge
+            if le is not None and value > le:
+                clamped = le
+            if clamped != value:
+                repair_stats.repairs[f"{name}:clamped"] += 1
+                data[name] = clamped
+                repaired = True
+
+    if repaired:
+        repair_stats.repaired_outputs += 1
+    return data
+
+
+def _last_output_args(messages: Sequence[Any]) -> Optional[Dict[str, Any]]:
+    """Arguments of the most recent output tool call in a captured run"""
+    for message in reversed(messages):
+        if getattr(message, "kind", None) != "response":
+            continue
+        for part in reversed(message.parts):
+            if getattr(part, "part_kind", None) == "tool-call":
+                try:
+                    return part.args_as_dict()
+                except ValueError:
+                    return None
+    return None
+
+
+async def reask_fields(
+    agent: Agent,
+    model: Type[BaseModel],
+    fields: Sequence[str],
+    data: Dict[str, Any],
+    errors: str,
+    trace: Optional[RunTrace] = None,
+) -> Dict[str, Any]:
+    """Ask the model again for only ``fields``, with the rest of the output as context"""
+    field_model = create_model(
+        f"{model.__name__}Fix",
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields},
+    )
+    context = {k: v for k, v in data.items() if k not in fields}
+    prompt = f"""
+    The following structured output is valid except for the fields {", ".join(fields)}:
+
+    {context}
+
+    Validation errors:
+    {errors}
+
+    Provide corrected values for only these fields: {", ".join(fields)}.
+    """
+    with capture_run_messages() as messages:
+        try:
+            result = await agent.run(prompt, output_type=field_model)
+        finally:
+            if trace is not None:
+                trace.add_messages(messages)
+    return result.output.model_dump()
+
+
+async def run_with_repair(agent: Agent, prompt: str, model: Type[BaseModel]) -> BaseModel:
+    """Run ``agent`` and validate its output locally, re-asking only for broken fields.
+
+    The agent should be built with ``output_retries=0`` so a validation
+    failure surfaces here instead of triggering a full regeneration. Local
+    repairs run in ``model``'s before-validator; if validation still fails,
+    only the offending fields are requested again, in one smaller call.
+    A response with no usable output arguments (plain text, malformed
+    JSON) has nothing to repair, so it gets one normal retry instead.
+    The whole call, re-asks included, is recorded as one ``RunTelemetry``.
+    """
+    repair_stats.runs += 1
+    with RunTrace(agent.name) as trace:
+        with capture_run_messages() as messages:
+            try:
+                result = await agent.run(prompt)
+                return result.output
+            except UnexpectedModelBehavior:
+                trace.validation_failures += 1
+                data = _last_output_args(messages)
+            finally:
+                trace.add_messages(messages)
+
+        if data is None:
+            repair_stats.full_retries += 1
+            with capture_run_messages() as messages:
+                try:
+                    result = await agent.run(prompt)
+                    return result.output
+                except UnexpectedModelBehavior:
+                    trace.validation_failures += 1
+                    repair_stats.failed_runs += 1
+                    raise
+                except Exception:
+                    repair_stats.failed_runs += 1
+                    raise
+                finally:
+                    trace.add_messages(messages)
+
+        try:
+            return model.model_validate(data)
+        except ValidationError as e:
+            fields = sorted({str(err["loc"][0]) for err in e.errors() if err["loc"]} & set(model.model_fields))
+            if not fields:
+                repair_stats.failed_runs += 1
+                raise
+            errors = str(e)
+
+        repair_stats.field_retries += 1
+        try:
+            data.update(await reask_fields(agent, model, fields, data, errors, trace))
+            return model.model_validate(data)
+        except (ValidationError, UnexpectedModelBehavior):
+            trace.validation_failures += 1
+            repair_stats.failed_runs += 1
+            raise
+        except Exception:
+            repair_stats.failed_runs += 1
+            raise
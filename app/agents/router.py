@@ -0,0 +1,298 @@
+"""Latency-aware routing, hedging and failover across AI providers"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import statistics
+import time
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from pydantic_ai.exceptions import FallbackExceptionGroup
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.settings import ModelSettings, merge_model_settings
+
+
+class ProviderHealth:
+    """Rolling latency/error statistics and a circuit breaker for one provider.
+
+    The breaker opens after ``failure_threshold`` consecutive failures and
+    stays open for ``cooldown_seconds``. After the cooldown it is half-open:
+    the provider is eligible again and a single success closes the breaker,
+    while another failure re-opens it immediately.
+    """
+
+    def __init__(self, window_size: int = 50, failure_threshold: int = 3, cooldown_seconds: float = 30.0):
+        self.latencies: Deque[float] = deque(maxlen=window_size)
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+
+    def record_success(self, latency: Optional[float] = None) -> None:
+        if latency is not None:
+            self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        half_open = self.opened_at is not None
+        if half_open or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    @property
+    def circuit_open(self) -> bool:
+        if self.opened_at is None:
+            return False
+        return time.monotonic() - self.opened_at < self.cooldown_seconds
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    @property
+    def p50(self) -> Optional[float]:
+        return statistics.median(self.latencies) if self.latencies else None
+
+    @property
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < 2:
+            return None
+        return statistics.quantiles(self.latencies, n=20)[-1]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "p50": self.p50,
+            "p95": self.p95,
+            "error_rate": round(self.error_rate, 4),
+            "samples": len(self.outcomes),
+            "circuit_open": self.circuit_open,
+        }
+
+
+class RouterModel(Model):
+    """A model that routes each request to the fastest healthy provider.
+
+    Providers are ranked by error rate, then median latency; providers with
+    no latency samples yet follow the measured ones (at the same error
+    rate) in their configured priority. Providers whose circuit
+    breaker is open are skipped (unless every breaker is open). A failed
+    request fails over to the next provider in the ranking. With hedging
+    enabled, a request still running after the primary's p95 latency is
+    duplicated to the next provider and the first success wins.
+
+    Ranking alone would never give a backup provider latency samples, so
+    with ``explore_rate`` that fraction of requests goes first to the
+    least-sampled healthy provider with fewer than ``explore_min_samples``.
+    """
+
+    def __init__(
+        self,
+        *models: Model,
+        hedge: bool = False,
+        hedge_min_samples: int = 20,
+        window_size: int = 50,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        explore_rate: float = 0.0,
+        explore_min_samples: int = 10,
+    ):
+        super().__init__()
+        if not models:
+            raise ValueError("RouterModel needs at least one model")
+        self.models: List[Model] = list(models)
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.explore_rate = explore_rate
+        self.explore_min_samples = explore_min_samples
+        self._random = random.Random()
+        self.health: Dict[str, ProviderHealth] = {
+            self._key(model): ProviderHealth(window_size, failure_threshold, cooldown_seconds)
+            for model in self.models
+        }
+
+    @property
+    def model_name(self) -> str:
+        return f'router:{",".join(model.model_name for model in self.models)}'
+
+    @property
+    def system(self) -> str:
+        return f'router:{",".join(model.system for model in self.models)}'
+
+    @property
+    def base_url(self) -> Optional[str]:
+        return self.models[0].base_url
+
+    def ranked_models(self) -> List[Model]:
+        """Providers in the order they should be tried for the next request"""
+        available = [m for m in self.models if not self.health[self._key(m)].circuit_open]
+        candidates = available or self.models
+
+        def rank(indexed):
+            priority, model = indexed
+            health = self.health[self._key(model)]
+            p50 = health.p50
+            # An unmeasured provider is not known to be fast, so it must not sort as 0s
+            return (health.error_rate, p50 is None, p50 or 0.0, priority)
+
+        ranked = [model for _, model in sorted(enumerate(candidates), key=rank)]
+        if self.explore_rate and self._random.random() < self.explore_rate:
+            undersampled = [
+                m for m in ranked[1:]
+                if len(self.health[self._key(m)].latencies) < self.explore_min_samples
+            ]
+            if undersampled:
+                probe = min(undersampled, key=lambda m: len(self.health[self._key(m)].latencies))
+                ranked.remove(probe)
+                ranked.insert(0, probe)
+        return ranked
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Rolling health statistics per provider"""
+        return {key: health.as_dict() for key, health in self.health.items()}
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        candidates = self.ranked_models()
+        exceptions: List[Exception] = []
+
+        while candidates:
+            primary = candidates.pop(0)
+            deadline = self._hedge_deadline(primary) if candidates else None
+            if deadline is None:
+                try:
+                    return await self._timed_request(primary, messages, model_settings, model_request_parameters)
+                except Exception as exc:
+                    exceptions.append(exc)
+                    continue
+
+            secondary = candidates.pop(0)
+            try:
+                return await self._hedged_request(
+                    primary, secondary, deadline, messages, model_settings, model_request_parameters
+                )
+            except FallbackExceptionGroup as group:
+                exceptions.extend(group.exceptions)
+
+        raise FallbackExceptionGroup("All providers from RouterModel failed", exceptions)
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        run_context: Any = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        """Open a stream on the best provider, failing over if it cannot connect
+
+        The outcome is recorded when the stream ends, so a stream that breaks
+        part-way counts as a failure. It cannot fail over at that point: the
+        caller has already seen part of the response.
+        """
+        exceptions: List[Exception] = []
+
+        for model in self.ranked_models():
+            health = self.health[self._key(model)]
+            params = model.customize_request_parameters(model_request_parameters)
+            merged_settings = merge_model_settings(model.settings, model_settings)
+            async with AsyncExitStack() as stack:
+                try:
+                    response = await stack.enter_async_context(
+                        model.request_stream(messages, merged_settings, params, run_context)
+                    )
+                except Exception as exc:
+                    health.record_failure()
+                    exceptions.append(exc)
+                    continue
+                try:
+                    yield response
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    health.record_failure()
+                    raise
+                # Streaming time depends on the consumer, so it is not a latency sample
+                health.record_success()
+                return
+
+        raise FallbackExceptionGroup("All providers from RouterModel failed", exceptions)
+
+    async def _timed_request(
+        self,
+        model: Model,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        health = self.health[self._key(model)]
+        params = model.customize_request_parameters(model_request_parameters)
+        merged_settings = merge_model_settings(model.settings, model_settings)
+        started = time.monotonic()
+        try:
+            response = await model.request(messages, merged_settings, params)
+        except asyncio.CancelledError:
+            # A hedged loser being cancelled says nothing about its health
+            raise
+        except Exception:
+            health.record_failure()
+            raise
+        health.record_success(time.monotonic() - started)
+        return response
+
+    async def _hedged_request(
+        self,
+        primary: Model,
+        secondary: Model,
+        deadline: float,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        args = (messages, model_settings, model_request_parameters)
+        pending = {asyncio.ensure_future(self._timed_request(primary, *args))}
+        exceptions: List[Exception] = []
+        hedged = False
+
+        try:
+            while pending:
+                timeout = None if hedged else deadline
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    exceptions.append(task.exception())
+                if not hedged:
+                    # Primary is slower than its p95 or already failed: bring in the secondary
+                    pending.add(asyncio.ensure_future(self._timed_request(secondary, *args)))
+                    hedged = True
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise FallbackExceptionGroup("Hedged providers from RouterModel failed", exceptions)
+
+    def _hedge_deadline(self, model: Model) -> Optional[float]:
+        if not self.hedge:
+            return None
+        health = self.health[self._key(model)]
+        if len(health.latencies) < self.hedge_min_samples:
+            return None
+        return health.p95
+
+    @staticmethod
+    def _key(model: Model) -> str:
+        return f"{model.system}:{model.model_name}@{model.base_url}"
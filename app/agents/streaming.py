@@ -0,0 +1,72 @@
+"""Helpers for streaming structured agent output as Server-Sent Events"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic_core import from_json
+
+# Long free-text fields are streamed as deltas; everything else is sent once complete
+STREAMED_TEXT_FIELDS = ("body",)
+
+StreamEvent = Tuple[str, Dict[str, Any]]
+
+
+class PartialFieldDiffer:
+    """Turn successive partial outputs into ``field``/``delta`` events.
+
+    Structured output arrives as a growing JSON object whose keys follow the
+    schema order (headline, subheadline, body, ..., SEO fields). A field is
+    complete once a later key has started, so scalar fields are emitted as a
+    single ``field`` event at that point while text fields in
+    ``text_fields`` are emitted as ``delta`` events as they grow.
+    """
+
+    def __init__(self, text_fields: Iterable[str] = STREAMED_TEXT_FIELDS):
+        self.text_fields = set(text_fields)
+        self._emitted: set = set()
+        self._text_offsets: Dict[str, int] = {}
+
+    def feed(self, partial: Dict[str, Any], final: bool = False) -> List[StreamEvent]:
+        """Return the events needed to bring a client up to date with ``partial``"""
+        events: List[StreamEvent] = []
+        names = list(partial)
+        for position, name in enumerate(names):
+            if name in self._emitted:
+                continue
+            value = partial[name]
+            complete = final or position < len(names) - 1
+
+            if name in self.text_fields and isinstance(value, str):
+                offset = self._text_offsets.get(name, 0)
+                if len(value) > offset:
+                    events.append(("delta", {"field": name, "text": value[offset:]}))
+                    self._text_offsets[name] = len(value)
+                if complete:
+                    self._emitted.add(name)
+            elif complete:
+                events.append(("field", {"field": name, "value": value}))
+                self._emitted.add(name)
+        return events
+
+
+def partial_output_args(response: Any) -> Optional[Dict[str, Any]]:
+    """Extract the (possibly incomplete) output tool arguments from a model response"""
+    for part in reversed(getattr(response, "parts", [])):
+        if getattr(part, "part_kind", None) != "tool-call":
+            continue
+        args = part.args
+        if isinstance(args, dict):
+            return args
+        if not args:
+            return None
+        try:
+            parsed = from_json(args, allow_partial="trailing-strings")
+        except ValueError:
+            return None
+        return parsed if isinstance(parsed, dict) else None
+    return None
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Serialize one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
@@ -0,0 +1,202 @@
+"""Per-call telemetry for AI agents: latency, token usage, retries and cost"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily
+
+from app.agents.limiter import limiter_stats
+
+# USD per million (input, output) tokens; matched as a substring of the model name
+MODEL_PRICES_PER_MILLION: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "claude-3-5-haiku": (0.80, 4.00),
+    "claude-3-haiku": (0.25, 1.25),
+    "claude-3-5-sonnet": (3.00, 15.00),
+    "claude-3-7-sonnet": (3.00, 15.00),
+    "claude-sonnet-4": (3.00, 15.00),
+}
+
+LABELS = ["agent", "model", "provider"]
+
+LLM_RUN_SECONDS = Histogram(
+    "presswire_llm_run_duration_seconds",
+    "Wall time of one agent call, including repairs and field re-asks",
+    LABELS,
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120),
+)
+LLM_RUNS = Counter("presswire_llm_runs", "Agent calls by outcome", LABELS + ["outcome"])
+LLM_TOKENS = Counter("presswire_llm_tokens", "Tokens sent to and received from providers", LABELS + ["direction"])
+LLM_RETRIES = Counter("presswire_llm_retries", "Model requests beyond the first in an agent call", LABELS)
+LLM_VALIDATION_FAILURES = Counter(
+    "presswire_llm_validation_failures", "Model outputs that failed validation", LABELS
+)
+LLM_COST = Counter("presswire_llm_cost_usd", "Estimated provider cost in USD", LABELS)
+
+
+class LimiterCollector:
+    """Exposes the per-provider limiter state (see ``app.agents.limiter``) as gauges"""
+
+    GAUGES = {
+        "queue_depth": "Calls waiting for a limiter slot",
+        "in_flight": "Calls currently holding a limiter slot",
+        "concurrency_limit": "Current adaptive concurrency limit",
+        "wait_seconds_p95": "95th percentile time spent waiting for a slot",
+    }
+
+    def collect(self):
+        stats = limiter_stats()
+        for name, documentation in self.GAUGES.items():
+            gauge = GaugeMetricFamily(f"presswire_llm_limiter_{name}", documentation, labels=["provider"])
+            for provider, values in stats.items():
+                gauge.add_metric([provider], values[name])
+            yield gauge
+
+
+REGISTRY.register(LimiterCollector())
+
+
+def price_for(model_name: str) -> Optional[Tuple[float, float]]:
+    """Per-million token prices for ``model_name`` (most specific match wins)"""
+    matches = [key for key in MODEL_PRICES_PER_MILLION if key in model_name]
+    return MODEL_PRICES_PER_MILLION[max(matches, key=len)] if matches else None
+
+
+def estimate_cost(model_name: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimated USD cost of a call; 0.0 for models without a known price"""
+    prices = price_for(model_name)
+    if prices is None:
+        return 0.0
+    return (input_tokens * prices[0] + output_tokens * prices[1]) / 1_000_000
+
+
+@dataclass
+class RunTelemetry:
+    """What one agent call cost: time, tokens, retries and money"""
+    agent: str
+    model: str
+    provider: str
+    latency_seconds: float
+    requests: int
+    input_tokens: int
+    output_tokens: int
+    retries: int
+    validation_failures: int
+    cost_usd: float
+    succeeded: bool
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+_collected: ContextVar[Optional[List[RunTelemetry]]] = ContextVar("ai_telemetry", default=None)
+
+
+@contextmanager
+def collect_telemetry() -> Iterator[List[RunTelemetry]]:
+    """Collect the ``RunTelemetry`` of every agent call made inside the block"""
+    records: List[RunTelemetry] = []
+    token = _collected.set(records)
+    try:
+        yield records
+    finally:
+        _collected.reset(token)
+
+
+class RunTrace:
+    """Times one logical agent call and records its telemetry on exit.
+
+    Add the messages of every ``agent.run`` that belongs to the call (the
+    first attempt and any field re-asks) with ``add_messages``; token usage,
+    retries and the model/provider that actually answered are read from the
+    responses, so calls routed through ``RouterModel`` are attributed to the
+    provider that served them.
+    """
+
+    def __init__(self, agent_name: Optional[str]):
+        self.agent = agent_name or "agent"
+        self.messages: List[Any] = []
+        self.validation_failures = 0
+        self.record: Optional[RunTelemetry] = None
+
+    def add_messages(self, messages: Sequence[Any]) -> None:
+        self.messages.extend(messages)
+
+    def __enter__(self) -> "RunTrace":
+        self.started = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.record = record_run(
+            self.agent,
+            self.messages,
+            time.monotonic() - self.started,
+            validation_failures=self.validation_failures,
+            succeeded=exc_type is None
+        )
+        return False
+
+
+def record_run(
+    agent: str,
+    messages: Sequence[Any],
+    latency: float,
+    validation_failures: int = 0,
+    succeeded: bool = True
+) -> RunTelemetry:
+    """Build a ``RunTelemetry`` from a call's messages and update the metrics"""
+    responses = [m for m in messages if getattr(m, "kind", None) == "response"]
+    last = responses[-1] if responses else None
+    model = (last.model_name if last is not None else None) or "unknown"
+    provider = (last.provider_name if last is not None else None) or "unknown"
+    input_tokens = sum(r.usage.input_tokens for r in responses)
+    output_tokens = sum(r.usage.output_tokens for r in responses)
+    run = RunTelemetry(
+        agent=agent,
+        model=model,
+        provider=provider,
+        latency_seconds=round(latency, 4),
+        requests=len(responses),
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        retries=max(0, len(responses) - 1),
+        validation_failures=validation_failures,
+        cost_usd=round(estimate_cost(model, input_tokens, output_tokens), 6),
+        succeeded=succeeded,
+    )
+
+    labels = (agent, model, provider)
+    LLM_RUN_SECONDS.labels(*labels).observe(latency)
+    LLM_RUNS.labels(*labels, "success" if succeeded else "error").inc()
+    LLM_TOKENS.labels(*labels, "input").inc(input_tokens)
+    LLM_TOKENS.labels(*labels, "output").inc(output_tokens)
+    LLM_RETRIES.labels(*labels).inc(run.retries)
+    LLM_VALIDATION_FAILURES.labels(*labels).inc(validation_failures)
+    LLM_COST.labels(*labels).inc(run.cost_usd)
+
+    records = _collected.get()
+    if records is not None:
+        records.append(run)
+    return run
+
+
+def summarize(records: Sequence[RunTelemetry]) -> Dict[str, Any]:
+    """Totals across the agent calls behind one request, plus each call"""
+    return {
+        "llm_calls": len(records),
+        "latency_seconds": round(sum(r.latency_seconds for r in records), 4),
+        "input_tokens": sum(r.input_tokens for r in records),
+        "output_tokens": sum(r.output_tokens for r in records),
+        "retries": sum(r.retries for r in records),
+        "validation_failures": sum(r.validation_failures for r in records),
+        "cost_usd": round(sum(r.cost_usd for r in records), 6),
+        "runs": [r.as_dict() for r in records],
+    }
+
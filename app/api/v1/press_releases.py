@@ -1,20 +1,59 @@
 """Press Release API endpoints"""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
-from pydantic import BaseModel, EmailStr
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, EmailStr, Field
+from datetime import datetime, timezone
+from uuid import UUID
+import json
 
-from app.core.database import get_db
+from app.core.config import get_settings
+from app.core.database import get_db, get_read_db
+from app.core.cache import make_cache_key
+from app.core.singleflight import SingleFlight
+from app.core.concurrency import bounded_as_completed
+from app.core.jobs import FAILED, SUCCEEDED, Job, JobWorkerPool, get_job_queue
+from app.core.conditional import is_not_modified
+from app.core.pagination import InvalidCursor
+from app.schemas.press_release import PressReleasePage, PressReleaseRead, PressReleaseSearchResults
+from app.services.analytics import get_view_counter
+from app.services.press_releases import get_published_release, list_press_release_page
+from app.services.search import search_press_releases
+from app.agents.streaming import format_sse
+from app.agents.telemetry import collect_telemetry, summarize
 from app.agents.pr_generator_mock import (
     generate_press_release,
+    generate_publishable_release,
+    stream_press_release,
     enhance_press_release,
     PRContent,
-    PREnhancement
+    PREnhancement,
+    PublishableRelease
 )
 
+settings = get_settings()
+
 router = APIRouter(prefix="/api/v1/press-releases", tags=["Press Releases"])
 
+# Concurrent identical requests (e.g. double-submits) share one agent call
+generation_flight = SingleFlight()
+enhancement_flight = SingleFlight()
+
+# Generation runs on a worker pool so provider latency never holds a request worker
+job_workers = JobWorkerPool(
+    get_job_queue(),
+    workers=settings.jobs_workers,
+    poll_interval=settings.jobs_poll_interval,
+    max_attempts=settings.jobs_max_attempts,
+    visibility_timeout=settings.jobs_visibility_timeout
+)
+
+# Views are counted in memory and flushed in batches (started by the app lifespan)
+view_counter = get_view_counter()
+
 
 class GeneratePRRequest(BaseModel):
     company_name: str
@@ -24,24 +63,190 @@ class GeneratePRRequest(BaseModel):
     target_audience: Optional[str] = "Irish media and business community"
 
 
+class BatchGeneratePRRequest(BaseModel):
+    items: List[GeneratePRRequest] = Field(..., min_length=1)
+    concurrency: Optional[int] = Field(None, ge=1)
+
+
 class EnhancePRRequest(BaseModel):
     content: str
+    chunked: Optional[bool] = None  # None: chunk automatically for long releases
+    incremental: bool = False  # Re-send only paragraphs changed since the last call
+
+
+class GeneratedPRContent(PRContent):
+    telemetry: Optional[Dict[str, Any]] = None  # LLM latency, tokens, retries and cost
+
 
+class JobResponse(BaseModel):
+    job_id: str
+    status: str  # queued, running, succeeded, failed
+    priority: int
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    status_url: str
+    events_url: str
+    result: Optional[PRContent] = None
+    telemetry: Optional[Dict[str, Any]] = None  # LLM latency, tokens, retries and cost
+    error: Optional[str] = None
 
-@router.post("/generate", response_model=PRContent)
+
+def _visitor_id(request: Request) -> str:
+    """Who is reading: the visitor cookie if set, else client address and user agent.
+
+    Only a hash of this reaches the visitor sketches.
+    """
+    cookie = request.cookies.get("pw_visitor")
+    if cookie:
+        return cookie
+    client = request.client.host if request.client else ""
+    return f"{client}|{request.headers.get('user-agent', '')}"
+
+
+def _timestamp(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, tz=timezone.utc) if value is not None else None
+
+
+def _job_response(job: Job) -> JobResponse:
+    status_url = f"{router.prefix}/jobs/{job.id}"
+    return JobResponse(
+        job_id=job.id,
+        status=job.status,
+        priority=job.priority,
+        attempts=job.attempts,
+        created_at=_timestamp(job.created_at),
+        started_at=_timestamp(job.started_at),
+        finished_at=_timestamp(job.finished_at),
+        status_url=status_url,
+        events_url=f"{status_url}/events",
+        result=job.result["content"] if job.status == SUCCEEDED else None,
+        telemetry=job.result["telemetry"] if job.status == SUCCEEDED else None,
+        error=job.error
+    )
+
+
+async def _generate_coalesced(request: GeneratePRRequest) -> PRContent:
+    """Generate a press release, sharing the call with identical in-flight requests"""
+    flight_key = make_cache_key(
+        "generate",
+        "api",
+        **request.model_dump(exclude={"contact_email"})
+    )
+    return await generation_flight.do(
+        flight_key,
+        lambda: generate_press_release(
+            company_name=request.company_name,
+            announcement=request.announcement,
+            company_info=request.company_info,
+            target_audience=request.target_audience
+        )
+    )
+
+
+async def _run_generation_job(payload: dict) -> dict:
+    with collect_telemetry() as records:
+        pr_content = await _generate_coalesced(GeneratePRRequest(**payload))
+    return {"content": pr_content.model_dump(), "telemetry": summarize(records)}
+
+
+job_workers.register("generate", _run_generation_job)
+
+
+@router.post("/generate", response_model=GeneratedPRContent, responses={202: {"model": JobResponse}})
 async def generate_pr(
     request: GeneratePRRequest,
+    prefer: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """Generate a new press release using AI"""
+    """Generate a new press release using AI
+
+    The request is queued for the generation workers at the default
+    priority: a higher one would have to come from an authenticated
+    company, which this endpoint does not have yet. By
+    default the response waits for the result (up to
+    ``jobs_sync_wait_seconds``) and returns it with its LLM ``telemetry``. With ``Prefer: respond-async``, or if the
+    wait runs out, it answers 202 with a job to poll at ``status_url`` or
+    subscribe to at ``events_url``.
+    """
+    try:
+        job = await job_workers.submit("generate", request.model_dump())
+        if "respond-async" not in (prefer or "").lower():
+            job = await job_workers.wait(job.id, timeout=settings.jobs_sync_wait_seconds)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error generating press release: {str(e)}"
+        )
+
+    if job.status == SUCCEEDED:
+        return GeneratedPRContent(**job.result["content"], telemetry=job.result["telemetry"])
+    if job.status == FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error generating press release: {job.error}"
+        )
+    job_response = _job_response(job)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=jsonable_encoder(job_response),
+        headers={"Location": job_response.status_url}
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_generation_job(job_id: str):
+    """Poll a queued generation job"""
+    job = await job_workers.queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_generation_job(job_id: str):
+    """Subscribe to a generation job as Server-Sent Events
+
+    Emits a ``status`` event whenever the job's status changes, then either
+    ``done`` with the press release or ``error``.
+    """
+    job = await job_workers.queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+
+    async def event_stream():
+        last_status = None
+        current = job
+        while current is not None:
+            if current.status != last_status:
+                last_status = current.status
+                yield format_sse("status", jsonable_encoder(_job_response(current), exclude={"result"}))
+            if current.status == SUCCEEDED:
+                yield format_sse("done", current.result["content"])
+                return
+            if current.status == FAILED:
+                yield format_sse("error", {"detail": f"Error generating press release: {current.error}"})
+                return
+            current = await job_workers.wait(job_id, timeout=settings.jobs_poll_interval)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/generate/publishable", response_model=PublishableRelease)
+async def generate_publishable_pr(request: GeneratePRRequest):
+    """Generate a press release and its SEO metadata in a single AI call"""
     try:
-        pr_content = await generate_press_release(
+        return await generate_publishable_release(
             company_name=request.company_name,
             announcement=request.announcement,
             company_info=request.company_info,
             target_audience=request.target_audience
         )
-        return pr_content
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -49,6 +254,73 @@ async def generate_pr(
         )
 
 
+@router.post("/generate/batch")
+async def generate_pr_batch(request: BatchGeneratePRRequest):
+    """Generate several press releases concurrently, streaming results as NDJSON
+
+    Items run with at most ``concurrency`` generations in flight (capped by
+    the server's ``ai_batch_concurrency``). One JSON line is written per item
+    as soon as it finishes, in completion order, with its ``index`` in the
+    submitted list and either a ``result`` or an ``error``.
+    """
+    if len(request.items) > settings.ai_batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch size exceeds the limit of {settings.ai_batch_max_items} items"
+        )
+
+    concurrency = min(
+        request.concurrency or settings.ai_batch_concurrency,
+        settings.ai_batch_concurrency
+    )
+    factories = [
+        lambda item=item: _generate_coalesced(item)
+        for item in request.items
+    ]
+
+    async def result_stream():
+        async for index, pr_content, error in bounded_as_completed(factories, concurrency):
+            if error is None:
+                line = {"index": index, "status": "success", "result": pr_content.model_dump()}
+            else:
+                line = {
+                    "index": index,
+                    "status": "error",
+                    "error": f"Error generating press release: {str(error)}"
+                }
+            yield json.dumps(line, ensure_ascii=False, default=str) + "\n"
+
+    return StreamingResponse(result_stream(), media_type="application/x-ndjson")
+
+
+@router.post("/generate/stream")
+async def generate_pr_stream(request: GeneratePRRequest):
+    """Generate a press release, streaming fields as Server-Sent Events
+
+    Emits ``field`` events for complete fields (headline first), ``delta``
+    events for body text, then SEO fields and a final ``done`` event with
+    the full press release. Failures are reported as an ``error`` event.
+    """
+
+    async def event_stream():
+        try:
+            async for event, data in stream_press_release(
+                company_name=request.company_name,
+                announcement=request.announcement,
+                company_info=request.company_info,
+                target_audience=request.target_audience
+            ):
+                yield format_sse(event, data)
+        except Exception as e:
+            yield format_sse("error", {"detail": f"Error generating press release: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/enhance", response_model=PREnhancement)
 async def enhance_pr(
     request: EnhancePRRequest,
@@ -56,7 +328,15 @@ async def enhance_pr(
 ):
     """Enhance an existing press release"""
     try:
-        enhancement = await enhance_press_release(request.content)
+        flight_key = make_cache_key("enhance", "api", **request.model_dump())
+        enhancement = await enhancement_flight.do(
+            flight_key,
+            lambda: enhance_press_release(
+                request.content,
+                chunked=request.chunked,
+                incremental=request.incremental
+            )
+        )
         return enhancement
     except Exception as e:
         raise HTTPException(
@@ -65,30 +345,79 @@ async def enhance_pr(
         )
 
 
-@router.get("/")
+@router.get("/", response_model=PressReleasePage)
 async def list_press_releases(
-    skip: int = 0,
-    limit: int = 20,
-    db: AsyncSession = Depends(get_db)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    company: Optional[str] = Query(None, description="Company domain"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """List published press releases, newest first
+
+    Pages are fetched by cursor rather than offset: pass ``next_cursor``
+    from one response as ``cursor`` to get the next page. ``total`` is an
+    estimate on large listings (see ``total_is_estimate``). Like reads by
+    slug and search, this endpoint is anonymous, so it never lists drafts
+    or other unpublished releases.
+    """
+    try:
+        return await list_press_release_page(db, limit=limit, cursor=cursor, company_domain=company)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/search", response_model=PressReleaseSearchResults)
+async def search_press_release_index(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    company: Optional[str] = Query(None, description="Company domain"),
+    published_after: Optional[datetime] = Query(None),
+    published_before: Optional[datetime] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List published press releases"""
-    # TODO: Implement database query
-    return {
-        "total": 0,
-        "items": [],
-        "skip": skip,
-        "limit": limit
-    }
+    """Search published press releases, most relevant first
+
+    Matches headline, subheadline, body and keywords. Each result carries
+    ``headline_highlight`` and a body ``snippet`` with matches wrapped in
+    ``<mark>``; the rest of the text is HTML-escaped.
+    """
+    items = await search_press_releases(
+        db,
+        q,
+        limit=limit,
+        company_domain=company,
+        published_after=published_after,
+        published_before=published_before
+    )
+    return {"query": q, "items": items, "limit": limit}
 
 
-@router.get("/{pr_id}")
+@router.get("/{slug}", response_model=PressReleaseRead, responses={304: {"description": "Not Modified"}})
 async def get_press_release(
-    pr_id: int,
-    db: AsyncSession = Depends(get_db)
+    slug: str,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get a specific press release"""
-    # TODO: Implement database query
-    return {
-        "id": pr_id,
-        "message": "Press release retrieval not yet implemented"
-    }
\ No newline at end of file
+    """Get a published press release by its slug
+
+    Served from an in-process cache after the first read. Responses carry
+    ``ETag`` and ``Last-Modified``; a matching ``If-None-Match`` or
+    ``If-Modified-Since`` gets ``304 Not Modified`` with no body. Both count
+    as a view and a (deduplicated) visitor.
+    """
+    entry = await get_published_release(db, slug)
+    if entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Press release not found")
+    if settings.views_counting_enabled:
+        view_counter.record(
+            UUID(entry["release"]["id"]),
+            visitor=_visitor_id(request),
+            company_domain=entry["release"]["company_domain"]
+        )
+
+    headers = {"ETag": entry["etag"], "Cache-Control": f"public, max-age={settings.release_http_max_age}"}
+    if entry["last_modified"]:
+        headers["Last-Modified"] = entry["last_modified"]
+    if is_not_modified(request.headers, entry["etag"], entry["last_modified"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(content=entry["release"], headers=headers)
@@ -0,0 +1,214 @@
+"""Content-addressed response cache for AI generation results"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import get_settings
+
+
+def normalize_prompt_input(value: str) -> str:
+    """Normalize a prompt input so trivially different retries share a key.
+
+    Unicode is NFC-normalized, runs of spaces/tabs are collapsed, trailing
+    whitespace is stripped from each line and blank-line runs are squashed to a
+    single paragraph break. Case and paragraph structure are preserved because
+    they change what the model is asked to write.
+    """
+    value = unicodedata.normalize("NFC", value)
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in value.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def make_cache_key(namespace: str, model_identity: str, **inputs: Any) -> str:
+    """Build a SHA-256 key from the namespace, model identity and prompt inputs"""
+    normalized = {
+        name: normalize_prompt_input(value) if isinstance(value, str) else value
+        for name, value in inputs.items()
+    }
+    payload = json.dumps(
+        {"namespace": namespace, "model": model_identity, "inputs": normalized},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a response cache"""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "hits": self.hits, "hit_ratio": round(self.hit_ratio, 4)}
+
+
+class ResponseCache:
+    """Two-tier cache: an in-memory LRU with TTL and an optional on-disk tier.
+
+    Values must be JSON-serializable (store ``model.model_dump()`` rather than
+    the model itself) so both tiers hold the same representation and callers
+    never share mutable objects between requests.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 86400,
+        disk_path: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = Path(disk_path) if disk_path else None
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.disk_path:
+            self.disk_path.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or ``None`` on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return json.loads(payload)
+                del self._entries[key]
+                self.stats.expirations += 1
+
+        disk_entry = self._read_disk(key, now)
+        with self._lock:
+            if disk_entry is None:
+                self.stats.misses += 1
+                return None
+            self.stats.disk_hits += 1
+            self._store_memory(key, *disk_entry)
+        return json.loads(disk_entry[1])
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store ``value`` under ``key`` in both tiers"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = time.time() + ttl
+        payload = json.dumps(value, ensure_ascii=False, default=str)
+        with self._lock:
+            self._store_memory(key, expires_at, payload)
+            self.stats.writes += 1
+        self._write_disk(key, expires_at, payload)
+
+    def invalidate(self, key: str) -> None:
+        """Remove ``key`` from both tiers"""
+        with self._lock:
+            self._entries.pop(key, None)
+        path = self._disk_file(key)
+        if path is not None:
+            self._remove_disk(path)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._entries.clear()
+        if self.disk_path:
+            for path in self.disk_path.glob("*/*.json"):
+                self._remove_disk(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store_memory(self, key: str, expires_at: float, payload: str) -> None:
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _disk_file(self, key: str) -> Optional[Path]:
+        if not self.disk_path:
+            return None
+        return self.disk_path / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        path = self._disk_file(key)
+        if path is None:
+            return None
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):  # Missing, unreadable or not JSON
+            return None
+        if not isinstance(record, dict):
+            record = {}
+        expires_at, payload = record.get("expires_at"), record.get("payload")
+        if not isinstance(expires_at, (int, float)) or not isinstance(payload, str):
+            self._remove_disk(path)  # Not an entry this cache wrote
+            return None
+        if expires_at <= now:
+            self._remove_disk(path)
+            with self._lock:
+                self.stats.expirations += 1
+            return None
+        return expires_at, payload
+
+    def _write_disk(self, key: str, expires_at: float, payload: str) -> None:
+        # The disk tier is best effort: on any I/O error the entry stays memory-only
+        path = self._disk_file(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so readers never see a partial entry
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"expires_at": expires_at, "payload": payload}, handle)
+            os.replace(tmp_name, path)
+        except OSError:
+            self._remove_disk(Path(tmp_name))
+
+    @staticmethod
+    def _remove_disk(path: Path) -> None:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+@lru_cache()
+def get_response_cache() -> ResponseCache:
+    """Get the shared response cache configured from settings"""
+    settings = get_settings()
+    return ResponseCache(
+        max_entries=settings.ai_cache_max_entries,
+        ttl_seconds=settings.ai_cache_ttl_seconds,
+        disk_path=settings.ai_cache_dir,
+    )
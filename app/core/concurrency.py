@@ -0,0 +1,38 @@
+"""Bounded-concurrency fan-out helpers"""
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+Outcome = Tuple[int, Optional[T], Optional[Exception]]
+
+
+async def bounded_as_completed(
+    factories: Sequence[Callable[[], Awaitable[T]]],
+    concurrency: int
+) -> AsyncIterator[Outcome]:
+    """Run the calls with at most ``concurrency`` in flight, yielding as they finish.
+
+    Yields ``(index, result, error)`` tuples in completion order, where
+    ``index`` is the position in ``factories`` and exactly one of ``result``
+    and ``error`` is set. A failing call never aborts the others. Closing the
+    iterator early (e.g. a client disconnect) cancels any remaining calls.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    outcomes: "asyncio.Queue[Outcome]" = asyncio.Queue()
+
+    async def run(index: int, factory: Callable[[], Awaitable[T]]) -> None:
+        async with semaphore:
+            try:
+                outcomes.put_nowait((index, await factory(), None))
+            except Exception as e:
+                outcomes.put_nowait((index, None, e))
+
+    tasks = [asyncio.ensure_future(run(i, factory)) for i, factory in enumerate(factories)]
+    try:
+        for _ in range(len(tasks)):
+            yield await outcomes.get()
+    finally:
+        for task in tasks:
+            task.cancel()
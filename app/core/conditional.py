@@ -0,0 +1,40 @@
+"""HTTP validators (ETag / Last-Modified) and conditional GET checks"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Mapping, Optional
+
+
+def make_etag(payload: str) -> str:
+    """A strong ETag for a serialized representation"""
+    return '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def http_date(value: datetime) -> str:
+    """Format ``value`` as an IMF-fixdate; naive datetimes are taken as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, last_modified: Optional[str]) -> bool:
+    """Whether a GET with these request headers can be answered with 304.
+
+    ``If-None-Match`` takes precedence over ``If-Modified-Since`` (RFC 9110
+    13.2.2); ETags compare weakly, so ``W/"x"`` matches ``"x"``.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in candidates
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
@@ -1,7 +1,7 @@
 """Configuration settings for PressWire v2"""
 
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 from functools import lru_cache
 
 
@@ -17,10 +17,27 @@ class Settings(BaseSettings):
 
     # Database
     database_url: Optional[str] = None
+    database_replica_url: Optional[str] = None  # Read-only dependencies use this when set
+    database_echo: bool = False  # Log every SQL statement
+    database_pool_size: int = 10
+    database_max_overflow: int = 20
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = 1800  # Seconds; below typical server/proxy idle timeouts
+    database_pool_pre_ping: bool = True
+    database_query_cache_size: int = 500  # Compiled SQL statements cached per engine
+    database_statement_cache_size: int = 100  # asyncpg prepared statements per connection; 0 behind PgBouncer
     supabase_url: Optional[str] = None
     supabase_key: Optional[str] = None
     supabase_service_key: Optional[str] = None
 
+    # Embedded SQLite (local fallback and small deployments)
+    sqlite_wal: bool = True  # WAL journal: readers never block the writer
+    sqlite_synchronous: str = "NORMAL"  # With WAL, durable across app crashes; a power cut may lose the last commits
+    sqlite_mmap_size: int = 268435456  # Bytes of the database file to memory-map
+    sqlite_cache_size_kib: int = 65536  # Page cache per connection
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_write_batch_size: int = 256  # Most queued writes committed in one transaction
+
     # Authentication
     jwt_secret_key: str = "development-secret-key-change-in-production"
     jwt_algorithm: str = "HS256"
@@ -40,6 +57,74 @@ class Settings(BaseSettings):
     openai_api_key: Optional[str] = None
     anthropic_api_key: Optional[str] = None
     pydantic_ai_model: str = "gpt-4o-mini"
+    ai_warm_agents: bool = True  # Build agents at startup instead of on first request
+    ai_local_scoring: bool = True  # Score readability/quality locally, not by the model
+    ai_scoring_workers: Optional[int] = None  # Processes for batch scoring (default: one per CPU)
+
+    # AI Response Cache
+    ai_cache_enabled: bool = True
+    ai_cache_max_entries: int = 1024
+    ai_cache_ttl_seconds: int = 86400
+    ai_cache_dir: Optional[str] = None  # Set to enable the on-disk tier
+
+    # AI Provider Routing
+    ai_router_enabled: bool = True
+    ai_router_hedge_enabled: bool = False
+    ai_router_hedge_min_samples: int = 20
+    ai_router_window_size: int = 50
+    ai_router_failure_threshold: int = 3
+    ai_router_cooldown_seconds: float = 30.0
+    ai_router_explore_rate: float = 0.05  # Share of requests sent first to a provider lacking latency samples
+
+    # AI Provider Rate Limits (applied per provider; 0 disables a bucket)
+    ai_limit_enabled: bool = True
+    ai_limit_requests_per_minute: int = 500
+    ai_limit_tokens_per_minute: int = 200000
+    ai_limit_initial_concurrency: int = 4
+    ai_limit_min_concurrency: int = 1
+    ai_limit_max_concurrency: int = 32
+    ai_limit_latency_spike_factor: float = 2.0
+    # Per-provider overrides, e.g. {"anthropic": {"requests_per_minute": 50}}
+    ai_limit_overrides: Dict[str, Dict[str, float]] = {}
+
+    # AI Chunked Enhancement
+    ai_enhance_chunk_threshold: int = 6000  # Chars above which /enhance is chunked
+    ai_enhance_chunk_chars: int = 2000
+    ai_enhance_chunk_concurrency: int = 4
+
+    # AI Batch Generation
+    ai_batch_concurrency: int = 5
+    ai_batch_max_items: int = 50
+
+    # AI Mock Simulator (pr_generator_mock latency/errors for load testing)
+    ai_mock_latency: str = "none"  # none, fixed, lognormal or long_tail
+    ai_mock_latency_median_seconds: float = 2.0
+    ai_mock_latency_sigma: float = 0.5
+    ai_mock_tail_probability: float = 0.02
+    ai_mock_tail_multiplier: float = 8.0
+    ai_mock_error_rate: float = 0.0
+    ai_mock_seed: Optional[int] = None
+
+    # Generation Jobs
+    jobs_backend: str = "sqlite"  # sqlite (local file) or redis (uses redis_url)
+    jobs_sqlite_path: str = "./presswire_jobs.db"
+    jobs_workers: int = 4
+    jobs_poll_interval: float = 0.5
+    jobs_max_attempts: int = 2
+    jobs_visibility_timeout: float = 300.0  # Running jobs with no heartbeat for this long are requeued
+    jobs_sync_wait_seconds: float = 60.0  # How long /generate waits before answering 202
+    jobs_result_ttl_seconds: int = 86400
+
+    # Published Release Retrieval
+    release_cache_enabled: bool = True
+    release_cache_max_entries: int = 2048
+    # Per process: bounds staleness from writes that bypass the ORM or come from other workers
+    release_cache_ttl_seconds: int = 60
+    release_http_max_age: int = 60  # Cache-Control max-age for GET by slug
+
+    # View Counting (write-behind; a crash loses at most one flush interval)
+    views_counting_enabled: bool = True
+    views_flush_interval_seconds: float = 5.0
 
     # CRO API
     cro_api_base_url: str = "https://api.vision-net.ie/live"
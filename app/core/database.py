@@ -1,39 +1,139 @@
 """Database connection and session management"""
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from typing import AsyncGenerator
-from app.core.config import get_settings
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Optional, TypeVar
+from app.core.config import Settings, get_settings
+from app.core.sqlite_writer import BEGIN_IMMEDIATE, SQLiteWriteQueue
 
 settings = get_settings()
 
-# Create async engine
-# Use SQLite for local development if DATABASE_URL contains placeholder
-database_url = settings.database_url
-if database_url and "your-db-password" in database_url:
-    database_url = None  # Fall back to SQLite
+SQLITE_FALLBACK_URL = "sqlite+aiosqlite:///./presswire.db"
+
+T = TypeVar("T")
+
+
+def configure_sqlite(engine: AsyncEngine, settings: Settings = settings) -> None:
+    """Tune every new SQLite connection for concurrent use
+
+    Sets WAL journaling, the sync level, memory-mapped I/O, the page cache
+    and a busy timeout. It also has SQLAlchemy issue ``BEGIN`` itself,
+    because the sqlite3 module's implicit transactions break SAVEPOINT,
+    which ``SQLiteWriteQueue`` relies on. Sessions opened with
+    ``begin_write`` get ``BEGIN IMMEDIATE``.
+    """
+    in_memory = engine.url.database in (None, "", ":memory:")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        if settings.sqlite_wal and not in_memory:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA cache_size={-int(settings.sqlite_cache_size_kib)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(connection):
+        immediate = all(connection.get_execution_options().get(k) for k in BEGIN_IMMEDIATE)
+        connection.exec_driver_sql("BEGIN IMMEDIATE" if immediate else "BEGIN")
 
-engine = create_async_engine(
-    database_url or "sqlite+aiosqlite:///./presswire.db",
-    echo=settings.app_debug,
-    future=True
-)
 
-# Create session factory
+def create_database_engine(url: Optional[str], settings: Settings = settings) -> AsyncEngine:
+    """An async engine for ``url`` with the pool and caching from ``settings``
+
+    Falls back to local SQLite when ``url`` is unset or still the example
+    placeholder.
+    """
+    if not url or "your-db-password" in url:
+        url = SQLITE_FALLBACK_URL
+    parsed = make_url(url)
+    options: Dict[str, Any] = {
+        "echo": settings.database_echo,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+        "pool_recycle": settings.database_pool_recycle,
+        "query_cache_size": settings.database_query_cache_size,
+    }
+    # aiosqlite opens a connection per checkout (or one static connection in memory)
+    if parsed.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+        )
+    if parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"prepared_statement_cache_size": settings.database_statement_cache_size}
+    engine = create_async_engine(url, **options)
+    if parsed.get_backend_name() == "sqlite":
+        configure_sqlite(engine, settings)
+    return engine
+
+
+# Writes always go to the primary; read-only endpoints use the replica if one is configured
+engine = create_database_engine(settings.database_url)
+read_engine = create_database_engine(settings.database_replica_url) if settings.database_replica_url else engine
+
+# Create session factories
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
 
 # Base class for models
 Base = declarative_base()
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get database session"""
+    """Dependency to get a session on the primary database"""
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get a session for reads, on the replica when one is configured
+
+    Replicas lag the primary, so use this only where slightly stale data
+    is acceptable (listings, search, published releases).
+    """
+    async with AsyncReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+@lru_cache()
+def get_write_queue() -> SQLiteWriteQueue:
+    """The process-wide writer for an embedded SQLite primary"""
+    return SQLiteWriteQueue(AsyncSessionLocal, max_batch=settings.sqlite_write_batch_size)
+
+
+async def run_write(work: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    """Run ``work(session)`` on the primary and commit, returning its result
+
+    On SQLite the write joins the single-writer queue and shares a
+    transaction with other concurrent writes; elsewhere it gets its own
+    session.
+    """
+    if engine.url.get_backend_name() == "sqlite":
+        return await get_write_queue().submit(work)
+    async with AsyncSessionLocal() as session:
+        result = await work(session)
+        await session.commit()
+        return result
@@ -0,0 +1,86 @@
+"""HyperLogLog sketches for counting distinct visitors in constant memory"""
+
+import hashlib
+import math
+import zlib
+from typing import Iterable, Optional
+
+DEFAULT_PRECISION = 12  # 4096 registers: ~1.6% standard error, <=4 KiB before compression
+
+_FORMAT_VERSION = 1
+_HASH_BITS = 64
+
+
+class HyperLogLog:
+    """A dense HyperLogLog sketch over 64-bit BLAKE2b hashes.
+
+    Standard error is about ``1.04 / sqrt(2 ** precision)``. Sketches with
+    the same precision merge by taking the register-wise maximum, so the
+    union of any number of sketches is estimated without the raw items.
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[bytes] = None):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is not None and len(registers) != self.size:
+            raise ValueError("register count does not match precision")
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.size)
+
+    @staticmethod
+    def hash(item: str) -> int:
+        """The 64-bit hash ``add`` uses; hash once to add one item to several sketches"""
+        return int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def add(self, item: str) -> None:
+        self.add_hash(self.hash(item))
+
+    def add_hash(self, value: int) -> None:
+        rest_bits = _HASH_BITS - self.precision
+        index = value >> rest_bits
+        rest = value & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Fold ``other`` into this sketch (set union)"""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    @classmethod
+    def union(cls, sketches: Iterable["HyperLogLog"], precision: int = DEFAULT_PRECISION) -> "HyperLogLog":
+        merged = cls(precision)
+        for sketch in sketches:
+            merged.merge(sketch)
+        return merged
+
+    def estimate(self) -> int:
+        """Estimated number of distinct items added"""
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are empty
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+    def __bool__(self) -> bool:
+        return any(self.registers)
+
+    def to_bytes(self) -> bytes:
+        """Compact serialization: a two-byte header and the zlib-compressed registers"""
+        return bytes((_FORMAT_VERSION, self.precision)) + zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        if len(data) < 2 or data[0] != _FORMAT_VERSION:
+            raise ValueError("unrecognised HyperLogLog serialization")
+        return cls(data[1], zlib.decompress(data[2:]))
@@ -0,0 +1,569 @@
+"""Background job queue and asyncio worker pool for long-running AI calls"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATUSES = (SUCCEEDED, FAILED)
+
+# Lower numbers are claimed first; the default leaves room for more urgent work
+DEFAULT_PRIORITY = 2
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+_ABANDONED = "Worker stopped before finishing"
+
+
+@dataclass
+class Job:
+    """One unit of queued work and, once finished, its result or error"""
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    priority: int = DEFAULT_PRIORITY
+    status: str = QUEUED
+    attempts: int = 0
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class JobQueue(ABC):
+    """Interface shared by the queue backends"""
+
+    @abstractmethod
+    async def enqueue(self, kind: str, payload: Dict[str, Any], priority: int = DEFAULT_PRIORITY) -> Job:
+        ...
+
+    @abstractmethod
+    async def claim(self) -> Optional[Job]:
+        """Atomically take the highest-priority, oldest queued job"""
+
+    @abstractmethod
+    async def complete(self, job_id: str, result: Any) -> None:
+        ...
+
+    @abstractmethod
+    async def fail(self, job_id: str, error: str, retry: bool = False) -> None:
+        """Mark a job failed, or put it back on the queue when ``retry`` is set"""
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Job]:
+        ...
+
+    @abstractmethod
+    async def heartbeat(self, job_id: str) -> None:
+        """Mark a running job as still being worked on, so recovery leaves it alone"""
+
+    @abstractmethod
+    async def recover(self, visibility_timeout: float, max_attempts: Optional[int] = None) -> int:
+        """Requeue running jobs with no heartbeat for ``visibility_timeout`` (e.g. from a crashed worker).
+
+        Jobs that have already had ``max_attempts`` are failed instead, so a
+        job that keeps killing its worker is not retried forever. Returns the
+        number of jobs requeued or failed.
+        """
+
+    @abstractmethod
+    async def depth(self) -> int:
+        """Number of jobs waiting to be claimed"""
+
+    async def close(self) -> None:
+        pass
+
+
+class SQLiteJobQueue(JobQueue):
+    """Persistent queue in a local SQLite file, for development and single-host deploys.
+
+    Every operation runs in a thread so the event loop is never blocked on
+    disk I/O. Claims use ``BEGIN IMMEDIATE`` so several processes sharing
+    the file never take the same job.
+    """
+
+    def __init__(self, path: str, result_ttl_seconds: int = 86400):
+        self.path = path
+        self.result_ttl_seconds = result_ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    heartbeat_at REAL
+                )
+                """
+            )
+            # Files created before heartbeats existed
+            if "heartbeat_at" not in {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}:
+                conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_claim ON jobs (status, priority, created_at)")
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        def locked():
+            with self._lock:
+                return fn(self._connect())
+        return await asyncio.to_thread(locked)
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Job:
+        return Job(
+            id=row["id"],
+            kind=row["kind"],
+            payload=json.loads(row["payload"]),
+            priority=row["priority"],
+            status=row["status"],
+            attempts=row["attempts"],
+            result=json.loads(row["result"]) if row["result"] is not None else None,
+            error=row["error"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+        )
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any], priority: int = DEFAULT_PRIORITY) -> Job:
+        job = Job(id=uuid.uuid4().hex, kind=kind, payload=payload, priority=priority, created_at=time.time())
+
+        def insert(conn):
+            conn.execute(
+                "INSERT INTO jobs (id, kind, payload, priority, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job.id, kind, json.dumps(payload, default=str), priority, QUEUED, job.created_at),
+            )
+        await self._run(insert)
+        return job
+
+    async def claim(self) -> Optional[Job]:
+        def take(conn):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY priority, created_at LIMIT 1",
+                    (QUEUED,),
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                now = time.time()
+                conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, heartbeat_at = ? WHERE id = ?",
+                    (RUNNING, now, now, row["id"]),
+                )
+                claimed = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return self._row_to_job(claimed)
+        return await self._run(take)
+
+    async def complete(self, job_id: str, result: Any) -> None:
+        await self._run(lambda conn: conn.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, finished_at = ? WHERE id = ?",
+            (SUCCEEDED, json.dumps(result, default=str), time.time(), job_id),
+        ))
+
+    async def fail(self, job_id: str, error: str, retry: bool = False) -> None:
+        if retry:
+            await self._run(lambda conn: conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, started_at = NULL, heartbeat_at = NULL WHERE id = ?",
+                (QUEUED, error, job_id),
+            ))
+        else:
+            await self._run(lambda conn: conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (FAILED, error, time.time(), job_id),
+            ))
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        row = await self._run(lambda conn: conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+        return self._row_to_job(row) if row is not None else None
+
+    async def heartbeat(self, job_id: str) -> None:
+        await self._run(lambda conn: conn.execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?", (time.time(), job_id, RUNNING)
+        ))
+
+    async def recover(self, visibility_timeout: float, max_attempts: Optional[int] = None) -> int:
+        now = time.time()
+        stale = "status = ? AND coalesce(heartbeat_at, started_at) < ?"
+
+        def requeue(conn):
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (*FINISHED_STATUSES, now - self.result_ttl_seconds),
+            )
+            failed = 0
+            if max_attempts is not None:
+                failed = conn.execute(
+                    f"UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE {stale} AND attempts >= ?",
+                    (FAILED, _ABANDONED, now, RUNNING, now - visibility_timeout, max_attempts),
+                ).rowcount
+            return failed + conn.execute(
+                f"UPDATE jobs SET status = ?, started_at = NULL, heartbeat_at = NULL WHERE {stale}",
+                (QUEUED, RUNNING, now - visibility_timeout),
+            ).rowcount
+        return await self._run(requeue)
+
+    async def depth(self) -> int:
+        row = await self._run(lambda conn: conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)
+        ).fetchone())
+        return row[0]
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Pop the best queued id and mark it running in one step, so a crash or a
+# dropped connection can never leave a job in neither sorted set. Ids whose
+# hash is gone (expired or deleted) are discarded.
+_REDIS_CLAIM = """
+while true do
+    local popped = redis.call('ZPOPMIN', KEYS[1])
+    if #popped == 0 then
+        return false
+    end
+    local id = popped[1]
+    local key = ARGV[2] .. id
+    if redis.call('EXISTS', key) == 1 then
+        redis.call('HSET', key, 'status', ARGV[3], 'started_at', ARGV[1])
+        redis.call('HINCRBY', key, 'attempts', 1)
+        redis.call('ZADD', KEYS[2], ARGV[1], id)
+        return id
+    end
+end
+"""
+
+
+class RedisJobQueue(JobQueue):
+    """Queue shared by every API instance, backed by ``Settings.redis_url``.
+
+    Jobs are hashes under ``<prefix>:job:<id>``; queued IDs live in a sorted
+    set scored by priority then enqueue time. A claim is one Lua script that
+    pops the lowest score and moves the ID to a ``running`` sorted set scored
+    by its last heartbeat (for crash recovery); finished jobs expire after
+    the result TTL.
+    """
+
+    def __init__(self, url: str, prefix: str = "presswire:jobs", result_ttl_seconds: int = 86400):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("The redis job backend requires the 'redis' package") from e
+        self._redis = redis.from_url(url, decode_responses=True)
+        self._claim = self._redis.register_script(_REDIS_CLAIM)
+        self.prefix = prefix
+        self.result_ttl_seconds = result_ttl_seconds
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    @property
+    def _queued(self) -> str:
+        return f"{self.prefix}:queued"
+
+    @property
+    def _running(self) -> str:
+        return f"{self.prefix}:running"
+
+    @staticmethod
+    def _score(priority: int, created_at: float) -> float:
+        # Priority dominates; enqueue time (seconds, ~1.7e9) orders within a priority
+        return priority * 1e10 + created_at
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any], priority: int = DEFAULT_PRIORITY) -> Job:
+        job = Job(id=uuid.uuid4().hex, kind=kind, payload=payload, priority=priority, created_at=time.time())
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._key(job.id), mapping={
+                "kind": kind,
+                "payload": json.dumps(payload, default=str),
+                "priority": priority,
+                "status": QUEUED,
+                "attempts": 0,
+                "created_at": job.created_at,
+            })
+            pipe.zadd(self._queued, {job.id: self._score(priority, job.created_at)})
+            await pipe.execute()
+        return job
+
+    async def claim(self) -> Optional[Job]:
+        job_id = await self._claim(keys=[self._queued, self._running], args=[time.time(), self._key(""), RUNNING])
+        if not job_id:
+            return None
+        job = await self.get(job_id)
+        if job is None:
+            # Deleted since the claim; nothing left to run
+            await self._redis.zrem(self._running, job_id)
+        return job
+
+    async def _finish(self, job_id: str, fields: Dict[str, Any]) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._key(job_id), mapping={**fields, "finished_at": time.time()})
+            pipe.zrem(self._running, job_id)
+            pipe.expire(self._key(job_id), self.result_ttl_seconds)
+            await pipe.execute()
+
+    async def complete(self, job_id: str, result: Any) -> None:
+        await self._finish(job_id, {"status": SUCCEEDED, "result": json.dumps(result, default=str)})
+
+    async def fail(self, job_id: str, error: str, retry: bool = False) -> None:
+        if not retry:
+            await self._finish(job_id, {"status": FAILED, "error": error})
+            return
+        job = await self.get(job_id)
+        if job is None:
+            # The hash expired or was deleted, so there is nothing to requeue
+            logger.warning("Job %s vanished before it could be retried", job_id)
+            await self._redis.zrem(self._running, job_id)
+            return
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._key(job_id), mapping={"status": QUEUED, "error": error})
+            pipe.hdel(self._key(job_id), "started_at")
+            pipe.zrem(self._running, job_id)
+            pipe.zadd(self._queued, {job_id: self._score(job.priority, job.created_at)})
+            await pipe.execute()
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        data = await self._redis.hgetall(self._key(job_id))
+        if not data:
+            return None
+        return Job(
+            id=job_id,
+            kind=data["kind"],
+            payload=json.loads(data["payload"]),
+            priority=int(data["priority"]),
+            status=data["status"],
+            attempts=int(data.get("attempts", 0)),
+            result=json.loads(data["result"]) if "result" in data else None,
+            error=data.get("error"),
+            created_at=float(data["created_at"]),
+            started_at=float(data["started_at"]) if "started_at" in data else None,
+            finished_at=float(data["finished_at"]) if "finished_at" in data else None,
+        )
+
+    async def heartbeat(self, job_id: str) -> None:
+        # XX: only jobs still in the running set; a finished or requeued job is left alone
+        await self._redis.zadd(self._running, {job_id: time.time()}, xx=True)
+
+    async def recover(self, visibility_timeout: float, max_attempts: Optional[int] = None) -> int:
+        stale = await self._redis.zrangebyscore(self._running, 0, time.time() - visibility_timeout)
+        for job_id in stale:
+            job = await self.get(job_id)
+            exhausted = job is not None and max_attempts is not None and job.attempts >= max_attempts
+            await self.fail(job_id, _ABANDONED, retry=not exhausted)
+        return len(stale)
+
+    async def depth(self) -> int:
+        return await self._redis.zcard(self._queued)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class JobWorkerPool:
+    """A fixed number of asyncio workers draining a ``JobQueue``.
+
+    Handlers are registered per job kind and receive the job payload; their
+    return value (JSON-serializable) becomes the job result. Failed jobs are
+    retried until ``max_attempts`` is reached. Callers in the same process
+    are woken as soon as a job finishes; others fall back to polling.
+
+    A running job sends a heartbeat every third of ``visibility_timeout``, so
+    however long its provider calls take it is never requeued while its
+    worker is alive. Jobs whose heartbeats stop (a crashed process, or a
+    queue error while recording the outcome) are requeued by idle workers
+    once ``visibility_timeout`` passes, or failed if they are out of attempts.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        workers: int = 4,
+        poll_interval: float = 0.5,
+        max_attempts: int = 2,
+        visibility_timeout: float = 300.0
+    ):
+        self.queue = queue
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.visibility_timeout = visibility_timeout
+        self._handlers: Dict[str, JobHandler] = {}
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._finished: Dict[str, asyncio.Event] = {}
+        self._last_recovery = 0.0
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks) and self._loop is asyncio.get_running_loop()
+
+    async def start(self) -> None:
+        """Start the workers on the running loop (no-op if already started there)"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._finished = {}
+        self._tasks = [asyncio.create_task(self._work(), name=f"job-worker-{i}") for i in range(self.workers)]
+        await self._recover()
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running are requeued on the next start"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def submit(self, kind: str, payload: Dict[str, Any], priority: int = DEFAULT_PRIORITY) -> Job:
+        """Enqueue a job, starting the workers if needed"""
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        await self.start()
+        job = await self.queue.enqueue(kind, payload, priority)
+        self._wakeup.set()
+        return job
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Job]:
+        """Wait up to ``timeout`` for a job to finish and return its latest state"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = await self.queue.get(job_id)
+            if job is None or job.finished:
+                self._finished.pop(job_id, None)
+                return job
+            remaining = self.poll_interval if deadline is None else min(self.poll_interval, deadline - time.monotonic())
+            if remaining <= 0:
+                return job
+            event = self._finished.setdefault(job_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                job = await self.queue.claim()
+            except Exception:
+                logger.exception("Failed to claim a job")
+                job = None
+            if job is None:
+                if time.monotonic() - self._last_recovery >= self.visibility_timeout:
+                    await self._recover()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        handler = self._handlers.get(job.kind)
+        heartbeat = asyncio.create_task(self._heartbeat(job), name=f"job-heartbeat-{job.id}")
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind '{job.kind}'")
+            result = await handler(job.payload)
+        except asyncio.CancelledError:
+            await self._record(job, asyncio.shield(self.queue.fail(job.id, _ABANDONED, retry=True)))
+            raise
+        except Exception as e:
+            retry = handler is not None and job.attempts < self.max_attempts
+            logger.warning("Job %s (%s) failed on attempt %d: %s", job.id, job.kind, job.attempts, e)
+            await self._record(job, self.queue.fail(job.id, str(e), retry=retry))
+            if retry:
+                self._wakeup.set()
+        else:
+            await self._record(job, self.queue.complete(job.id, result))
+        finally:
+            heartbeat.cancel()
+            # Waiters re-read the job, so waking them early (on a retry or a failed write) is harmless
+            event = self._finished.pop(job.id, None)
+            if event is not None:
+                event.set()
+
+    async def _heartbeat(self, job: Job) -> None:
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            try:
+                await self.queue.heartbeat(job.id)
+            except Exception:
+                logger.exception("Could not send a heartbeat for job %s (%s)", job.id, job.kind)
+
+    async def _record(self, job: Job, update: Awaitable[None]) -> None:
+        """Persist a job outcome; a backend error is logged rather than ending the worker"""
+        try:
+            await update
+        except Exception:
+            # The job stays running and is requeued by the next recovery pass
+            logger.exception("Could not record the outcome of job %s (%s)", job.id, job.kind)
+
+    async def _recover(self) -> None:
+        self._last_recovery = time.monotonic()
+        try:
+            recovered = await self.queue.recover(self.visibility_timeout, self.max_attempts)
+        except Exception:
+            logger.exception("Failed to requeue stale jobs")
+            return
+        if recovered:
+            logger.warning("Recovered %d stale jobs", recovered)
+            self._wakeup.set()
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    """Queue backend selected by ``Settings.jobs_backend``"""
+    settings = get_settings()
+    if settings.jobs_backend == "redis":
+        return RedisJobQueue(settings.redis_url, result_ttl_seconds=settings.jobs_result_ttl_seconds)
+    return SQLiteJobQueue(settings.jobs_sqlite_path, result_ttl_seconds=settings.jobs_result_ttl_seconds)
@@ -0,0 +1,50 @@
+"""Opaque cursors for keyset pagination"""
+
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+from typing import Any, Dict, Optional
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded (tampered, truncated or stale)"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"uuid": value.hex}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    if "uuid" in value:
+        return UUID(hex=value["uuid"])
+    return datetime.fromisoformat(value["dt"])
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode the sort-key values of the last row on a page as an opaque token"""
+    payload = {key: _encode_value(value) for key, value in values.items()}
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str], keys: tuple) -> Optional[Dict[str, Any]]:
+    """Decode a cursor produced by ``encode_cursor``, checking it carries ``keys``"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, dict) or set(payload) != set(keys):
+            raise InvalidCursor("Cursor does not match this listing")
+        return {key: _decode_value(value) for key, value in payload.items()}
+    except InvalidCursor:
+        raise
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor("Malformed cursor") from e
@@ -0,0 +1,45 @@
+"""In-process single-flight coalescing for concurrent identical calls"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its result.
+
+    The first caller for a key starts the call as a task; callers that
+    arrive while it is in flight await the same task. Each waiter is
+    shielded, so a client disconnecting (cancelling its request) does not
+    cancel the upstream call the other waiters depend on. The key is
+    released as soon as the call finishes, so later requests start fresh.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn()`` for ``key``, joining an in-flight call if one exists"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self.calls += 1
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Number of keys with a call currently running"""
+        return len(self._calls)
+
+    def _forget(self, key: str, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieve the exception so an unawaited failure is not logged
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,144 @@
+"""Single-writer queue that batches concurrent SQLite writes into shared transactions"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteWork = Callable[[AsyncSession], Awaitable[T]]
+
+# Session.connection() option that makes the SQLite "begin" hook take the write
+# lock up front. Under WAL a deferred transaction that later writes fails with
+# SQLITE_BUSY, without waiting, if another connection committed in between.
+BEGIN_IMMEDIATE = {"sqlite_begin_immediate": True}
+
+
+async def begin_write(session: AsyncSession) -> None:
+    """Start ``session``'s transaction as a write transaction (no-op off SQLite)"""
+    await session.connection(execution_options=BEGIN_IMMEDIATE)
+
+
+class SQLiteWriteQueue:
+    """Funnels writes through one task so SQLite sees a single writer.
+
+    SQLite allows one writer at a time, and each commit costs a journal
+    sync, so many small concurrent transactions mostly wait on the lock and
+    the disk. Here every ``submit``ted write joins a queue; one task takes
+    whatever has accumulated (up to ``max_batch``), runs the writes in one
+    transaction and commits once, so the ORM flushes them together. If any
+    write (or the commit) fails, the batch is rolled back and replayed with
+    a SAVEPOINT per write: the failing write is rolled back alone and only
+    its caller sees the error. Writes may therefore run twice and must not
+    have side effects outside the session. Readers use their own
+    connections and, under WAL, proceed in parallel.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], max_batch: int = 256):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.batches = 0  # Transactions committed, for observing the batching
+        self._queue: Optional["asyncio.Queue[Tuple[WriteWork, asyncio.Future]]"] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._writing: Optional["asyncio.Future[None]"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the writer task is alive on the current loop (False outside a loop)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return self._task is not None and not self._task.done() and self._loop is loop
+
+    async def start(self) -> None:
+        """Start the writer task on the running loop (no-op if already started there)"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._drain(), name="sqlite-writer")
+
+    async def stop(self) -> None:
+        """Commit everything already queued, then stop the writer task"""
+        task, self._task = self._task, None
+        if task is None or self._loop is not asyncio.get_running_loop():
+            return  # Never started, or started on a loop that has since closed
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        # Cancelling does not interrupt a shielded batch; let it commit before writing the rest
+        writing, self._writing = self._writing, None
+        if writing is not None:
+            await asyncio.gather(writing, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            await self._write(self._take_batch([]))
+
+    async def submit(self, work: WriteWork) -> T:
+        """Run ``work(session)`` in the next batch and return its result once committed"""
+        await self.start()
+        future = self._loop.create_future()
+        self._queue.put_nowait((work, future))
+        return await future
+
+    def _take_batch(self, batch: List[Tuple[WriteWork, asyncio.Future]]) -> List[Tuple[WriteWork, asyncio.Future]]:
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _drain(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                # Let writers that are already runnable join this batch
+                await asyncio.sleep(0)
+            finally:
+                # Even when cancelled here: the taken writes must still be committed
+                self._writing = asyncio.ensure_future(self._write(self._take_batch(batch)))
+            await asyncio.shield(self._writing)
+
+    async def _write(self, batch: List[Tuple[WriteWork, asyncio.Future]]) -> None:
+        batch = [(work, future) for work, future in batch if not future.cancelled()]
+        if not batch:
+            return
+        try:
+            outcomes = await self._commit(batch, isolate=False)
+        except Exception as e:
+            if len(batch) == 1:
+                outcomes = [(batch[0][1], e, None)]
+            else:
+                # Something in the batch failed: redo it with a savepoint per write
+                try:
+                    outcomes = await self._commit(batch, isolate=True)
+                except Exception as e:
+                    logger.exception("SQLite write batch of %d failed to commit", len(batch))
+                    outcomes = [(future, e, None) for _, future in batch]
+        for future, error, result in outcomes:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    async def _commit(self, batch: List[Tuple[WriteWork, asyncio.Future]], isolate: bool) -> list:
+        outcomes = []
+        async with self.session_factory() as db:
+            await begin_write(db)
+            for work, future in batch:
+                if not isolate:
+                    outcomes.append((future, None, await work(db)))
+                    continue
+                try:
+                    async with db.begin_nested():
+                        result = await work(db)
+                except Exception as e:
+                    outcomes.append((future, e, None))
+                else:
+                    outcomes.append((future, None, result))
+            await db.commit()
+        self.batches += 1
+        return outcomes
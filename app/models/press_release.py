@@ -1,14 +1,42 @@
 """Press Release database models"""
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, JSON
-from sqlalchemy.sql import func
+from sqlalchemy import (
+    Column, Integer, String, Text, DateTime, Boolean, Float, JSON, LargeBinary, Index, UniqueConstraint, Uuid, DDL,
+    event, inspect
+)
+from sqlalchemy.sql import func, text
 from app.core.database import Base
+from app.core.ids import uuid7
+from app.services.excerpts import make_excerpt
+
+# Predicates of the partial listing indexes (see listing_filters)
+PUBLISHED = text("status = 'published'")
+UNPUBLISHED = text("status <> 'published'")
 
 
 class PressRelease(Base):
     __tablename__ = "press_releases"
-
-    id = Column(Integer, primary_key=True, index=True)
+    __table_args__ = (
+        # Keyset pagination of listings on (publish_date, id). The public feeds
+        # (all published releases, or one company's) get partial indexes that
+        # leave drafts out, and other statuses one that leaves published rows
+        # out, so each listing has exactly one index. Queries must spell the
+        # predicate (see listing_filters) for the planner to match them.
+        Index(
+            "ix_press_releases_published_publish_date_id", "publish_date", "id",
+            sqlite_where=PUBLISHED, postgresql_where=PUBLISHED,
+        ),
+        Index(
+            "ix_press_releases_company_published_publish_date_id", "company_domain", "publish_date", "id",
+            sqlite_where=PUBLISHED, postgresql_where=PUBLISHED,
+        ),
+        Index(
+            "ix_press_releases_unpublished_status_publish_date_id", "status", "publish_date", "id",
+            sqlite_where=UNPUBLISHED, postgresql_where=UNPUBLISHED,
+        ),
+    )
+    # UUIDv7: time-ordered, so inserts append to the key index and ids sort by creation
+    id = Column(Uuid, primary_key=True, default=uuid7)
 
     # Company Information
     company_name = Column(String(255), nullable=False, index=True)
@@ -21,6 +49,7 @@ class PressRelease(Base):
     subheadline = Column(String(500))
     body = Column(Text, nullable=False)
     boilerplate = Column(Text)
+    excerpt = Column(String(300))  # Lead paragraph for listings; kept in step with body
 
     # SEO Metadata
     seo_title = Column(String(255))
@@ -73,10 +102,58 @@ class PressRelease(Base):
         return f"<PressRelease {self.headline}>"
 
 
+@event.listens_for(PressRelease, "before_insert")
+@event.listens_for(PressRelease, "before_update")
+def _refresh_excerpt(mapper, connection, target):
+    """Recompute the excerpt when the body changes (unless it was set explicitly).
+
+    Only ORM flushes fire this; rows written with Core ``insert``/``update``
+    are picked up by ``backfill_excerpts``.
+    """
+    state = inspect(target)
+    if state.attrs.excerpt.history.has_changes():
+        return
+    if state.key is None or state.attrs.body.history.has_changes():
+        target.excerpt = make_excerpt(target.body)
+
+
+# SQLite full-text index: an external-content FTS5 table over the searchable
+# columns, kept current by triggers that fire only when those columns change.
+# FTS5 needs an integer key, so it follows the table's implicit rowid (the
+# UUID id is not one); VACUUM may renumber rowids, so run
+# ``rebuild_search_index`` after one. Postgres uses the generated
+# ``search_vector`` column in supabase_schema.sql.
+SQLITE_SEARCH_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS press_releases_fts USING fts5(
+        headline, subheadline, body, keywords,
+        content='press_releases',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS press_releases_fts_insert AFTER INSERT ON press_releases BEGIN
+        INSERT INTO press_releases_fts(rowid, headline, subheadline, body, keywords)
+        VALUES (new.rowid, new.headline, new.subheadline, new.body, new.keywords);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS press_releases_fts_delete AFTER DELETE ON press_releases BEGIN
+        INSERT INTO press_releases_fts(press_releases_fts, rowid, headline, subheadline, body, keywords)
+        VALUES ('delete', old.rowid, old.headline, old.subheadline, old.body, old.keywords);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS press_releases_fts_update
+    AFTER UPDATE OF headline, subheadline, body, keywords ON press_releases BEGIN
+        INSERT INTO press_releases_fts(press_releases_fts, rowid, headline, subheadline, body, keywords)
+        VALUES ('delete', old.rowid, old.headline, old.subheadline, old.body, old.keywords);
+        INSERT INTO press_releases_fts(rowid, headline, subheadline, body, keywords)
+        VALUES (new.rowid, new.headline, new.subheadline, new.body, new.keywords);
+    END""",
+)
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(PressRelease.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+
 class Company(Base):
     __tablename__ = "companies"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Uuid, primary_key=True, default=uuid7)
     name = Column(String(255), nullable=False, index=True)
     domain = Column(String(255), unique=True, nullable=False, index=True)
     registration_number = Column(String(50), unique=True)  # CRO number
@@ -106,4 +183,22 @@ class Company(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     def __repr__(self):
-        return f"<Company {self.name}>"
\ No newline at end of file
+        return f"<Company {self.name}>"
+
+
+class VisitorSketch(Base):
+    """A serialized HyperLogLog of the visitors to a release or company over one period"""
+    __tablename__ = "visitor_sketches"
+    __table_args__ = (
+        UniqueConstraint("scope", "key", "period", name="uq_visitor_sketches_scope_key_period"),
+    )
+
+    id = Column(Uuid, primary_key=True, default=uuid7)
+    scope = Column(String(20), nullable=False)  # release, company
+    key = Column(String(255), nullable=False)  # Release id or company domain
+    period = Column(String(10), nullable=False)  # UTC day (YYYY-MM-DD) or "all"
+    sketch = Column(LargeBinary, nullable=False)  # HyperLogLog.to_bytes()
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<VisitorSketch {self.scope}:{self.key}@{self.period}>"
@@ -0,0 +1,68 @@
+"""Response schemas for stored press releases"""
+
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class PressReleaseRead(BaseModel):
+    """A press release as served to readers"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    slug: Optional[str] = None
+    status: str
+    company_name: str
+    company_domain: str
+    headline: str
+    subheadline: Optional[str] = None
+    body: str
+    boilerplate: Optional[str] = None
+    seo_title: Optional[str] = None
+    meta_description: Optional[str] = None
+    keywords: Optional[List[str]] = None
+    featured_image: Optional[str] = None
+    image_alt_text: Optional[str] = None
+    contact_name: Optional[str] = None
+    contact_email: Optional[str] = None
+    publish_date: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class PressReleaseSummary(BaseModel):
+    """The fields a listing or feed card shows; never carries the body"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    slug: Optional[str] = None
+    company_name: str
+    company_domain: str
+    headline: str
+    excerpt: Optional[str] = None
+    publish_date: Optional[datetime] = None
+
+
+class PressReleasePage(BaseModel):
+    """One page of a keyset-paginated listing"""
+    items: List[PressReleaseSummary]
+    limit: int
+    next_cursor: Optional[str] = None  # Pass back as ``cursor`` for the next page
+    total: int
+    total_is_estimate: bool  # Planner estimate (Postgres) or a capped count (SQLite)
+
+
+class PressReleaseSearchHit(PressReleaseSummary):
+    """A listing row ranked against a search query"""
+    score: float  # Higher is more relevant; comparable only within one result set
+    headline_highlight: str  # HTML-escaped headline with matches wrapped in <mark>
+    snippet: Optional[str] = None  # HTML-escaped body fragment around the matches
+
+
+class PressReleaseSearchResults(BaseModel):
+    """Ranked search results"""
+    query: str
+    items: List[PressReleaseSearchHit]
+    limit: int
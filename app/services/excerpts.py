@@ -0,0 +1,29 @@
+"""Short plain-text excerpts of press release bodies for listings and feeds"""
+
+import re
+import textwrap
+from typing import Optional
+
+EXCERPT_MAX_LENGTH = 280
+
+_TAG = re.compile(r"<[^>]+>")
+_MARKDOWN = re.compile(r"(^|\s)[#>*_`]+|[*_`]+(?=\s|$)")
+_PLACEHOLDER_LINES = re.compile(r"^\s*(?:for immediate release|###|-{3,})\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+def make_excerpt(body: Optional[str], max_length: int = EXCERPT_MAX_LENGTH) -> Optional[str]:
+    """The lead paragraph of ``body`` as plain text, cut at a word boundary.
+
+    Markup and release furniture ("FOR IMMEDIATE RELEASE", "###") are
+    dropped, and the first paragraph of at least a dozen words is used so a
+    standalone headline or dateline line is skipped.
+    """
+    if not body:
+        return None
+    text = _PLACEHOLDER_LINES.sub("", _TAG.sub(" ", body))
+    paragraphs = [" ".join(_MARKDOWN.sub(r"\1", p).split()) for p in re.split(r"\n\s*\n", text)]
+    paragraphs = [p for p in paragraphs if p]
+    if not paragraphs:
+        return None
+    lead = next((p for p in paragraphs if len(p.split()) >= 12), paragraphs[0])
+    return textwrap.shorten(lead, width=max_length, placeholder="…")
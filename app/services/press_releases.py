@@ -0,0 +1,247 @@
+"""Queries over stored press releases"""
+
+import json
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import bindparam, event, func, inspect, literal, select, text, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import ResponseCache
+from app.core.conditional import http_date, make_etag
+from app.core.config import get_settings
+from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.core.sqlite_writer import WriteWork
+from app.models.press_release import UNPUBLISHED, PressRelease
+from app.schemas.press_release import PressReleaseRead
+from app.services.excerpts import make_excerpt
+
+LIST_CURSOR_KEYS = ("publish_date", "id")
+
+# Columns a listing row carries; the Text/JSON columns stay on disk
+SUMMARY_COLUMNS = (
+    PressRelease.id,
+    PressRelease.slug,
+    PressRelease.company_name,
+    PressRelease.company_domain,
+    PressRelease.headline,
+    PressRelease.excerpt,
+    PressRelease.publish_date,
+)
+
+# SQLite has no planner estimate, so counts stop here and are reported as estimates
+COUNT_CAP = 10000
+
+
+def listing_filters(status: str = "published", company_domain: Optional[str] = None) -> List[Any]:
+    """WHERE clauses for a listing; rows without a publish date cannot be paged by it.
+
+    Each status has a partial index (see ``PressRelease.__table_args__``);
+    the status is rendered inline rather than bound, and non-published
+    listings repeat the index predicate, because SQLite and Postgres
+    generic plans only use a partial index whose predicate the query
+    visibly implies.
+    """
+    filters = [
+        PressRelease.status == bindparam("status", status, literal_execute=True),
+        PressRelease.publish_date.isnot(None),
+    ]
+    if status != "published":
+        filters.append(UNPUBLISHED)
+    if company_domain:
+        filters.append(PressRelease.company_domain == company_domain)
+    return filters
+
+
+async def estimate_count(db: AsyncSession, filters: List[Any]) -> Tuple[int, bool]:
+    """Row count for ``filters`` without a full ``COUNT(*)`` scan.
+
+    Postgres reports the planner's row estimate from ``EXPLAIN``; other
+    databases count at most ``COUNT_CAP`` matching rows. Returns the count
+    and whether it is an estimate.
+    """
+    dialect = db.get_bind().dialect
+    rows = select(literal(1)).select_from(PressRelease).where(*filters)
+
+    if dialect.name == "postgresql":
+        sql = rows.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        plan = (await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"]), True
+
+    count = (await db.execute(
+        select(func.count()).select_from(rows.limit(COUNT_CAP).subquery())
+    )).scalar_one()
+    return count, count >= COUNT_CAP
+
+
+async def list_press_release_page(
+    db: AsyncSession,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    status: str = "published",
+    company_domain: Optional[str] = None
+) -> Dict[str, Any]:
+    """One page of releases, newest first, using keyset pagination on ``(publish_date, id)``.
+
+    Each page is an index range scan that starts where the previous page's
+    last row left off, so deep pages cost the same as the first. Items are
+    ``SUMMARY_COLUMNS`` rows rather than ORM objects, so the body and JSON
+    columns are never read. Raises ``InvalidCursor`` for a cursor that was
+    not issued by this listing.
+    """
+    after = decode_cursor(cursor, LIST_CURSOR_KEYS)
+    if after is not None and not isinstance(after["id"], UUID):
+        raise InvalidCursor("Cursor does not match this listing")
+    filters = listing_filters(status, company_domain)
+
+    query = select(*SUMMARY_COLUMNS).where(*filters)
+    if after is not None:
+        query = query.where(
+            tuple_(PressRelease.publish_date, PressRelease.id) < (after["publish_date"], after["id"])
+        )
+    query = query.order_by(PressRelease.publish_date.desc(), PressRelease.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor({"publish_date": last.publish_date, "id": last.id})
+
+    total, total_is_estimate = await estimate_count(db, filters)
+    return {
+        "items": items,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "total": total,
+        "total_is_estimate": total_is_estimate,
+    }
+
+
+async def backfill_excerpts(
+    db: AsyncSession,
+    batch_size: int = 500,
+    write: Optional[Callable[[WriteWork], Awaitable[Any]]] = None
+) -> int:
+    """Fill in ``excerpt`` for rows written before it existed or outside the ORM.
+
+    Reads ``(id, body)`` in id order, ``batch_size`` rows at a time, and
+    commits after each batch: on ``db``, or through ``write`` (e.g.
+    ``run_write``, so the batches join the SQLite writer queue) when given.
+    Returns the number of rows updated.
+    """
+    updated, last_id = 0, None
+    while True:
+        query = select(PressRelease.id, PressRelease.body).where(PressRelease.excerpt.is_(None))
+        if last_id is not None:
+            query = query.where(PressRelease.id > last_id)
+        rows = (await db.execute(query.order_by(PressRelease.id).limit(batch_size))).all()
+        if not rows:
+            return updated
+
+        async def apply(session: AsyncSession, rows=rows) -> None:
+            for row in rows:
+                await session.execute(
+                    update(PressRelease)
+                    .where(PressRelease.id == row.id)
+                    .values(excerpt=make_excerpt(row.body))
+                )
+
+        if write is None:
+            await apply(db)
+            await db.commit()
+        else:
+            await db.commit()  # Ends the read transaction; the batch is written elsewhere
+            await write(apply)
+        updated += len(rows)
+        last_id = rows[-1].id
+
+
+@lru_cache()
+def get_release_cache() -> ResponseCache:
+    """Memory-only cache of published releases by slug"""
+    settings = get_settings()
+    return ResponseCache(
+        max_entries=settings.release_cache_max_entries,
+        ttl_seconds=settings.release_cache_ttl_seconds,
+    )
+
+
+def release_cache_key(slug: str) -> str:
+    return f"release:{slug}"
+
+
+def _cacheable_release(release: PressRelease) -> Dict[str, Any]:
+    """The served representation of ``release`` with its HTTP validators"""
+    body = PressReleaseRead.model_validate(release).model_dump(mode="json")
+    changed = release.updated_at or release.created_at
+    return {
+        "release": body,
+        "etag": make_etag(json.dumps(body, sort_keys=True, ensure_ascii=False)),
+        "last_modified": http_date(changed) if changed else None,
+    }
+
+
+async def get_published_release(db: AsyncSession, slug: str) -> Optional[Dict[str, Any]]:
+    """A published release by slug, read through the release cache.
+
+    Returns ``{"release", "etag", "last_modified"}`` or ``None`` if no
+    published release has that slug. Hits never touch the database; misses
+    are not cached, so a release is served as soon as it is published.
+    """
+    settings = get_settings()
+    key = release_cache_key(slug)
+    if settings.release_cache_enabled:
+        cached = get_release_cache().get(key)
+        if cached is not None:
+            return cached
+
+    release = (await db.execute(
+        select(PressRelease).where(PressRelease.slug == slug, PressRelease.status == "published")
+    )).scalar_one_or_none()
+    if release is None:
+        return None
+
+    entry = _cacheable_release(release)
+    if settings.release_cache_enabled:
+        get_release_cache().set(key, entry)
+    return entry
+
+
+_STALE_SLUGS = "release_cache_stale_slugs"
+
+
+@event.listens_for(PressRelease, "after_update")
+@event.listens_for(PressRelease, "after_delete")
+def _note_changed_release(mapper, connection, target):
+    """Remember a release the ORM wrote, under its old and new slug, until its session commits.
+
+    Invalidating at flush time would let a concurrent reader re-cache the
+    still-committed old row before this transaction commits.
+    """
+    session = object_session(target)
+    if session is None:
+        return
+    slugs = {target.slug, *inspect(target).attrs.slug.history.deleted}
+    session.info.setdefault(_STALE_SLUGS, set()).update(filter(None, slugs))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cached_releases(session):
+    """Drop the releases a transaction changed from this process's cache once it is committed.
+
+    Core ``update``/``delete`` statements and other worker processes' writes
+    bypass this; ``release_cache_ttl_seconds`` bounds how long such a change
+    can go unseen.
+    """
+    for slug in session.info.pop(_STALE_SLUGS, ()):
+        get_release_cache().invalidate(release_cache_key(slug))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_releases(session):
+    session.info.pop(_STALE_SLUGS, None)
@@ -0,0 +1,283 @@
+"""Local, deterministic readability and structure scoring for press releases"""
+
+import asyncio
+import re
+import statistics
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.sqlite_writer import WriteWork
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"'”’)]*\s+(?=[\"'“‘(]?[A-Z0-9])")
+_WORD = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)*|\d+(?:[.,]\d+)*")
+_VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+_PASSIVE = re.compile(
+    r"\b(?:am|is|are|was|were|be|been|being|get|gets|got|gotten)\s+(?:\w+ly\s+)?"
+    # Participles that almost always act as adjectives ("we are delighted") are not passive
+    r"(?!(?:excited|delighted|pleased|thrilled|interested|committed|dedicated|focused|"
+    r"based|located|headquartered|tired|concerned|involved|qualified|experienced)\b)"
+    r"(?:\w+ed|built|chosen|done|driven|given|held|known|led|made|met|paid|seen|sold|"
+    r"spent|taken|told|won|written|brought|bought|found|grown|shown|set|put|run)\b",
+    re.IGNORECASE,
+)
+_DATELINE = re.compile(r"^[A-Z][A-Za-z .'-]+,\s*(?:Ireland|[A-Z][a-z]+)?.{0,40}?[-–—]", re.MULTILINE)
+_WHEN = re.compile(
+    r"\b(?:today|yesterday|tomorrow|this (?:week|month|year)|monday|tuesday|wednesday|thursday|"
+    r"friday|saturday|sunday|january|february|march|april|may|june|july|august|september|"
+    r"october|november|december|20\d\d)\b",
+    re.IGNORECASE,
+)
+_ANNOUNCE = re.compile(r"\b(?:announce[sd]?|launch(?:es|ed)?|unveil(?:s|ed)?|open(?:s|ed)?|"
+                       r"appoint(?:s|ed)?|acquire[sd]?|raise[sd]?|partner(?:s|ed)?|"
+                       r"introduce[sd]?|expand(?:s|ed)?|release[sd]?)\b", re.IGNORECASE)
+_QUOTE = re.compile(r"[\"“][^\"”]{20,}[\"”]")
+_BOILERPLATE = re.compile(r"^\s*about\s+\S", re.IGNORECASE | re.MULTILINE)
+
+LONG_SENTENCE_WORDS = 25
+LEAD_MAX_WORDS = 45
+
+
+@lru_cache(maxsize=65536)
+def count_syllables(word: str) -> int:
+    """Estimate English syllables from vowel groups, with silent-e handling"""
+    word = word.lower().strip("'’")
+    if not word:
+        return 0
+    if word.isdigit():
+        return max(1, len(word))
+    if len(word) <= 3:
+        return 1
+    if word.endswith("e") and not word.endswith(("le", "ee", "ye")):
+        word = word[:-1]
+    elif word.endswith("ed") and not word.endswith(("ted", "ded")):
+        word = word[:-2]
+    elif word.endswith("es") and not word.endswith(("ses", "zes", "ces", "ges", "ches", "shes", "xes")):
+        word = word[:-2]
+    return max(1, len(_VOWEL_GROUPS.findall(word)))
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split prose into sentences, treating paragraph breaks as boundaries"""
+    sentences = []
+    for block in re.split(r"\n\s*\n|\n(?=[A-Z#\"“])", text):
+        block = " ".join(block.split())
+        if block:
+            sentences.extend(s for s in _SENTENCE_END.split(block) if _WORD.search(s))
+    return sentences
+
+
+def flesch_reading_ease(words: int, sentences: int, syllables: int) -> float:
+    """Flesch reading ease, clamped to 0-100"""
+    if not words or not sentences:
+        return 0.0
+    score = 206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words)
+    return round(min(100.0, max(0.0, score)), 1)
+
+
+@dataclass
+class ReadabilityReport:
+    """Readability and structure metrics for one press release"""
+    flesch_reading_ease: float
+    word_count: int
+    sentence_count: int
+    sentence_length_mean: float
+    sentence_length_median: float
+    sentence_length_p90: float
+    sentence_length_max: int
+    long_sentence_ratio: float
+    passive_voice_ratio: float
+    has_dateline: bool
+    lead_word_count: int
+    lead_has_when: bool
+    lead_has_announcement: bool
+    lead_is_concise: bool
+    has_quote: bool
+    has_boilerplate: bool
+
+    @property
+    def structure_score(self) -> float:
+        """Share of inverted-pyramid/lead checks passed, as 0-100"""
+        checks = [
+            self.has_dateline,
+            self.lead_has_when,
+            self.lead_has_announcement,
+            self.lead_is_concise,
+            self.has_quote,
+            self.has_boilerplate,
+        ]
+        return round(100.0 * sum(checks) / len(checks), 1)
+
+    @property
+    def overall_score(self) -> float:
+        """Weighted blend of readability, active voice, sentence length and structure"""
+        if not self.word_count:
+            return 0.0
+        active_voice = 100.0 * (1 - self.passive_voice_ratio)
+        short_sentences = 100.0 * (1 - self.long_sentence_ratio)
+        score = (
+            0.35 * self.flesch_reading_ease
+            + 0.15 * active_voice
+            + 0.15 * short_sentences
+            + 0.35 * self.structure_score
+        )
+        return round(min(100.0, max(0.0, score)), 1)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "structure_score": self.structure_score,
+            "overall_score": self.overall_score,
+        }
+
+
+def _lead_paragraph(paragraphs: Sequence[str]) -> str:
+    """The first paragraph that reads as prose (skips headline/dateline-only lines)"""
+    for paragraph in paragraphs:
+        if len(_WORD.findall(paragraph)) >= 12:
+            return paragraph
+    return paragraphs[0] if paragraphs else ""
+
+
+def analyze_text(text: str) -> ReadabilityReport:
+    """Compute readability and structure metrics for a press release body"""
+    sentences = split_sentences(text)
+    lengths = []
+    syllables = 0
+    passive = 0
+    for sentence in sentences:
+        words = _WORD.findall(sentence)
+        lengths.append(len(words))
+        syllables += sum(count_syllables(word) for word in words)
+        if _PASSIVE.search(sentence):
+            passive += 1
+
+    word_count = sum(lengths)
+    sentence_count = len(lengths)
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    lead = _lead_paragraph(paragraphs)
+    lead_sentences = split_sentences(lead)
+    lead_first_sentence = lead_sentences[0] if lead_sentences else lead
+    lead_words = len(_WORD.findall(lead_first_sentence))
+
+    if lengths:
+        ordered = sorted(lengths)
+        p90 = float(ordered[min(len(ordered) - 1, int(round(0.9 * (len(ordered) - 1))))])
+    else:
+        p90 = 0.0
+
+    return ReadabilityReport(
+        flesch_reading_ease=flesch_reading_ease(word_count, sentence_count, syllables),
+        word_count=word_count,
+        sentence_count=sentence_count,
+        sentence_length_mean=round(statistics.fmean(lengths), 1) if lengths else 0.0,
+        sentence_length_median=float(statistics.median(lengths)) if lengths else 0.0,
+        sentence_length_p90=p90,
+        sentence_length_max=max(lengths, default=0),
+        long_sentence_ratio=round(sum(1 for n in lengths if n > LONG_SENTENCE_WORDS) / sentence_count, 3)
+        if sentence_count else 0.0,
+        passive_voice_ratio=round(passive / sentence_count, 3) if sentence_count else 0.0,
+        has_dateline=bool(_DATELINE.search(text)),
+        lead_word_count=lead_words,
+        lead_has_when=bool(_WHEN.search(lead_first_sentence)),
+        lead_has_announcement=bool(_ANNOUNCE.search(lead_first_sentence)),
+        lead_is_concise=0 < lead_words <= LEAD_MAX_WORDS,
+        has_quote=bool(_QUOTE.search(text)),
+        has_boilerplate=bool(_BOILERPLATE.search(text)),
+    )
+
+
+def readability_score(text: str) -> float:
+    """Flesch reading ease for ``text`` (used for ``PRContent.readability_score``)"""
+    return analyze_text(text).flesch_reading_ease
+
+
+def overall_score(text: str) -> float:
+    """Overall quality score for ``text`` (used for ``PREnhancement.overall_score``)"""
+    return analyze_text(text).overall_score
+
+
+@lru_cache()
+def get_scoring_pool() -> ProcessPoolExecutor:
+    """The process pool shared by batch scoring, started on first use"""
+    return ProcessPoolExecutor(max_workers=get_settings().ai_scoring_workers)
+
+
+def _analyze_many(texts: Sequence[str]) -> List[ReadabilityReport]:
+    return [analyze_text(text) for text in texts]
+
+
+def analyze_batch(texts: Iterable[str], workers: Optional[int] = None, chunksize: int = 256) -> List[ReadabilityReport]:
+    """Score many texts at once.
+
+    Small batches are scored in-process. Large batches go to the shared
+    scoring pool (or a pool of ``workers`` processes when given), since
+    scoring is CPU-bound regex work that the GIL would otherwise serialize.
+    """
+    texts = list(texts)
+    if workers is None and len(texts) < 2000:
+        return _analyze_many(texts)
+    if workers is None:
+        return list(get_scoring_pool().map(analyze_text, texts, chunksize=chunksize))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(analyze_text, texts, chunksize=chunksize))
+
+
+async def analyze_batch_async(
+    texts: Sequence[str],
+    pool: Optional[Executor] = None,
+    chunksize: int = 256
+) -> List[ReadabilityReport]:
+    """Score ``texts`` in ``pool`` (default: the shared scoring pool) without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    pool = pool or get_scoring_pool()
+    chunks = await asyncio.gather(*(
+        loop.run_in_executor(pool, _analyze_many, texts[i:i + chunksize]) for i in range(0, len(texts), chunksize)
+    ))
+    return [report for chunk in chunks for report in chunk]
+
+
+async def rescore_press_releases(
+    db: AsyncSession,
+    batch_size: int = 1000,
+    pool: Optional[Executor] = None,
+    write: Optional[Callable[[WriteWork], Awaitable[Any]]] = None
+) -> int:
+    """Recompute ``ai_score`` for every stored press release; returns rows updated
+
+    Scoring runs in ``pool`` (default: the shared scoring pool), off the
+    event loop. Each batch is committed on ``db``, or through ``write``
+    (e.g. ``run_write``) when given.
+    """
+    from app.models.press_release import PressRelease
+
+    updated = 0
+    last_id = None
+    while True:
+        query = select(PressRelease.id, PressRelease.body).order_by(PressRelease.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(PressRelease.id > last_id)
+        rows = (await db.execute(query)).all()
+        if not rows:
+            break
+
+        reports = await analyze_batch_async([row.body or "" for row in rows], pool=pool)
+        scores = [{"id": row.id, "ai_score": report.overall_score} for row, report in zip(rows, reports)]
+
+        async def apply(session: AsyncSession, scores=scores) -> None:
+            await session.execute(update(PressRelease), scores)
+
+        if write is None:
+            await apply(db)
+            await db.commit()
+        else:
+            await db.commit()  # Ends the read transaction; the batch is written elsewhere
+            await write(apply)
+        updated += len(rows)
+        last_id = rows[-1].id
+    return updated
@@ -0,0 +1,184 @@
+"""Ranked full-text search over published press releases"""
+
+import html
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Uuid, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.press_release import SQLITE_SEARCH_DDL
+
+# Match markers from the database are private-use characters so the text can
+# be HTML-escaped before they become <mark> tags
+_MARK_START, _MARK_END = "\ue000", "\ue001"
+
+# bm25 weights for headline, subheadline, body and keywords
+SQLITE_COLUMN_WEIGHTS = (10.0, 5.0, 1.0, 3.0)
+
+SNIPPET_WORDS = 24
+
+# bm25 is computed for every match, so a query that matches most of the
+# table ranks only its newest matches that pass the filters; selective
+# queries are unaffected
+SQLITE_RANK_WINDOW = 2000
+
+# Shorter final words are matched whole, not as a prefix of every longer word
+PREFIX_MIN_LENGTH = 3
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+_SUMMARY_SQL = "p.id, p.slug, p.company_name, p.company_domain, p.headline, p.excerpt, p.publish_date"
+
+
+def fts5_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 MATCH expression that cannot be a syntax error.
+
+    Every word becomes a quoted term (all must match) and the last one, if
+    at least ``PREFIX_MIN_LENGTH`` characters, also matches as a prefix so
+    results appear while a word is being typed.
+    Returns ``None`` when there is nothing to search for.
+    """
+    terms = _TERM.findall(query)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    if len(terms[-1]) >= PREFIX_MIN_LENGTH:
+        quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def mark_matches(value: Optional[str]) -> Optional[str]:
+    """HTML-escape ``value`` and turn the database's match markers into <mark> tags"""
+    if value is None:
+        return None
+    return html.escape(value).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def _filters(
+    company_domain: Optional[str],
+    published_after: Optional[datetime],
+    published_before: Optional[datetime],
+) -> Tuple[str, Dict[str, Any]]:
+    clauses, params = ["p.status = 'published'"], {}
+    if company_domain:
+        clauses.append("p.company_domain = :company_domain")
+        params["company_domain"] = company_domain
+    if published_after:
+        clauses.append("p.publish_date >= :published_after")
+        params["published_after"] = published_after
+    if published_before:
+        clauses.append("p.publish_date < :published_before")
+        params["published_before"] = published_before
+    return " AND ".join(clauses), params
+
+
+def _typed(sql, params: Dict[str, Any]):
+    # Bind dates through the column type so SQLite compares them in its stored
+    # format, and read ids back as UUIDs rather than SQLite's stored hex
+    dates = [name for name in ("published_after", "published_before") if name in params]
+    return sql.bindparams(*(bindparam(name, type_=DateTime(timezone=True)) for name in dates)).columns(id=Uuid())
+
+
+async def _search_sqlite(db: AsyncSession, query: str, limit: int, where: str, params: Dict[str, Any]):
+    match = fts5_query(query)
+    if match is None:
+        return []
+    weights = ", ".join(str(w) for w in SQLITE_COLUMN_WEIGHTS)
+    sql = text(f"""
+        SELECT {_SUMMARY_SQL},
+               -bm25(press_releases_fts, {weights}) AS score,
+               highlight(press_releases_fts, 0, :mark_start, :mark_end) AS headline_highlight,
+               snippet(press_releases_fts, 2, :mark_start, :mark_end, '…', {SNIPPET_WORDS}) AS snippet
+        FROM press_releases_fts
+        JOIN press_releases AS p ON p.rowid = press_releases_fts.rowid
+        WHERE press_releases_fts MATCH :match
+          AND press_releases_fts.rowid >= coalesce((
+              SELECT press_releases_fts.rowid FROM press_releases_fts
+              JOIN press_releases AS p ON p.rowid = press_releases_fts.rowid
+              WHERE press_releases_fts MATCH :match AND {where}
+              ORDER BY press_releases_fts.rowid DESC LIMIT 1 OFFSET :window
+          ), 0)
+          AND {where}
+        ORDER BY bm25(press_releases_fts, {weights})
+        LIMIT :limit
+    """)
+    return (await db.execute(_typed(sql, params), {
+        **params,
+        "match": match,
+        "limit": limit,
+        "window": SQLITE_RANK_WINDOW - 1,
+        "mark_start": _MARK_START,
+        "mark_end": _MARK_END,
+    })).mappings().all()
+
+
+async def _search_postgres(db: AsyncSession, query: str, limit: int, where: str, params: Dict[str, Any]):
+    # Rank and limit first so ts_headline (which re-parses the text) runs on one page only
+    options = f"StartSel={_MARK_START}, StopSel={_MARK_END}"
+    sql = text(f"""
+        WITH q AS (SELECT websearch_to_tsquery('english', :query) AS query),
+        hits AS (
+            SELECT {_SUMMARY_SQL}, ts_rank_cd(p.search_vector, q.query) AS score
+            FROM press_releases AS p, q
+            WHERE p.search_vector @@ q.query AND {where}
+            ORDER BY score DESC
+            LIMIT :limit
+        )
+        SELECT hits.*,
+               ts_headline('english', hits.headline, q.query, :headline_options) AS headline_highlight,
+               ts_headline('english', p.body, q.query, :snippet_options) AS snippet
+        FROM hits JOIN press_releases AS p ON p.id = hits.id, q
+        ORDER BY hits.score DESC
+    """)
+    return (await db.execute(_typed(sql, params), {
+        **params,
+        "query": query,
+        "limit": limit,
+        "headline_options": f"{options}, HighlightAll=true",
+        "snippet_options": f"{options}, MaxWords={SNIPPET_WORDS}, MinWords=8, MaxFragments=2, FragmentDelimiter=…",
+    })).mappings().all()
+
+
+async def search_press_releases(
+    db: AsyncSession,
+    query: str,
+    limit: int = 20,
+    company_domain: Optional[str] = None,
+    published_after: Optional[datetime] = None,
+    published_before: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """Published releases matching ``query``, most relevant first.
+
+    SQLite ranks with FTS5 ``bm25`` (headline weighted above keywords,
+    subheadline and body) over at most the ``SQLITE_RANK_WINDOW`` newest
+    matches that pass the status/company/date filters; Postgres ranks with
+    ``ts_rank_cd`` over the weighted ``search_vector``. Each hit is a
+    listing row plus ``score``, ``headline_highlight`` and ``snippet``.
+    """
+    where, params = _filters(company_domain, published_after, published_before)
+    if db.get_bind().dialect.name == "postgresql":
+        rows = await _search_postgres(db, query, limit, where, params)
+    else:
+        rows = await _search_sqlite(db, query, limit, where, params)
+    return [
+        {**row, "headline_highlight": mark_matches(row["headline_highlight"]), "snippet": mark_matches(row["snippet"])}
+        for row in rows
+    ]
+
+
+async def rebuild_search_index(db: AsyncSession) -> None:
+    """Create the SQLite search index if missing and repopulate it from the table.
+
+    Needed once for databases created before search existed, and after a
+    ``VACUUM`` (which may renumber the rowids the index refers to);
+    otherwise the triggers keep it current. Postgres maintains
+    ``search_vector`` itself.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    for statement in SQLITE_SEARCH_DDL:
+        await db.execute(text(statement))
+    await db.execute(text("INSERT INTO press_releases_fts(press_releases_fts) VALUES ('rebuild')"))
+    await db.commit()
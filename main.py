@@ -8,14 +8,46 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
+from contextlib import asynccontextmanager
+from prometheus_fastapi_instrumentator import Instrumentator
+import logging
 import uvicorn
 import os
 
 # Import API routers
 from app.api.v1.press_releases import router as pr_router
+from app.agents.limiter import limiter_stats
+from app.agents.repair import repair_stats
 from app.core.config import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm AI agents and start job workers and the view counter; stop them and release clients on shutdown"""
+    from app.agents.registry import agent_registry, close_http_client
+    from app.api.v1.press_releases import job_workers, view_counter
+    from app.core.database import get_write_queue
+
+    if settings.ai_warm_agents:
+        try:
+            import app.agents.pr_generator  # noqa: F401 - registers the agents
+            warmed = agent_registry.warm()
+            logger.info("Warmed AI agents: %s", ", ".join(warmed))
+        except Exception as e:
+            # Missing API keys should not stop the API from serving
+            logger.warning("AI agent warm-up skipped: %s", e)
+    await job_workers.start()
+    await view_counter.start()
+    yield
+    await view_counter.stop()  # Flushes pending views
+    await get_write_queue().stop()  # Commits queued SQLite writes
+    await job_workers.stop()
+    await job_workers.queue.close()
+    await close_http_client()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -24,6 +56,7 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/api/docs" if settings.app_debug else None,
     redoc_url="/api/redoc" if settings.app_debug else None,
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -45,6 +78,9 @@ templates = Jinja2Templates(directory="templates")
 # Include API routers
 app.include_router(pr_router)
 
+# Prometheus metrics: HTTP requests plus the LLM telemetry registered by app.agents.telemetry
+Instrumentator().instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
+
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
     """Serve the landing page"""
@@ -77,6 +113,11 @@ async def api_root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/ai")
+async def ai_health_check():
+    """Per-provider limiter metrics and output repair counters"""
+    return {"providers": limiter_stats(), "output_repair": repair_stats.as_dict()}
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
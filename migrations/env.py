@@ -0,0 +1,59 @@
+"""Alembic environment: runs migrations through the app's async engine"""
+
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.engine import Connection
+
+from app.core.config import get_settings
+from app.core.database import SQLITE_FALLBACK_URL, Base, create_database_engine
+import app.models.press_release  # noqa: F401  (registers the tables on Base.metadata)
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def database_url() -> str:
+    """``sqlalchemy.url`` when set (e.g. by tests), else the app's primary database"""
+    return config.get_main_option("sqlalchemy.url") or get_settings().database_url or SQLITE_FALLBACK_URL
+
+
+def configure(**options) -> None:
+    context.configure(
+        target_metadata=target_metadata,
+        compare_type=True,
+        render_as_batch=True,  # SQLite can only ALTER by copying the table
+        **options,
+    )
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL instead of running it (``alembic upgrade head --sql``)"""
+    configure(url=database_url(), literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_with_connection(connection: Connection) -> None:
+    configure(connection=connection)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    engine = create_database_engine(database_url())
+    try:
+        async with engine.connect() as connection:
+            await connection.run_sync(run_with_connection)
+    finally:
+        await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,181 @@
+"""Baseline: companies, press releases and visitor sketches
+
+Databases created from supabase_schema.sql before migrations existed
+already have this schema: run ``alembic stamp 0001`` once, then
+``alembic upgrade head``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Time-ordered UUIDv7, as app.core.ids.uuid7 generates in the ORM
+POSTGRES_UUID7 = """
+CREATE OR REPLACE FUNCTION uuid_generate_v7()
+RETURNS UUID AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(uuid_send(gen_random_uuid())
+                        PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::BIGINT) FROM 3)
+                        FROM 1 FOR 6),
+                52, 1),
+            53, 1),
+        'hex')::UUID;
+$$ LANGUAGE sql VOLATILE
+"""
+
+POSTGRES_SEARCH_VECTOR = """
+ALTER TABLE press_releases ADD COLUMN search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(headline, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(subheadline, '')), 'B') ||
+    setweight(jsonb_to_tsvector('english', coalesce(keywords::jsonb, '[]'::jsonb), '["string"]'), 'B') ||
+    setweight(to_tsvector('english', body), 'C')
+) STORED
+"""
+
+SQLITE_SEARCH = (
+    """CREATE VIRTUAL TABLE press_releases_fts USING fts5(
+        headline, subheadline, body, keywords,
+        content='press_releases',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER press_releases_fts_insert AFTER INSERT ON press_releases BEGIN
+        INSERT INTO press_releases_fts(rowid, headline, subheadline, body, keywords)
+        VALUES (new.rowid, new.headline, new.subheadline, new.body, new.keywords);
+    END""",
+    """CREATE TRIGGER press_releases_fts_delete AFTER DELETE ON press_releases BEGIN
+        INSERT INTO press_releases_fts(press_releases_fts, rowid, headline, subheadline, body, keywords)
+        VALUES ('delete', old.rowid, old.headline, old.subheadline, old.body, old.keywords);
+    END""",
+    """CREATE TRIGGER press_releases_fts_update
+    AFTER UPDATE OF headline, subheadline, body, keywords ON press_releases BEGIN
+        INSERT INTO press_releases_fts(press_releases_fts, rowid, headline, subheadline, body, keywords)
+        VALUES ('delete', old.rowid, old.headline, old.subheadline, old.body, old.keywords);
+        INSERT INTO press_releases_fts(rowid, headline, subheadline, body, keywords)
+        VALUES (new.rowid, new.headline, new.subheadline, new.body, new.keywords);
+    END""",
+)
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+    if postgres:
+        op.execute(POSTGRES_UUID7)
+
+    def uuid_pk():
+        default = sa.text("uuid_generate_v7()") if postgres else None
+        return sa.Column("id", sa.Uuid(), primary_key=True, server_default=default)
+
+    op.create_table(
+        "companies",
+        uuid_pk(),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("domain", sa.String(255), nullable=False),
+        sa.Column("registration_number", sa.String(50), unique=True),
+        sa.Column("domain_verified", sa.Boolean()),
+        sa.Column("cro_verified", sa.Boolean()),
+        sa.Column("verification_date", sa.DateTime(timezone=True)),
+        sa.Column("company_type", sa.String(100)),
+        sa.Column("incorporation_date", sa.DateTime()),
+        sa.Column("status", sa.String(50)),
+        sa.Column("address", sa.JSON()),
+        sa.Column("primary_email", sa.String(255)),
+        sa.Column("billing_email", sa.String(255)),
+        sa.Column("subscription_tier", sa.String(50)),
+        sa.Column("subscription_status", sa.String(50)),
+        sa.Column("credits_remaining", sa.Integer()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_companies_name", "companies", ["name"])
+    op.create_index("ix_companies_domain", "companies", ["domain"], unique=True)
+
+    op.create_table(
+        "press_releases",
+        uuid_pk(),
+        sa.Column("company_name", sa.String(255), nullable=False),
+        sa.Column("company_domain", sa.String(255), nullable=False),
+        sa.Column("company_email", sa.String(255), nullable=False),
+        sa.Column("company_registration", sa.String(50)),
+        sa.Column("headline", sa.String(500), nullable=False),
+        sa.Column("subheadline", sa.String(500)),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("boilerplate", sa.Text()),
+        sa.Column("excerpt", sa.String(300)),
+        sa.Column("seo_title", sa.String(255)),
+        sa.Column("meta_description", sa.String(500)),
+        sa.Column("keywords", sa.JSON()),
+        sa.Column("schema_markup", sa.JSON()),
+        sa.Column("featured_image", sa.String(500)),
+        sa.Column("image_alt_text", sa.String(255)),
+        sa.Column("additional_images", sa.JSON()),
+        sa.Column("contact_name", sa.String(255)),
+        sa.Column("contact_email", sa.String(255)),
+        sa.Column("contact_phone", sa.String(50)),
+        sa.Column("slug", sa.String(255)),
+        sa.Column("status", sa.String(50)),
+        sa.Column("publish_date", sa.DateTime(timezone=True)),
+        sa.Column("embargo_date", sa.DateTime(timezone=True)),
+        sa.Column("package_tier", sa.String(50)),
+        sa.Column("price_paid", sa.Float()),
+        sa.Column("stripe_payment_id", sa.String(255)),
+        sa.Column("domain_verified", sa.Boolean()),
+        sa.Column("cro_verified", sa.Boolean()),
+        sa.Column("moderation_status", sa.String(50)),
+        sa.Column("moderation_notes", sa.Text()),
+        sa.Column("view_count", sa.Integer()),
+        sa.Column("unique_visitors", sa.Integer()),
+        sa.Column("social_shares", sa.JSON()),
+        sa.Column("ai_enhanced", sa.Boolean()),
+        sa.Column("ai_suggestions", sa.JSON()),
+        sa.Column("ai_score", sa.Float()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_press_releases_slug", "press_releases", ["slug"], unique=True)
+    op.create_index("ix_press_releases_company_name", "press_releases", ["company_name"])
+    op.create_index("ix_press_releases_company_domain", "press_releases", ["company_domain"])
+    op.create_index("ix_press_releases_status_publish_date_id", "press_releases", ["status", "publish_date", "id"])
+    op.create_index(
+        "ix_press_releases_company_status_publish_date_id", "press_releases",
+        ["company_domain", "status", "publish_date", "id"],
+    )
+
+    op.create_table(
+        "visitor_sketches",
+        uuid_pk(),
+        sa.Column("scope", sa.String(20), nullable=False),
+        sa.Column("key", sa.String(255), nullable=False),
+        sa.Column("period", sa.String(10), nullable=False),
+        sa.Column("sketch", sa.LargeBinary(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("scope", "key", "period", name="uq_visitor_sketches_scope_key_period"),
+    )
+
+    if postgres:
+        op.execute(POSTGRES_SEARCH_VECTOR)
+        op.create_index(
+            "idx_press_releases_search_vector", "press_releases", ["search_vector"], postgresql_using="gin"
+        )
+    elif op.get_bind().dialect.name == "sqlite":
+        for statement in SQLITE_SEARCH:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS press_releases_fts")
+    op.drop_table("visitor_sketches")
+    op.drop_table("press_releases")
+    op.drop_table("companies")
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP FUNCTION IF EXISTS uuid_generate_v7()")
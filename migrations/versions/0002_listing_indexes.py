@@ -0,0 +1,86 @@
+"""Partial indexes for the published listings
+
+The public feed ("published releases, newest first") and company pages
+("a company's published releases by date") get partial indexes on
+``(publish_date, id)`` and ``(company_domain, publish_date, id)`` where
+``status = 'published'``; listings of other statuses get
+``(status, publish_date, id)`` where ``status <> 'published'``. Each
+listing then has exactly one index and no row is in two of them. The
+full status and company/status composites they replace are dropped, as
+are the Postgres single-column indexes they cover and the one
+duplicating the slug's UNIQUE constraint.
+
+On Postgres the indexes are built ``CONCURRENTLY``, outside the migration
+transaction, so writes to press_releases are not blocked meanwhile.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+"""
+
+from contextlib import nullcontext
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+PUBLISHED = sa.text("status = 'published'")
+UNPUBLISHED = sa.text("status <> 'published'")
+
+PARTIAL_INDEXES = (
+    ("ix_press_releases_published_publish_date_id", ["publish_date", "id"], PUBLISHED),
+    ("ix_press_releases_company_published_publish_date_id", ["company_domain", "publish_date", "id"], PUBLISHED),
+    ("ix_press_releases_unpublished_status_publish_date_id", ["status", "publish_date", "id"], UNPUBLISHED),
+)
+
+REPLACED_INDEXES = (
+    ("ix_press_releases_status_publish_date_id", ["status", "publish_date", "id"]),
+    ("ix_press_releases_company_status_publish_date_id", ["company_domain", "status", "publish_date", "id"]),
+)
+
+# Created by supabase_schema.sql before this revision; the ORM never had them
+SUPERSEDED_POSTGRES_INDEXES = (
+    "idx_press_releases_status",
+    "idx_press_releases_publish_date",
+    "idx_press_releases_slug",
+    "idx_press_releases_status_publish_date_id",
+    "idx_press_releases_company_status_publish_date_id",
+)
+
+
+def _outside_transaction():
+    # CREATE INDEX CONCURRENTLY cannot run in a transaction; SQLite has no such option
+    if op.get_bind().dialect.name == "postgresql":
+        return op.get_context().autocommit_block()
+    return nullcontext()
+
+
+def _drop(name: str) -> None:
+    op.drop_index(name, "press_releases", postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    with _outside_transaction():
+        for name, columns, where in PARTIAL_INDEXES:
+            op.create_index(
+                name, "press_releases", columns,
+                sqlite_where=where, postgresql_where=where,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        for name, _ in REPLACED_INDEXES:
+            _drop(name)
+        if op.get_bind().dialect.name == "postgresql":
+            for name in SUPERSEDED_POSTGRES_INDEXES:
+                _drop(name)
+
+
+def downgrade() -> None:
+    with _outside_transaction():
+        for name, columns in REPLACED_INDEXES:
+            op.create_index(name, "press_releases", columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, _, _ in PARTIAL_INDEXES:
+            _drop(name)
@@ -16,15 +16,15 @@ async function loadPressReleases(containerId, limit = 10) {
     `;
 
     try {
-        // Fetch from our API
-        const response = await fetch(`/api/list-prs?limit=${limit}`);
+        // Fetch the listing projection (headline, company, date, excerpt; no body)
+        const response = await fetch(`/api/v1/press-releases/?limit=${limit}`);
 
         if (!response.ok) {
             throw new Error('Failed to fetch press releases');
         }
 
         const data = await response.json();
-        const prs = data.prs || [];
+        const prs = (data.items || []).map(toCardData);
 
         if (prs.length === 0) {
             container.innerHTML = `
@@ -46,6 +46,18 @@ async function loadPressReleases(containerId, limit = 10) {
     }
 }
 
+// Map a listing item from the API onto the fields the cards render
+function toCardData(item) {
+    return {
+        title: item.headline,
+        summary: item.excerpt,
+        company: item.company_name,
+        domain: item.company_domain,
+        date: item.publish_date ? new Date(item.publish_date).toLocaleDateString('en-IE') : '',
+        url: `/news/${item.slug}.html`
+    };
+}
+
 // Create PR card HTML
 function createPRCard(pr) {
     // For homepage (3-column grid)
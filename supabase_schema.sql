@@ -1,12 +1,25 @@
 -- PressWire v2 Database Schema for Supabase
 -- Run this in your Supabase SQL Editor
 
--- Enable UUID extension
-CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+-- Time-ordered UUIDv7 keys (RFC 9562), matching app.core.ids.uuid7 in the ORM:
+-- a 48-bit millisecond timestamp over a random v4, so inserts append to the
+-- primary key index instead of landing on random pages
+CREATE OR REPLACE FUNCTION uuid_generate_v7()
+RETURNS UUID AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(uuid_send(gen_random_uuid())
+                        PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::BIGINT) FROM 3)
+                        FROM 1 FOR 6),
+                52, 1),
+            53, 1),
+        'hex')::UUID;
+$$ LANGUAGE sql VOLATILE;
 
 -- Companies table
 CREATE TABLE IF NOT EXISTS companies (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     name VARCHAR(255) NOT NULL,
     domain VARCHAR(255) UNIQUE NOT NULL,
     registration_number VARCHAR(50) UNIQUE,
@@ -38,7 +51,7 @@ CREATE TABLE IF NOT EXISTS companies (
 
 -- Press Releases table
 CREATE TABLE IF NOT EXISTS press_releases (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
 
     -- Company Information
     company_id UUID REFERENCES companies(id),
@@ -52,6 +65,7 @@ CREATE TABLE IF NOT EXISTS press_releases (
     subheadline VARCHAR(500),
     body TEXT NOT NULL,
     boilerplate TEXT,
+    excerpt VARCHAR(300),
 
     -- SEO Metadata
     seo_title VARCHAR(255),
@@ -98,12 +112,20 @@ CREATE TABLE IF NOT EXISTS press_releases (
 
     -- Timestamps
     created_at TIMESTAMPTZ DEFAULT NOW(),
-    updated_at TIMESTAMPTZ DEFAULT NOW()
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    -- Full-text search; recomputed by Postgres whenever a source column changes
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(headline, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(subheadline, '')), 'B') ||
+        setweight(jsonb_to_tsvector('english', coalesce(keywords, '[]'::jsonb), '["string"]'), 'B') ||
+        setweight(to_tsvector('english', body), 'C')
+    ) STORED
 );
 
 -- Users table (for admin and company accounts)
 CREATE TABLE IF NOT EXISTS users (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     email VARCHAR(255) UNIQUE NOT NULL,
     password_hash VARCHAR(255),
     full_name VARCHAR(255),
@@ -115,11 +137,25 @@ CREATE TABLE IF NOT EXISTS users (
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
--- Create indexes for better performance
+-- Unique visitors as HyperLogLog sketches, per release or company and per UTC day ("all" for lifetime)
+CREATE TABLE IF NOT EXISTS visitor_sketches (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
+    scope VARCHAR(20) NOT NULL,
+    key VARCHAR(255) NOT NULL,
+    period VARCHAR(10) NOT NULL,
+    sketch BYTEA NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    CONSTRAINT uq_visitor_sketches_scope_key_period UNIQUE (scope, key, period)
+);
+
+-- Create indexes for better performance (later changes ship as migrations/, see alembic.ini)
 CREATE INDEX IF NOT EXISTS idx_press_releases_company_domain ON press_releases(company_domain);
-CREATE INDEX IF NOT EXISTS idx_press_releases_slug ON press_releases(slug);
-CREATE INDEX IF NOT EXISTS idx_press_releases_status ON press_releases(status);
-CREATE INDEX IF NOT EXISTS idx_press_releases_publish_date ON press_releases(publish_date);
+-- Keyset pagination of listings on (publish_date, id): partial indexes for the
+-- published feeds (overall and per company) and for every other status
+CREATE INDEX IF NOT EXISTS ix_press_releases_published_publish_date_id ON press_releases(publish_date, id) WHERE status = 'published';
+CREATE INDEX IF NOT EXISTS ix_press_releases_company_published_publish_date_id ON press_releases(company_domain, publish_date, id) WHERE status = 'published';
+CREATE INDEX IF NOT EXISTS ix_press_releases_unpublished_status_publish_date_id ON press_releases(status, publish_date, id) WHERE status <> 'published';
+CREATE INDEX IF NOT EXISTS idx_press_releases_search_vector ON press_releases USING GIN (search_vector);
 CREATE INDEX IF NOT EXISTS idx_companies_domain ON companies(domain);
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 
@@ -139,10 +175,13 @@ BEFORE UPDATE ON companies
 FOR EACH ROW
 EXECUTE FUNCTION update_updated_at_column();
 
+-- View and visitor counter flushes are not edits, so they keep updated_at (and the ETag)
 DROP TRIGGER IF EXISTS update_press_releases_updated_at ON press_releases;
 CREATE TRIGGER update_press_releases_updated_at
 BEFORE UPDATE ON press_releases
 FOR EACH ROW
+WHEN (OLD.view_count IS NOT DISTINCT FROM NEW.view_count
+      AND OLD.unique_visitors IS NOT DISTINCT FROM NEW.unique_visitors)
 EXECUTE FUNCTION update_updated_at_column();
 
 DROP TRIGGER IF EXISTS update_users_updated_at ON users;
@@ -155,6 +194,7 @@ EXECUTE FUNCTION update_updated_at_column();
 ALTER TABLE companies ENABLE ROW LEVEL SECURITY;
 ALTER TABLE press_releases ENABLE ROW LEVEL SECURITY;
 ALTER TABLE users ENABLE ROW LEVEL SECURITY;
+ALTER TABLE visitor_sketches ENABLE ROW LEVEL SECURITY;
 
 -- Create storage bucket for press releases (if not exists)
 INSERT INTO storage.buckets (id, name, public)
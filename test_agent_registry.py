@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Tests for the lazily-built agent registry"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pydantic_ai.models.test import TestModel
+from app.agents.registry import AgentRegistry, close_http_client, get_http_client
+
+
+def test_registry_builds_once_on_demand():
+    """Factories run on first use only, and warm() builds everything"""
+    builds = []
+    registry = AgentRegistry()
+    registry.register("a", lambda: builds.append("a") or object())
+    registry.register("b", lambda: builds.append("b") or object())
+
+    assert builds == []
+    first = registry.get("a")
+    assert registry.get("a") is first
+    assert builds == ["a"]
+    assert registry.warm() == ["a", "b"]
+    assert builds == ["a", "b"]
+
+
+def test_agents_module_imports_without_keys():
+    """Importing the agents builds nothing; agents are reused across calls"""
+    from app.agents import pr_generator as gen
+
+    assert not gen.agent_registry.is_built("seo")
+
+    original = gen.get_shared_model
+    gen.get_shared_model = lambda model=TestModel(): model
+    gen.agent_registry.reset()
+    try:
+        metadata = asyncio.run(gen.generate_seo_metadata("Headline", "Body text", "Company"))
+        agent = gen.get_seo_agent()
+        asyncio.run(gen.generate_seo_metadata("Other", "Body text", "Company"))
+        assert gen.get_seo_agent() is agent
+        assert metadata.og_type
+    finally:
+        gen.get_shared_model = original
+        gen.agent_registry.reset()
+
+
+def test_closing_the_client_drops_agents_and_models_holding_it():
+    """After close_http_client, agents and the shared model are rebuilt around a new client"""
+    from app.agents import pr_generator as gen
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    original_key, settings.openai_api_key = settings.openai_api_key, "test-key"
+    gen.agent_registry.reset()
+    try:
+        model = gen.get_shared_model()
+        agent = gen.get_seo_agent()
+        client = get_http_client()
+        asyncio.run(close_http_client())
+        rebuilt = gen.get_shared_model()
+        rebuilt_agent = gen.get_seo_agent()
+        new_client_open = not get_http_client().is_closed
+    finally:
+        settings.openai_api_key = original_key
+        asyncio.run(close_http_client())
+
+    assert client.is_closed and new_client_open
+    assert rebuilt is not model and rebuilt_agent is not agent
+    assert rebuilt_agent.model is rebuilt
+
+
+if __name__ == "__main__":
+    print("🧪 Running agent registry tests")
+    for test in (
+        test_registry_builds_once_on_demand,
+        test_agents_module_imports_without_keys,
+        test_closing_the_client_drops_agents_and_models_holding_it,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Tests for the AI response cache"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.cache import ResponseCache, make_cache_key, normalize_prompt_input
+
+
+def test_key_normalization():
+    """Whitespace-only differences share a key, model changes do not"""
+    a = make_cache_key("generate", "openai:gpt-4o-mini", announcement="New  office\n\n\n in Cork ")
+    b = make_cache_key("generate", "openai:gpt-4o-mini", announcement="New office\n\nin Cork")
+    c = make_cache_key("generate", "anthropic:claude-3-5-haiku-latest", announcement="New office\n\nin Cork")
+    assert a == b
+    assert a != c
+    assert normalize_prompt_input("  A\t\tB  \n\n\n\nC ") == "A B\n\nC"
+
+
+def test_memory_lru_and_ttl():
+    """LRU evicts the oldest entry and expired entries count as misses"""
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.set("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.stats.evictions == 1
+
+    cache.set("short", {"v": 4}, ttl_seconds=0.01)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+    assert cache.stats.expirations == 1
+    assert cache.stats.memory_hits == 1
+    assert cache.stats.misses == 2
+
+
+def test_disk_tier_survives_restart():
+    """A fresh cache instance reads entries written by a previous one"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ResponseCache(disk_path=tmp).set("key", {"headline": "Cached"})
+        restarted = ResponseCache(disk_path=tmp)
+        assert restarted.get("key") == {"headline": "Cached"}
+        assert restarted.stats.disk_hits == 1
+        assert restarted.get("key") == {"headline": "Cached"}
+        assert restarted.stats.memory_hits == 1
+
+
+def test_disk_tier_tolerates_bad_files_and_io_errors():
+    """Corrupt or foreign files are misses, and a disk that cannot be written leaves the memory tier working"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(disk_path=tmp)
+        contents = {
+            "aa-list": "[1, 2]",
+            "aa-shape": '{"expires_at": "soon", "payload": 3}',
+            "aa-truncated": '{"expires_at": 1',
+            "aa-binary": b"\xff\xfe".decode("latin-1"),
+        }
+        for key, content in contents.items():
+            path = cache._disk_file(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="latin-1")
+        cache._disk_file("aa-directory").mkdir()  # Reading it raises IsADirectoryError
+        misses = [cache.get(key) for key in [*contents, "aa-directory"]]
+
+        # A regular file where the shard directory should be makes mkdir fail
+        Path(tmp, "bb").write_text("not a directory")
+        cache.set("bb-key", {"headline": "Memory only"})
+        cache.invalidate("bb-key")
+        cache.set("bb-key", {"headline": "Memory only"})
+        cached = cache.get("bb-key")
+
+    assert misses == [None] * 5
+    assert cached == {"headline": "Memory only"}
+
+
+if __name__ == "__main__":
+    print("🧪 Running AI cache tests")
+    for test in (
+        test_key_normalization,
+        test_memory_lru_and_ttl,
+        test_disk_tier_survives_restart,
+        test_disk_tier_tolerates_bad_files_and_io_errors,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
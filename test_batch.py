@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Tests for batch press release generation"""
+
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from app.core.concurrency import bounded_as_completed
+
+
+def test_bounded_as_completed():
+    """Concurrency is capped, results arrive in completion order, errors stay per-item"""
+    running = 0
+    peak = 0
+
+    def make_call(delay, fail=False):
+        async def call():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(delay)
+            running -= 1
+            if fail:
+                raise ValueError("bad item")
+            return delay
+        return call
+
+    async def run():
+        factories = [make_call(0.05), make_call(0.01), make_call(0.02, fail=True), make_call(0.01)]
+        return [outcome async for outcome in bounded_as_completed(factories, concurrency=2)]
+
+    outcomes = asyncio.run(run())
+    assert peak == 2
+    assert outcomes[0][0] == 1
+    assert sorted(index for index, _, _ in outcomes) == [0, 1, 2, 3]
+    errors = {index: error for index, _, error in outcomes if error is not None}
+    assert list(errors) == [2] and isinstance(errors[2], ValueError)
+
+
+def test_generate_batch_endpoint():
+    """Every submitted item gets exactly one NDJSON result line"""
+    from main import app
+
+    client = TestClient(app)
+    items = [
+        {
+            "company_name": f"Company {i}",
+            "announcement": f"announcement number {i}",
+            "company_info": "an Irish company",
+            "contact_email": "press@example.ie",
+        }
+        for i in range(4)
+    ]
+    response = client.post("/api/v1/press-releases/generate/batch", json={"items": items, "concurrency": 2})
+    assert response.status_code == 200
+
+    lines = [json.loads(line) for line in response.text.strip().split("\n")]
+    assert sorted(line["index"] for line in lines) == [0, 1, 2, 3]
+    assert all(line["status"] == "success" for line in lines)
+    assert lines[0]["result"]["headline"].startswith(f"Company {lines[0]['index']}")
+
+
+if __name__ == "__main__":
+    print("🧪 Running batch generation tests")
+    for test in (test_bounded_as_completed, test_generate_batch_endpoint):
+        test()
+        print(f"✅ {test.__name__}")
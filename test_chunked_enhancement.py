@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Tests for chunked map-reduce enhancement of long press releases"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+from pydantic_ai.models.function import FunctionModel
+from app.agents.chunking import chunk_paragraphs, merge_enhancements, split_paragraphs
+from app.agents.pr_generator_mock import PREnhancement
+from app.services.readability import overall_score
+
+
+def test_chunking_keeps_paragraphs_whole():
+    """Paragraphs are grouped up to the limit and never split"""
+    paragraphs = split_paragraphs("A" * 40 + "\n\n" + "B" * 40 + "\n\n\n" + "C" * 90 + "\n\nD")
+    assert len(paragraphs) == 4
+    chunks = chunk_paragraphs(paragraphs, max_chars=100)
+    assert chunks == ["A" * 40 + "\n\n" + "B" * 40, "C" * 90 + "\n\nD"]
+    assert chunk_paragraphs(["E" * 150], max_chars=100) == ["E" * 150]
+
+
+def test_merge_dedupes_and_weights_scores():
+    """Suggestions are deduplicated and the score is length-weighted"""
+    merged = merge_enhancements(
+        [
+            PREnhancement(improved_headline="Better", seo_suggestions=["Add Dublin keywords."], overall_score=90),
+            PREnhancement(improved_body="Rewritten", seo_suggestions=["add dublin keywords", "Use H2s"], overall_score=60),
+        ],
+        ["x" * 300, "y" * 100],
+    )
+    assert merged.improved_headline == "Better"
+    assert merged.improved_body == "x" * 300 + "\n\nRewritten"
+    assert merged.seo_suggestions == ["Add Dublin keywords.", "Use H2s"]
+    assert merged.overall_score == 82.5
+
+
+def test_chunks_are_enhanced_in_parallel():
+    """Latency tracks one chunk, not the number of chunks"""
+    from app.agents import pr_generator as gen
+
+    async def enhance(messages, info):
+        await asyncio.sleep(0.1)
+        return ModelResponse(parts=[ToolCallPart(
+            info.output_tools[0].name,
+            {"seo_suggestions": ["Mention Ireland"], "overall_score": 70},
+        )])
+
+    original = gen.get_shared_model
+    gen.get_shared_model = lambda model=FunctionModel(enhance): model
+    gen.agent_registry.reset()
+    try:
+        content = "\n\n".join(f"Paragraph {i}. " + "word " * 100 for i in range(8))
+        started = time.monotonic()
+        enhancement = asyncio.run(gen.enhance_press_release_chunked(content))
+        elapsed = time.monotonic() - started
+    finally:
+        gen.get_shared_model = original
+        gen.agent_registry.reset()
+
+    assert len(chunk_paragraphs(split_paragraphs(content), gen.settings.ai_enhance_chunk_chars)) == 3
+    assert elapsed < 0.3
+    assert enhancement.seo_suggestions == ["Mention Ireland"]
+    assert enhancement.overall_score == 70
+
+
+def test_incremental_resends_only_changed_paragraphs():
+    """Editing one paragraph costs one model call on the next enhance"""
+    from app.agents import pr_generator as gen
+
+    sent = []
+
+    async def enhance(messages, info):
+        sent.append(messages[-1].parts[-1].content)
+        return ModelResponse(parts=[ToolCallPart(
+            info.output_tools[0].name,
+            {"style_improvements": ["Tighten the lead"], "overall_score": 80},
+        )])
+
+    original = gen.get_shared_model
+    gen.get_shared_model = lambda model=FunctionModel(enhance): model
+    gen.agent_registry.reset()
+    try:
+        draft = ["Galway Widgets opens new plant", "It will employ 50 people.", "Founded in 1999."]
+        first = asyncio.run(gen.enhance_press_release("\n\n".join(draft), incremental=True))
+        assert len(sent) == 3
+
+        draft[1] = "It will employ 75 people."
+        second = asyncio.run(gen.enhance_press_release("\n\n".join(draft), incremental=True))
+    finally:
+        gen.get_shared_model = original
+        gen.agent_registry.reset()
+
+    assert len(sent) == 4
+    assert "75 people" in sent[-1]
+    assert second.style_improvements == first.style_improvements == ["Tighten the lead"]
+    # The score is computed locally from the submitted draft, not taken from the model
+    assert second.overall_score == overall_score("\n\n".join(draft))
+
+
+if __name__ == "__main__":
+    print("🧪 Running chunked enhancement tests")
+    for test in (
+        test_chunking_keeps_paragraphs_whole,
+        test_merge_dedupes_and_weights_scores,
+        test_chunks_are_enhanced_in_parallel,
+        test_incremental_resends_only_changed_paragraphs,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
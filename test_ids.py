@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Tests for time-ordered UUIDv7 primary keys"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.database import Base
+from app.core.ids import uuid7, uuid7_time
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.press_release import PressRelease
+
+
+def test_uuid7_layout_and_order():
+    """IDs are RFC 9562 version 7, carry their creation time and strictly increase"""
+    before = datetime.now(timezone.utc)
+    ids = [uuid7() for _ in range(20000)]  # Far more than one millisecond's counter
+    after = datetime.now(timezone.utc)
+
+    assert all(i.version == 7 and i.variant == uuid.RFC_4122 for i in ids)
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
+    assert [i.hex for i in ids] == sorted(i.hex for i in ids)  # SQLite stores the hex
+    assert before - timedelta(milliseconds=1) <= uuid7_time(ids[0]) <= after + timedelta(milliseconds=50)
+
+    try:
+        uuid7_time(uuid.uuid4())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("read a timestamp from a UUIDv4")
+
+
+def test_rows_get_ordered_uuid_keys():
+    """The ORM assigns UUIDv7 ids in insert order, and cursors round-trip them"""
+
+    async def run(path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with sessions() as db:
+            for i in range(5):
+                db.add(PressRelease(
+                    company_name="Cork Coffee", company_domain="corkcoffee.ie", company_email="press@corkcoffee.ie",
+                    headline=f"Release {i}", body="Body.", slug=f"release-{i}", status="published",
+                ))
+                await db.flush()
+                time.sleep(0.002)
+            await db.commit()
+            by_id = (await db.execute(select(PressRelease.slug).order_by(PressRelease.id))).scalars().all()
+            ids = (await db.execute(select(PressRelease.id).order_by(PressRelease.id))).scalars().all()
+            stored = (await db.execute(text("SELECT typeof(id), length(id) FROM press_releases LIMIT 1"))).one()
+        await engine.dispose()
+        return by_id, ids, tuple(stored)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        by_id, ids, stored = asyncio.run(run(os.path.join(tmp, "prs.db")))
+
+    assert by_id == [f"release-{i}" for i in range(5)]
+    assert all(isinstance(i, uuid.UUID) and i.version == 7 for i in ids)
+    assert stored == ("text", 32)
+
+    cursor = encode_cursor({"publish_date": datetime(2026, 1, 2, tzinfo=timezone.utc), "id": ids[0]})
+    assert decode_cursor(cursor, ("publish_date", "id"))["id"] == ids[0]
+
+
+if __name__ == "__main__":
+    print("🧪 Running UUIDv7 key tests")
+    for test in (test_uuid7_layout_and_order, test_rows_get_ordered_uuid_keys):
+        test()
+        print(f"✅ {test.__name__}")
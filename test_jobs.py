@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Tests for the generation job queue and worker pool"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from app.core.jobs import DEFAULT_PRIORITY, FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue, JobWorkerPool, SQLiteJobQueue
+
+
+def test_sqlite_queue_priority_and_persistence():
+    """Lower priorities are claimed first, and queued jobs survive a restart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.db")
+
+        async def enqueue():
+            queue = SQLiteJobQueue(path)
+            for name, priority in (("default", DEFAULT_PRIORITY), ("urgent", 0), ("later", 5), ("soon", 1)):
+                await queue.enqueue("generate", {"name": name}, priority)
+            await queue.close()
+
+        async def drain():
+            queue = SQLiteJobQueue(path)
+            first = await queue.claim()
+            # A worker that died mid-job leaves it running until recovered
+            assert first.status == RUNNING and await queue.recover(visibility_timeout=0) == 1
+            claimed = []
+            while (job := await queue.claim()) is not None:
+                claimed.append(job.payload["name"])
+                await queue.complete(job.id, {"ok": True})
+            await queue.close()
+            return first.payload["name"], claimed
+
+        asyncio.run(enqueue())
+        first, claimed = asyncio.run(drain())
+
+    assert first == "urgent"
+    assert claimed == ["urgent", "soon", "default", "later"]
+
+
+def test_incomplete_backend_fails_at_construction():
+    """A backend missing part of the JobQueue interface cannot be instantiated"""
+
+    class NoRecovery(JobQueue):
+        async def enqueue(self, kind, payload, priority=0): ...
+        async def claim(self): ...
+        async def complete(self, job_id, result): ...
+        async def fail(self, job_id, error, retry=False): ...
+        async def get(self, job_id): ...
+        async def depth(self): ...
+
+    try:
+        NoRecovery()
+    except TypeError as e:
+        assert "recover" in str(e)
+    else:
+        raise AssertionError("instantiated a queue without recover()")
+
+
+def test_worker_pool_retries_then_reports():
+    """Failed jobs are retried up to max_attempts; waiters get the final state"""
+    calls = {"flaky": 0}
+
+    async def flaky(payload):
+        calls["flaky"] += 1
+        if calls["flaky"] == 1:
+            raise RuntimeError("provider timeout")
+        return {"echo": payload["value"]}
+
+    async def broken(payload):
+        raise RuntimeError("always fails")
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = JobWorkerPool(SQLiteJobQueue(os.path.join(tmp, "jobs.db")), workers=2, poll_interval=0.05)
+            pool.register("flaky", flaky)
+            pool.register("broken", broken)
+            try:
+                ok = await pool.submit("flaky", {"value": 7})
+                bad = await pool.submit("broken", {})
+                return await pool.wait(ok.id, timeout=5), await pool.wait(bad.id, timeout=5)
+            finally:
+                await pool.stop()
+                await pool.queue.close()
+
+    ok, bad = asyncio.run(run())
+    assert ok.status == SUCCEEDED and ok.result == {"echo": 7} and ok.attempts == 2
+    assert bad.status == FAILED and bad.attempts == 2 and "always fails" in bad.error
+
+
+def test_worker_survives_queue_errors():
+    """A failed result write does not end the worker; the job is recovered and rerun"""
+    calls = []
+
+    class FlakyQueue(SQLiteJobQueue):
+        async def complete(self, job_id, result):
+            if len(calls) == 1:
+                raise OSError("disk I/O error")
+            await super().complete(job_id, result)
+
+    async def handler(payload):
+        calls.append(payload["value"])
+        return payload["value"]
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = JobWorkerPool(
+                FlakyQueue(os.path.join(tmp, "jobs.db")), workers=1, poll_interval=0.02, visibility_timeout=0.1
+            )
+            pool.register("echo", handler)
+            try:
+                job = await pool.submit("echo", {"value": 1})
+                first = await pool.wait(job.id, timeout=5)
+                other = await pool.submit("echo", {"value": 2})
+                return first, await pool.wait(other.id, timeout=5)
+            finally:
+                await pool.stop()
+                await pool.queue.close()
+
+    first, other = asyncio.run(run())
+    assert first.status == SUCCEEDED and first.attempts == 2 and calls[:2] == [1, 1]
+    assert other.status == SUCCEEDED and other.result == 2
+
+
+def test_heartbeats_keep_slow_jobs_from_being_requeued():
+    """A job running longer than the visibility timeout is not handed to a second worker"""
+    calls = []
+
+    async def slow(payload):
+        calls.append(payload)
+        await asyncio.sleep(0.5)
+        return "done"
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = JobWorkerPool(
+                SQLiteJobQueue(os.path.join(tmp, "jobs.db")), workers=2, poll_interval=0.02, visibility_timeout=0.15
+            )
+            pool.register("slow", slow)
+            try:
+                job = await pool.submit("slow", {})
+                return await pool.wait(job.id, timeout=5)
+            finally:
+                await pool.stop()
+                await pool.queue.close()
+
+    job = asyncio.run(run())
+    assert job.status == SUCCEEDED and job.attempts == 1 and len(calls) == 1
+
+
+def test_recovery_fails_jobs_out_of_attempts():
+    """A job whose worker keeps dying is failed once it has used max_attempts, not requeued forever"""
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            queue = SQLiteJobQueue(os.path.join(tmp, "jobs.db"))
+            job = await queue.enqueue("generate", {})
+            states = []
+            for _ in range(3):
+                # Each claim is abandoned, as by a worker that crashed mid-job
+                if await queue.claim() is None:
+                    break
+                await queue.recover(visibility_timeout=0, max_attempts=2)
+                states.append((await queue.get(job.id)).status)
+            final = await queue.get(job.id)
+            await queue.close()
+            return states, final
+
+    states, final = asyncio.run(run())
+    assert states == [QUEUED, FAILED]
+    assert final.attempts == 2 and final.error == "Worker stopped before finishing"
+
+
+def test_generate_endpoint_enqueues_job():
+    """/generate answers inline by default and with a pollable job on Prefer: respond-async"""
+    from main import app
+    from app.api.v1 import press_releases as pr_api
+
+    request = {
+        "company_name": "Galway Widgets",
+        "announcement": "a new plant in Oranmore",
+        "company_info": "a precision parts maker",
+        "contact_email": "press@galwaywidgets.ie",
+        "package_tier": "premium",  # Unauthenticated, so ignored: no queue jumping
+    }
+    original_queue = pr_api.job_workers.queue
+    with tempfile.TemporaryDirectory() as tmp:
+        pr_api.job_workers.queue = SQLiteJobQueue(os.path.join(tmp, "jobs.db"))
+        try:
+            with TestClient(app) as client:
+                response = client.post("/api/v1/press-releases/generate", json=request)
+                assert response.status_code == 200
+                assert response.json()["headline"].startswith("Galway Widgets")
+                assert response.json()["telemetry"]["llm_calls"] == 0  # The mock generator calls no model
+
+                response = client.post(
+                    "/api/v1/press-releases/generate",
+                    json=request,
+                    headers={"Prefer": "respond-async"}
+                )
+                assert response.status_code == 202
+                job = response.json()
+                assert job["priority"] == DEFAULT_PRIORITY
+                assert response.headers["location"] == job["status_url"]
+
+                deadline = time.monotonic() + 5
+                while job["status"] not in ("succeeded", "failed") and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    job = client.get(job["status_url"]).json()
+                assert job["status"] == "succeeded"
+                assert job["result"]["headline"].startswith("Galway Widgets")
+
+                events = client.get(job["events_url"]).text
+                assert "event: done" in events
+
+                assert client.get("/api/v1/press-releases/jobs/unknown").status_code == 404
+        finally:
+            pr_api.job_workers.queue = original_queue
+
+
+if __name__ == "__main__":
+    print("🧪 Running job queue tests")
+    for test in (
+        test_sqlite_queue_priority_and_persistence,
+        test_incomplete_backend_fails_at_construction,
+        test_worker_pool_retries_then_reports,
+        test_worker_survives_queue_errors,
+        test_heartbeats_keep_slow_jobs_from_being_requeued,
+        test_recovery_fails_jobs_out_of_attempts,
+        test_generate_endpoint_enqueues_job,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
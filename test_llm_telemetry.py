@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Tests for LLM call telemetry and the /metrics endpoint"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+from pydantic_ai.models.function import FunctionModel
+from app.agents.telemetry import collect_telemetry, estimate_cost, summarize
+
+RELEASE = {
+    "headline": "Galway Widgets opens Oranmore plant",
+    "body": "GALWAY - Galway Widgets today opened a new plant.",
+    "boilerplate": "Galway Widgets makes parts.",
+    "seo_title": "Galway Widgets opens Oranmore plant",
+    "meta_description": "Galway Widgets opens a new plant in Oranmore.",
+    "keywords": ["galway", "manufacturing"],
+    "readability_score": 70,
+}
+
+
+def test_cost_uses_most_specific_price():
+    """Model names match their own price, not a shorter prefix"""
+    assert estimate_cost("claude-3-5-haiku-latest", 1_000_000, 0) == 0.80
+    assert estimate_cost("openai/gpt-4o-mini", 0, 1_000_000) == 0.60
+    assert estimate_cost("gpt-4o-2024-08-06", 1_000_000, 0) == 2.50
+    assert estimate_cost("some-local-model", 5000, 5000) == 0.0
+
+
+def test_agent_calls_are_recorded_with_retries():
+    """A field re-ask is one logical call with one retry and one validation failure"""
+    from app.agents import pr_generator as gen
+
+    calls = []
+
+    async def respond(messages, info):
+        calls.append(info)
+        tool = info.output_tools[0]
+        if len(calls) == 2:
+            return ModelResponse(parts=[ToolCallPart(tool.name, {"readability_score": 64})])
+        score = "unreadable" if len(calls) == 1 else 80
+        return ModelResponse(parts=[ToolCallPart(tool.name, {**RELEASE, "readability_score": score})])
+
+    labels = {"agent": "pr_generator", "model": "function:respond:", "provider": "unknown"}
+    runs_before = REGISTRY.get_sample_value("presswire_llm_runs_total", {**labels, "outcome": "success"}) or 0
+
+    original = gen.get_shared_model
+    gen.get_shared_model = lambda model=FunctionModel(respond): model
+    gen.agent_registry.reset()
+    try:
+        with collect_telemetry() as records:
+            asyncio.run(gen.run_with_repair(gen.get_pr_generator(), "Write a release", gen.PRContent))
+            asyncio.run(gen.run_with_repair(gen.get_pr_generator(), "Write another", gen.PRContent))
+    finally:
+        gen.get_shared_model = original
+        gen.agent_registry.reset()
+
+    repaired, clean = records
+    assert (repaired.agent, repaired.requests, repaired.retries, repaired.validation_failures) == ("pr_generator", 2, 1, 1)
+    assert (clean.requests, clean.retries, clean.validation_failures) == (1, 0, 0)
+    assert repaired.input_tokens > 0 and repaired.output_tokens > 0
+    assert (repaired.model, repaired.provider) == (labels["model"], labels["provider"])
+
+    summary = summarize(records)
+    assert summary["llm_calls"] == 2 and summary["retries"] == 1
+    assert summary["input_tokens"] == repaired.input_tokens + clean.input_tokens
+    assert REGISTRY.get_sample_value("presswire_llm_runs_total", {**labels, "outcome": "success"}) == runs_before + 2
+
+
+def test_metrics_endpoint():
+    """/metrics serves the LLM series"""
+    from main import app
+
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert "presswire_llm_run_duration_seconds_bucket" in response.text
+    assert "presswire_llm_cost_usd_total" in response.text
+
+
+if __name__ == "__main__":
+    print("🧪 Running LLM telemetry tests")
+    for test in (
+        test_cost_uses_most_specific_price,
+        test_agent_calls_are_recorded_with_retries,
+        test_metrics_endpoint,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tests for the Alembic migrations"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+from app.core.database import Base
+import app.models.press_release  # noqa: F401
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def alembic_config(path: str) -> Config:
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    config.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{path}")
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def schema_drift(path: str):
+    """Differences between the migrated database and the ORM models"""
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={"compare_type": True})
+        diffs = compare_metadata(context, Base.metadata)
+    engine.dispose()
+    # The FTS5 index and its shadow tables are managed outside the ORM
+    return [d for d in diffs if not (d[0] == "remove_table" and d[1].name.startswith("press_releases_fts"))]
+
+
+def test_head_matches_the_models():
+    """Upgrading to head yields exactly the tables, columns and indexes the models declare"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "prs.db")
+        command.upgrade(alembic_config(path), "head")
+        drift = schema_drift(path)
+        indexes = {i["name"]: i for i in inspect(create_engine(f"sqlite:///{path}")).get_indexes("press_releases")}
+
+    assert drift == [], drift
+    assert "ix_press_releases_published_publish_date_id" in indexes
+    assert "ix_press_releases_company_status_publish_date_id" not in indexes
+
+
+def test_migrations_downgrade_cleanly():
+    """Every revision can be undone, back to an empty database"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "prs.db")
+        config = alembic_config(path)
+        command.upgrade(config, "head")
+        command.downgrade(config, "0001")
+        names = {i["name"] for i in inspect(create_engine(f"sqlite:///{path}")).get_indexes("press_releases")}
+        command.upgrade(config, "head")
+        command.downgrade(config, "base")
+        tables = set(inspect(create_engine(f"sqlite:///{path}")).get_table_names())
+
+    assert "ix_press_releases_company_status_publish_date_id" in names
+    assert "ix_press_releases_published_publish_date_id" not in names
+    assert tables == {"alembic_version"}
+
+
+if __name__ == "__main__":
+    print("🧪 Running migration tests")
+    for test in (test_head_matches_the_models, test_migrations_downgrade_cleanly):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Tests for the mock generator's latency and error simulator"""
+
+import asyncio
+import math
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.agents import pr_generator_mock as mock
+from app.agents.pr_generator_mock import LatencySimulator, SimulatedProviderError
+
+
+def test_distributions_match_their_parameters():
+    """Lognormal medians land on the configured median; long tails add slow outliers"""
+    lognormal = LatencySimulator("lognormal", median_seconds=2.0, sigma=0.5, seed=7)
+    samples = [lognormal.sample() for _ in range(5000)]
+    assert 1.9 < statistics.median(samples) < 2.1
+
+    tail = LatencySimulator("long_tail", median_seconds=2.0, sigma=0.1, tail_probability=0.05,
+                            tail_multiplier=10.0, seed=7)
+    slow = sum(1 for _ in range(5000) if tail.sample() > 10)
+    assert 150 < slow < 350
+
+    assert LatencySimulator().sample() == 0.0
+    assert LatencySimulator("fixed", median_seconds=0.5).sample(scale=2) == 1.0
+
+
+def test_error_injection_mixes_throttles_and_server_errors():
+    """About error_rate of calls fail, split between 429s and 500s"""
+    simulator = LatencySimulator(error_rate=0.3, seed=3)
+    codes = []
+    for _ in range(2000):
+        try:
+            simulator.maybe_fail()
+        except SimulatedProviderError as e:
+            codes.append(e.status_code)
+    assert 500 < len(codes) < 700
+    assert set(codes) == {429, 500}
+
+
+class FakeClock:
+    """Virtual time for the simulator: sleeping advances it instantly"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+def test_mock_calls_and_streams_take_simulated_time():
+    """The mock sleeps like a provider, and streams spread that time across chunks"""
+    original = mock.simulator
+    clock = FakeClock()
+    mock.simulator = LatencySimulator("fixed", median_seconds=0.1, first_token_share=0.5, sleep=clock.sleep)
+    try:
+        asyncio.run(mock.generate_press_release("Galway Widgets", "a new plant", "a parts maker"))
+        call_time = clock.now
+
+        async def stream():
+            arrivals = []
+            begun = clock.now
+            async for event, _ in mock.stream_press_release("Galway Widgets", "a new plant", "a parts maker"):
+                arrivals.append((event, clock.now - begun))
+            return arrivals
+
+        arrivals = asyncio.run(stream())
+    finally:
+        mock.simulator = original
+
+    assert math.isclose(call_time, 0.1)
+    assert 0.05 <= arrivals[0][1] < 0.06  # First token share, plus a chunk if the first emits nothing
+    assert arrivals[-1][0] == "done" and math.isclose(arrivals[-1][1], 0.1)
+
+
+if __name__ == "__main__":
+    print("🧪 Running mock simulator tests")
+    for test in (
+        test_distributions_match_their_parameters,
+        test_error_injection_mixes_throttles_and_server_errors,
+        test_mock_calls_and_streams_take_simulated_time,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
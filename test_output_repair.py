@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Tests for local repair of structured agent output"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import FunctionModel
+from app.agents.repair import repair_stats, truncate_at_word
+
+RELEASE = {
+    "headline": "Galway Widgets   opens a brand new precision manufacturing plant in Oranmore creating fifty new jobs for the region",
+    "body": "GALWAY - Galway Widgets today announced...   \n\n\n\nMore details.",
+    "boilerplate": "Galway Widgets makes parts.",
+    "seo_title": "Galway Widgets opens new Oranmore plant with fifty new jobs in the west",
+    "meta_description": "Galway Widgets opens a new plant. " * 8,
+    "keywords": ["galway", "Galway", " manufacturing ", "jobs"],
+    "readability_score": 104,
+}
+
+
+def test_truncate_at_word():
+    """Truncation lands on a word boundary and drops dangling punctuation"""
+    assert truncate_at_word("Cork firm hires 50, expands", 20) == "Cork firm hires 50"
+    assert truncate_at_word("short", 20) == "short"
+    assert len(truncate_at_word("x" * 80, 60)) == 60
+
+
+def test_oversized_output_is_repaired_not_rejected():
+    """Length, keyword and range violations are fixed locally before validation"""
+    from app.agents.pr_generator import PRContent, SEOMetadata
+
+    content = PRContent.model_validate(RELEASE)
+    assert len(content.headline) <= 100 and not content.headline.endswith(" ")
+    assert RELEASE["headline"].replace("   ", " ").startswith(content.headline)
+    assert len(content.seo_title) <= 60
+    assert len(content.meta_description) <= 160
+    assert content.keywords == ["galway", "manufacturing", "jobs"]
+    assert content.readability_score == 100
+    assert "\n\n\n" not in content.body
+
+    seo = SEOMetadata.model_validate({
+        **{k: RELEASE[k] for k in ("seo_title", "meta_description", "keywords")},
+        "og_title": "t", "og_description": "d", "schema_markup": {},
+    })
+    assert len(seo.keywords) == 5
+    many = SEOMetadata.model_validate({**seo.model_dump(), "keywords": [f"k{i}" for i in range(12)]})
+    assert len(many.keywords) == 10
+    assert repair_stats.repairs["keywords:padded"] >= 1
+
+
+def test_remaining_failures_reask_only_the_offending_field():
+    """An unrepairable field triggers a small follow-up call for that field alone"""
+    from app.agents import pr_generator as gen
+
+    requested_fields = []
+
+    async def respond(messages, info):
+        tool = info.output_tools[0]
+        requested_fields.append(sorted(tool.parameters_json_schema["properties"]))
+        if len(requested_fields) == 1:
+            return ModelResponse(parts=[ToolCallPart(tool.name, {**RELEASE, "readability_score": "very readable"})])
+        return ModelResponse(parts=[ToolCallPart(tool.name, {"readability_score": 71})])
+
+    original = gen.get_shared_model
+    gen.get_shared_model = lambda model=FunctionModel(respond): model
+    gen.agent_registry.reset()
+    retries_before = repair_stats.field_retries
+    try:
+        content = asyncio.run(gen.run_with_repair(gen.get_pr_generator(), "Write a release", gen.PRContent))
+    finally:
+        gen.get_shared_model = original
+        gen.agent_registry.reset()
+
+    assert len(requested_fields) == 2
+    assert requested_fields[1] == ["readability_score"]
+    assert content.readability_score == 71
+    assert content.headline.startswith("Galway Widgets opens")
+    assert repair_stats.field_retries == retries_before + 1
+
+
+def test_output_with_nothing_to_repair_gets_one_normal_retry():
+    """A text-only answer cannot be repaired field by field, so the run is retried once"""
+    from app.agents import pr_generator as gen
+
+    calls = []
+
+    async def respond(messages, info):
+        calls.append(len(messages))
+        if len(calls) == 1:
+            return ModelResponse(parts=[TextPart("Here is your press release!")])
+        return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, RELEASE)])
+
+    original = gen.get_shared_model
+    gen.get_shared_model = lambda model=FunctionModel(respond): model
+    gen.agent_registry.reset()
+    full_retries_before = repair_stats.full_retries
+    try:
+        content = asyncio.run(gen.run_with_repair(gen.get_pr_generator(), "Write a release", gen.PRContent))
+    finally:
+        gen.get_shared_model = original
+        gen.agent_registry.reset()
+
+    assert len(calls) == 2
+    assert content.headline.startswith("Galway Widgets opens")
+    assert repair_stats.full_retries == full_retries_before + 1
+
+
+def test_repair_stats_are_reported_on_ai_health():
+    """/health/ai carries the repair and retry counters next to the limiter metrics"""
+    from main import app
+
+    report = TestClient(app).get("/health/ai").json()["output_repair"]
+    assert report == repair_stats.as_dict()
+    assert {"runs", "field_retries", "full_retries", "failed_runs", "repairs"} <= set(report)
+
+
+if __name__ == "__main__":
+    print("🧪 Running output repair tests")
+    for test in (
+        test_truncate_at_word,
+        test_oversized_output_is_repaired_not_rejected,
+        test_remaining_failures_reask_only_the_offending_field,
+        test_output_with_nothing_to_repair_gets_one_normal_retry,
+        test_repair_stats_are_reported_on_ai_health,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Tests for keyset pagination of the press release listing"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.database import Base, get_db, get_read_db
+from app.core.sqlite_writer import SQLiteWriteQueue
+from app.models.press_release import PressRelease
+from app.services import press_releases as service
+
+DOMAINS = ("galwaywidgets.ie", "corkcoffee.ie", "dublinfintech.ie")
+
+
+def make_release(i: int, status: str = "published") -> PressRelease:
+    # Every third release shares a publish date with its neighbour, so ties are broken by id
+    published = datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(hours=i - i % 3 // 2)
+    return PressRelease(
+        company_name=f"Company {i % 3}",
+        company_domain=DOMAINS[i % 3],
+        company_email="press@example.ie",
+        headline=f"Release {i}",
+        body=f"Body of release {i}.",
+        slug=f"release-{i}",
+        status=status,
+        publish_date=published if status == "published" else None,
+    )
+
+
+async def seeded_session(path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as db:
+        db.add_all([make_release(i) for i in range(45)] + [make_release(100 + i, "draft") for i in range(5)])
+        await db.commit()
+    return engine, sessions
+
+
+def test_pages_walk_every_release_once_in_order():
+    """Following next_cursor visits each published release exactly once, newest first"""
+
+    async def run(path):
+        engine, sessions = await seeded_session(path)
+        seen, pages, cursor = [], 0, None
+        async with sessions() as db:
+            expected = [
+                (r.publish_date, r.id) for r in
+                (await db.execute(select(PressRelease).where(*service.listing_filters()))).scalars()
+            ]
+            while True:
+                page = await service.list_press_release_page(db, limit=10, cursor=cursor)
+                seen.extend((r.publish_date, r.id) for r in page["items"])
+                pages += 1
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    break
+            only_cork = await service.list_press_release_page(db, limit=50, company_domain="corkcoffee.ie")
+        await engine.dispose()
+        return expected, seen, pages, page, only_cork
+
+    with tempfile.TemporaryDirectory() as tmp:
+        expected, seen, pages, last_page, only_cork = asyncio.run(run(os.path.join(tmp, "prs.db")))
+
+    assert pages == 5
+    assert seen == sorted(expected, reverse=True)
+    assert len(set(seen)) == 45
+    assert last_page["total"] == 45 and last_page["total_is_estimate"] is False
+    assert {r.company_domain for r in only_cork["items"]} == {"corkcoffee.ie"}
+    assert len(only_cork["items"]) == 15 and only_cork["next_cursor"] is None
+
+
+def test_listing_reads_summary_columns_with_stored_excerpt():
+    """List pages carry the precomputed excerpt and never load the body"""
+    lead = "Galway Widgets today announced a new factory in Oranmore that will employ 120 people by 2027."
+
+    async def run(path):
+        engine, sessions = await seeded_session(path)
+        async with sessions() as db:
+            release = make_release(200)
+            release.body = f"FOR IMMEDIATE RELEASE\n\nGalway, Ireland\n\n**{lead}**\n\nMore detail.\n\n###"
+            db.add(release)
+            await db.execute(insert(PressRelease).values(
+                company_name="Core Insert", company_domain="core.ie", company_email="press@core.ie",
+                headline="Written outside the ORM", body=lead, slug="core-insert", status="draft"
+            ))
+            await db.commit()
+            page = await service.list_press_release_page(db, limit=1)
+            backfilled = await service.backfill_excerpts(db)
+            await db.execute(update(PressRelease).where(PressRelease.slug == "core-insert").values(excerpt=None))
+            await db.commit()
+            queue = SQLiteWriteQueue(sessions)
+            backfilled += await service.backfill_excerpts(db, write=queue.submit)
+            await queue.stop()
+            core_excerpt = (await db.execute(
+                select(PressRelease.excerpt).where(PressRelease.slug == "core-insert")
+            )).scalar_one()
+        await engine.dispose()
+        return page, backfilled, core_excerpt
+
+    with tempfile.TemporaryDirectory() as tmp:
+        page, backfilled, core_excerpt = asyncio.run(run(os.path.join(tmp, "prs.db")))
+
+    item = page["items"][0]
+    assert item.headline == "Release 200"
+    assert item.excerpt == lead
+    assert set(item._fields) == {c.key for c in service.SUMMARY_COLUMNS}
+    assert backfilled == 2 and core_excerpt == lead  # Once on the session, once through the writer
+
+
+def test_list_endpoint_uses_cursors():
+    """The API serves pages by cursor and rejects cursors it did not issue"""
+    from main import app
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, sessions = asyncio.run(seeded_session(os.path.join(tmp, "prs.db")))
+
+        async def override_db():
+            async with sessions() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = app.dependency_overrides[get_read_db] = override_db
+        try:
+            client = TestClient(app)
+            first = client.get("/api/v1/press-releases/", params={"limit": 20}).json()
+            second = client.get("/api/v1/press-releases/", params={"limit": 20, "cursor": first["next_cursor"]}).json()
+            bad = client.get("/api/v1/press-releases/", params={"cursor": "not-a-cursor"})
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_db, None)
+            asyncio.run(engine.dispose())
+
+    assert [item["headline"] for item in first["items"]][:1] == ["Release 44"]
+    assert len(first["items"]) == len(second["items"]) == 20
+    assert not {i["id"] for i in first["items"]} & {i["id"] for i in second["items"]}
+    assert first["total"] == 45
+    assert "body" not in first["items"][0] and first["items"][0]["excerpt"] == "Body of release 44."
+    assert bad.status_code == 400
+
+
+def test_anonymous_listing_never_shows_drafts():
+    """Unpublished releases stay out of the public listing, whatever status is asked for"""
+    from main import app
+
+    async def seed(path):
+        engine, sessions = await seeded_session(path)
+        async with sessions() as db:
+            for i, status in enumerate(("draft", "pending", "embargoed")):
+                release = make_release(300 + i, status)
+                release.publish_date = datetime(2027, 1, 1, tzinfo=timezone.utc)  # Newer than every published one
+                db.add(release)
+            await db.commit()
+        return engine, sessions
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, sessions = asyncio.run(seed(os.path.join(tmp, "prs.db")))
+
+        async def override_db():
+            async with sessions() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = app.dependency_overrides[get_read_db] = override_db
+        try:
+            client = TestClient(app)
+            pages = [
+                client.get("/api/v1/press-releases/", params={"status": status, "limit": 100}).json()
+                for status in ("draft", "pending", "embargoed", "published")
+            ]
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_db, None)
+            asyncio.run(engine.dispose())
+
+    for page in pages:
+        headlines = {item["headline"] for item in page["items"]}
+        assert len(headlines) == 45 and not headlines & {"Release 300", "Release 301", "Release 302"}
+
+
+if __name__ == "__main__":
+    print("🧪 Running press release listing tests")
+    for test in (
+        test_pages_walk_every_release_once_in_order,
+        test_listing_reads_summary_columns_with_stored_excerpt,
+        test_list_endpoint_uses_cursors,
+        test_anonymous_listing_never_shows_drafts,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
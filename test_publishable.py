@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Tests for single-call press release + SEO generation"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from pydantic_ai import capture_run_messages
+from pydantic_ai.models.test import TestModel
+
+
+def test_publishable_release_uses_one_model_call():
+    """Content and SEO metadata come back from a single request"""
+    from app.agents import pr_generator as gen
+
+    model = TestModel()
+    original = gen.get_shared_model
+    gen.get_shared_model = lambda: model
+    gen.agent_registry.reset()
+    cache_enabled = gen.settings.ai_cache_enabled
+    gen.settings.ai_cache_enabled = False
+    try:
+        with capture_run_messages() as messages:
+            release = asyncio.run(gen.generate_publishable_release("Company", "news", "info"))
+        assert len([message for message in messages if message.kind == "response"]) == 1
+        assert isinstance(release.content, gen.PRContent)
+        assert 5 <= len(release.seo.keywords) <= 10
+        assert release.seo.seo_title == release.content.seo_title
+    finally:
+        gen.get_shared_model = original
+        gen.settings.ai_cache_enabled = cache_enabled
+        gen.agent_registry.reset()
+
+
+def test_publishable_endpoint():
+    """The endpoint returns both the release content and SEO metadata"""
+    from main import app
+
+    client = TestClient(app)
+    response = client.post("/api/v1/press-releases/generate/publishable", json={
+        "company_name": "Test Company",
+        "announcement": "a new product launch",
+        "company_info": "a Dublin software company",
+        "contact_email": "press@example.ie",
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["content"]["headline"].startswith("Test Company")
+    assert data["seo"]["schema_markup"]["@type"] == "NewsArticle"
+
+
+if __name__ == "__main__":
+    print("🧪 Running publishable release tests")
+    for test in (test_publishable_release_uses_one_model_call, test_publishable_endpoint):
+        test()
+        print(f"✅ {test.__name__}")
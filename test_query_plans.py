@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Query-plan regression tests: the hot queries must be served by indexes.
+
+Migrates a fresh database to head, runs the real service functions, and
+EXPLAINs every statement they sent. A full scan of an application table, or
+a listing sorted outside its index, fails the test. SQLite always runs; set
+TEST_POSTGRES_URL (an empty database, postgresql+asyncpg://...) to check
+the Postgres plans too.
+"""
+
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.database import create_database_engine
+from app.models.press_release import PressRelease
+from app.services.analytics import ViewCounter
+from app.services.press_releases import get_published_release, get_release_cache, list_press_release_page
+from app.services.search import search_press_releases
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TABLES = ("press_releases", "companies", "visitor_sketches")
+LISTING_INDEXES = {
+    "feed": "ix_press_releases_published_publish_date_id",
+    "feed page 2": "ix_press_releases_published_publish_date_id",
+    "company": "ix_press_releases_company_published_publish_date_id",
+    "drafts": "ix_press_releases_unpublished_status_publish_date_id",
+}
+
+
+def migrate(url: str, revision: str = "head") -> None:
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, revision)
+
+
+async def run_key_queries(url: str):
+    """Seed releases, run the hot read and write paths, and return what they sent, by name"""
+    engine = create_database_engine(url)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    async with sessions() as db:
+        db.add_all([
+            PressRelease(
+                company_name=f"Company {i % 7}", company_domain=f"company{i % 7}.ie", company_email="press@example.ie",
+                headline=f"Release {i} about coffee" if i % 3 else f"Release {i} about widgets",
+                body="Body text. " * 20, slug=f"release-{i}",
+                status="published" if i % 4 else "draft", publish_date=start + timedelta(hours=i),
+            )
+            for i in range(400)
+        ])
+        await db.commit()
+
+    sent, current = {}, []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, parameters, context, executemany:
+            current.append((statement, parameters[0] if executemany else parameters))
+    )
+
+    async def capture(name, work):
+        current.clear()
+        result = await work()
+        sent[name] = list(current)
+        return result
+
+    get_release_cache().clear()
+    async with sessions() as db:
+        first = await capture("feed", lambda: list_press_release_page(db, limit=20))
+        await capture("feed page 2", lambda: list_press_release_page(db, limit=20, cursor=first["next_cursor"]))
+        await capture("company", lambda: list_press_release_page(db, limit=20, company_domain="company3.ie"))
+        await capture("drafts", lambda: list_press_release_page(db, limit=20, status="draft"))
+        await capture("by slug", lambda: get_published_release(db, "release-5"))
+        await capture("search", lambda: search_press_releases(db, "coffee", company_domain="company1.ie"))
+        release_id = first["items"][0].id
+
+    counter = ViewCounter(sessions)
+    counter.record(release_id, visitor="visitor-1", company_domain="company1.ie")
+    await counter.flush()  # Creates the sketches; the next flush updates them
+    counter.record(release_id, visitor="visitor-2", company_domain="company1.ie")
+    await capture("view flush", counter.flush)
+    get_release_cache().clear()
+    await engine.dispose()
+    return sent
+
+
+def sqlite_plans(path: str, sent):
+    with sqlite3.connect(path) as conn:
+        return {
+            name: [
+                (statement, [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)])
+                for statement, parameters in statements if not statement.startswith(("BEGIN", "PRAGMA"))
+            ]
+            for name, statements in sent.items()
+        }
+
+
+def check_sqlite_plan(name: str, statement: str, plan) -> None:
+    detail = "\n".join(plan)
+    # "SCAN t" reads every row, and so does "SCAN t USING INDEX" unless a LIMIT stops the ordered walk early
+    scan = r"^SCAN (?:{})\b(?! USING)" if "LIMIT" in statement else r"^SCAN (?:{})\b"
+    for table in TABLES:
+        full_scan = re.search(scan.format(f"{table}|p"), detail, re.MULTILINE)
+        assert full_scan is None, f"{name}: full scan of {table}\n{statement}\n{detail}"
+    if name in LISTING_INDEXES and "ORDER BY" in statement:
+        assert LISTING_INDEXES[name] in detail, f"{name}: expected {LISTING_INDEXES[name]}\n{detail}"
+        assert "TEMP B-TREE" not in detail, f"{name}: sorted outside the index\n{detail}"
+
+
+def test_sqlite_hot_queries_use_indexes():
+    """Listings, reads by slug, search and counter flushes never scan a whole table on SQLite"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "prs.db")
+        url = f"sqlite+aiosqlite:///{path}"
+        migrate(url)
+        sent = asyncio.run(run_key_queries(url))
+        plans = sqlite_plans(path, sent)
+
+    assert set(plans) == set(LISTING_INDEXES) | {"by slug", "search", "view flush"}
+    for name, explained in plans.items():
+        assert explained, f"{name} sent no statements"
+        for statement, plan in explained:
+            check_sqlite_plan(name, statement, plan)
+
+
+async def postgres_plans(url: str, sent):
+    # With sequential scans priced out, a Seq Scan in the plan means no index can serve the query
+    engine = create_database_engine(url)
+    plans = {}
+    async with engine.connect() as conn:
+        raw = (await conn.get_raw_connection()).driver_connection
+        await raw.execute("SET enable_seqscan = off")
+        for name, statements in sent.items():
+            plans[name] = []
+            for statement, parameters in statements:
+                if not statement.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "INSERT", "DELETE")):
+                    continue
+                plan = await raw.fetchval(f"EXPLAIN (FORMAT JSON) {statement}", *parameters)
+                plans[name].append((statement, json.loads(plan) if isinstance(plan, str) else plan))
+    await engine.dispose()
+    return plans
+
+
+def scans(node):
+    yield node["Node Type"], node.get("Relation Name"), node.get("Index Name")
+    for child in node.get("Plans", ()):
+        yield from scans(child)
+
+
+def test_postgres_hot_queries_use_indexes():
+    """The same queries on Postgres use index scans (runs when TEST_POSTGRES_URL is set)"""
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        print("⚠️  TEST_POSTGRES_URL not set; Postgres plans not checked")
+        return
+    migrate(url)
+    sent = asyncio.run(run_key_queries(url))
+    plans = asyncio.run(postgres_plans(url, sent))
+
+    for name, explained in plans.items():
+        for statement, plan in explained:
+            nodes = list(scans(plan[0]["Plan"]))
+            seq = [relation for node_type, relation, _ in nodes if node_type == "Seq Scan" and relation in TABLES]
+            assert not seq, f"{name}: sequential scan of {seq}\n{statement}"
+            if name in LISTING_INDEXES and "ORDER BY" in statement:
+                assert LISTING_INDEXES[name] in {index for _, _, index in nodes}, f"{name}: {nodes}"
+                assert "Sort" not in {node_type for node_type, _, _ in nodes}, f"{name}: sorted outside the index"
+
+
+if __name__ == "__main__":
+    print("🧪 Running query plan tests")
+    for test in (test_sqlite_hot_queries_use_indexes, test_postgres_hot_queries_use_indexes):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Tests for per-provider rate limiting and adaptive concurrency"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pydantic_ai import Agent
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+from app.agents.limiter import ProviderLimiter, RateLimitedModel, TokenBucket
+from app.agents.router import RouterModel
+
+
+def test_token_bucket_refill_and_debt():
+    """An empty bucket waits for refill; overspending is paid back before the next call"""
+    bucket = TokenBucket(rate_per_minute=60)
+    assert bucket.time_until(60) == 0.0
+    bucket.take(60)
+    assert 0.9 < bucket.time_until(1) <= 1.0
+    bucket.take(30)
+    assert bucket.time_until(1) > 30
+
+
+def test_aimd_grows_and_backs_off():
+    """Successes add ~1 slot per window; throttling and latency spikes halve the limit once per burst"""
+    limiter = ProviderLimiter("test", initial_concurrency=4, max_concurrency=8, latency_min_samples=3)
+    for _ in range(5):
+        limiter.record_success(latency=1.0)
+    assert limiter.concurrency_limit == 5
+
+    limiter.record_throttled()
+    limiter.record_throttled()
+    assert limiter.concurrency_limit == 2
+    assert limiter.throttled == 2 and limiter.backoffs == 1
+
+    limiter._last_decrease = 0.0
+    limiter.record_success(latency=5.0)
+    assert limiter.concurrency_limit == 1 and limiter.backoffs == 2
+
+
+def test_concurrency_recovers_after_a_lasting_latency_change():
+    """If calls stay slower, the baseline catches up and the limit grows back instead of sticking at the minimum"""
+    limiter = ProviderLimiter(
+        "test", initial_concurrency=8, max_concurrency=8, latency_min_samples=3, decrease_interval=0
+    )
+    for _ in range(10):
+        limiter.record_success(latency=1.0)
+    for _ in range(5):
+        limiter.record_success(latency=5.0)
+    assert limiter.concurrency_limit == 1  # Backed off on the first slow calls
+
+    for _ in range(100):
+        limiter.record_success(latency=5.0)
+    assert limiter.latency_baseline > 2.5  # 5s is no longer a spike
+    assert limiter.concurrency_limit >= 4
+
+
+def test_slots_cap_concurrency_and_report_queue():
+    """No more than the concurrency limit runs at once; waiters show up as queue depth"""
+    limiter = ProviderLimiter("test", initial_concurrency=2, max_concurrency=2)
+    peak = {"in_flight": 0, "queue_depth": 0}
+
+    async def call():
+        async with limiter.slot():
+            peak["in_flight"] = max(peak["in_flight"], limiter.in_flight)
+            peak["queue_depth"] = max(peak["queue_depth"], limiter.waiting)
+            await asyncio.sleep(0.02)
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(run())
+    stats = limiter.stats()
+    assert peak["in_flight"] == 2
+    assert peak["queue_depth"] >= 3
+    assert stats["requests"] == 6 and stats["in_flight"] == 0 and stats["queue_depth"] == 0
+    assert stats["wait_seconds_max"] >= 0.03
+
+
+def test_throttled_provider_backs_off_and_router_fails_over():
+    """A 429 is recorded on that provider's limiter and the router moves to the next one"""
+
+    def rate_limited(messages, info):
+        raise ModelHTTPError(429, "throttled-model", {"error": "rate_limit_exceeded"})
+
+    def healthy(messages, info):
+        return ModelResponse(parts=[TextPart("ok")])
+
+    busy = ProviderLimiter("busy", initial_concurrency=4)
+    spare = ProviderLimiter("spare", initial_concurrency=4)
+    model = RouterModel(
+        RateLimitedModel(FunctionModel(rate_limited), busy),
+        RateLimitedModel(FunctionModel(healthy), spare),
+    )
+    result = asyncio.run(Agent(model).run("hello"))
+
+    assert result.output == "ok"
+    assert busy.throttled == 1 and busy.concurrency_limit == 2
+    assert spare.requests == 1 and spare.throttled == 0
+
+
+if __name__ == "__main__":
+    print("🧪 Running rate limiter tests")
+    for test in (
+        test_token_bucket_refill_and_debt,
+        test_aimd_grows_and_backs_off,
+        test_concurrency_recovers_after_a_lasting_latency_change,
+        test_slots_cap_concurrency_and_report_queue,
+        test_throttled_provider_backs_off_and_router_fails_over,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
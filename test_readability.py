@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Tests for local readability and structure scoring"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.database import Base
+from app.models.press_release import PressRelease
+from app.services import readability
+from app.services.readability import analyze_batch, analyze_text, count_syllables, flesch_reading_ease
+
+WELL_STRUCTURED = """Galway Widgets opens new plant
+
+GALWAY, Ireland - March 3, 2025 - Galway Widgets today announced a new plant in Oranmore that will create 50 jobs.
+
+The plant opens in May. It will build parts for medical devices sold across Europe.
+
+"This plant lets us grow in the west of Ireland and hire local people," said CEO Mary Byrne.
+
+About Galway Widgets
+Galway Widgets makes precision parts for the medical sector.
+
+###"""
+
+POORLY_STRUCTURED = """It has been decided by the board that, following an extensive and comprehensive consideration \
+of numerous strategic alternatives that were evaluated by external consultants who were retained for that purpose, \
+the organisation's operational infrastructure was to be restructured, and the restructuring was approved."""
+
+
+def test_syllables_and_flesch():
+    """Syllable heuristics and the Flesch formula behave sensibly"""
+    assert [count_syllables(w) for w in ["plant", "Ireland", "needed", "jumped", "readability"]] == [1, 3, 2, 1, 5]
+    assert flesch_reading_ease(100, 10, 130) > flesch_reading_ease(100, 4, 170)
+    assert flesch_reading_ease(0, 0, 0) == 0.0
+
+
+def test_structure_checks():
+    """A well-formed release passes the lead checks and outscores a dense one"""
+    good = analyze_text(WELL_STRUCTURED)
+    assert good.has_dateline and good.lead_has_when and good.lead_has_announcement
+    assert good.has_quote and good.has_boilerplate and good.lead_is_concise
+    assert good.structure_score == 100.0
+
+    bad = analyze_text(POORLY_STRUCTURED)
+    assert bad.passive_voice_ratio == 1.0
+    assert bad.long_sentence_ratio == 1.0
+    assert good.overall_score > bad.overall_score
+    assert good.flesch_reading_ease > bad.flesch_reading_ease
+
+
+def test_batch_matches_single():
+    """Batch scoring returns the same reports as one-by-one scoring"""
+    texts = [WELL_STRUCTURED, POORLY_STRUCTURED, ""] * 10
+    reports = analyze_batch(texts)
+    assert [r.overall_score for r in reports] == [analyze_text(t).overall_score for t in texts]
+    assert reports[2].overall_score == 0.0
+
+
+def test_rescore_scores_off_the_event_loop():
+    """Rescoring hands batches to the executor and never scores on the loop's thread"""
+    scored_on = []
+    analyze_many = readability._analyze_many
+
+    def recording(texts):
+        scored_on.append(threading.get_ident())
+        return analyze_many(texts)
+
+    async def run(path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with sessions() as db:
+            db.add_all([
+                PressRelease(
+                    company_name="Galway Widgets", company_domain="galwaywidgets.ie", company_email="press@gw.ie",
+                    headline=f"Release {i}", body=(WELL_STRUCTURED, POORLY_STRUCTURED)[i % 2], slug=f"release-{i}",
+                )
+                for i in range(10)
+            ])
+            await db.commit()
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                updated = await readability.rescore_press_releases(db, batch_size=4, pool=pool)
+            scores = dict((await db.execute(select(PressRelease.slug, PressRelease.ai_score))).all())
+            # The default is one shared process pool, reused across calls
+            readability._analyze_many = analyze_many
+            await readability.rescore_press_releases(db, batch_size=4)
+        await engine.dispose()
+        return updated, scores, threading.get_ident()
+
+    readability._analyze_many = recording
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            updated, scores, loop_thread = asyncio.run(run(os.path.join(tmp, "prs.db")))
+    finally:
+        readability._analyze_many = analyze_many
+
+    assert updated == 10
+    assert scores["release-0"] == analyze_text(WELL_STRUCTURED).overall_score
+    assert scores["release-1"] == analyze_text(POORLY_STRUCTURED).overall_score
+    assert len(scored_on) == 3 and loop_thread not in scored_on
+    assert readability.get_scoring_pool() is readability.get_scoring_pool()
+
+
+if __name__ == "__main__":
+    print("🧪 Running readability tests")
+    for test in (
+        test_syllables_and_flesch,
+        test_structure_checks,
+        test_batch_matches_single,
+        test_rescore_scores_off_the_event_loop,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Tests for slug retrieval with the read-through release cache and conditional GET"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.conditional import is_not_modified
+from app.core.database import Base, get_db, get_read_db
+from app.models.press_release import PressRelease
+from app.services.press_releases import get_published_release, get_release_cache
+
+
+async def seeded_sessions(path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as db:
+        db.add_all([
+            PressRelease(
+                company_name="Cork Coffee", company_domain="corkcoffee.ie", company_email="press@corkcoffee.ie",
+                headline="Cork Coffee opens in Galway", body="Cork Coffee today opened its first café in Galway.",
+                slug="cork-coffee-galway", status="published",
+            ),
+            PressRelease(
+                company_name="Cork Coffee", company_domain="corkcoffee.ie", company_email="press@corkcoffee.ie",
+                headline="Unpublished", body="Not yet.", slug="cork-coffee-draft", status="draft",
+            ),
+        ])
+        await db.commit()
+    return engine, sessions
+
+
+def test_conditional_headers():
+    """If-None-Match wins over If-Modified-Since and compares weakly"""
+    last_modified = "Fri, 16 Oct 2026 10:00:00 GMT"
+    assert is_not_modified({"if-none-match": 'W/"abc", "def"'}, '"abc"', last_modified)
+    assert not is_not_modified({"if-none-match": '"def"', "if-modified-since": last_modified}, '"abc"', last_modified)
+    assert is_not_modified({"if-modified-since": "Fri, 16 Oct 2026 11:00:00 GMT"}, '"abc"', last_modified)
+    assert not is_not_modified({"if-modified-since": "Thu, 15 Oct 2026 11:00:00 GMT"}, '"abc"', last_modified)
+    assert not is_not_modified({"if-modified-since": "yesterday"}, '"abc"', last_modified)
+
+
+def test_get_by_slug_is_cached_and_revalidated():
+    """Repeat reads skip the database, 304s honour the validators and updates invalidate"""
+    from main import app
+
+    get_release_cache().clear()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, sessions = asyncio.run(seeded_sessions(os.path.join(tmp, "prs.db")))
+        statements = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement)
+        )
+
+        async def override_db():
+            async with sessions() as db:
+                yield db
+
+        async def edit_headline():
+            async with sessions() as db:
+                release = (await db.execute(
+                    select(PressRelease).where(PressRelease.slug == "cork-coffee-galway")
+                )).scalar_one()
+                release.headline = "Cork Coffee opens two cafés in Galway"
+                await db.commit()
+
+        app.dependency_overrides[get_db] = app.dependency_overrides[get_read_db] = override_db
+        try:
+            client = TestClient(app)
+            first = client.get("/api/v1/press-releases/cork-coffee-galway")
+            queries_after_first = len(statements)
+            second = client.get("/api/v1/press-releases/cork-coffee-galway")
+            not_modified = client.get(
+                "/api/v1/press-releases/cork-coffee-galway", headers={"If-None-Match": first.headers["etag"]}
+            )
+            since = client.get(
+                "/api/v1/press-releases/cork-coffee-galway",
+                headers={"If-Modified-Since": first.headers["last-modified"]}
+            )
+            queries_after_hits = len(statements)
+            draft = client.get("/api/v1/press-releases/cork-coffee-draft")
+            missing = client.get("/api/v1/press-releases/no-such-release")
+
+            asyncio.run(edit_headline())
+            updated = client.get(
+                "/api/v1/press-releases/cork-coffee-galway", headers={"If-None-Match": first.headers["etag"]}
+            )
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_db, None)
+            asyncio.run(engine.dispose())
+            get_release_cache().clear()
+
+    assert first.status_code == 200 and first.json()["headline"] == "Cork Coffee opens in Galway"
+    assert "body" in first.json()
+    assert queries_after_first == 1
+    assert queries_after_hits == queries_after_first  # Cache hits and 304s never query
+    assert second.json() == first.json() and second.headers["etag"] == first.headers["etag"]
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert not_modified.headers["etag"] == first.headers["etag"]
+    assert since.status_code == 304
+    assert draft.status_code == 404 and missing.status_code == 404
+    assert updated.status_code == 200
+    assert updated.json()["headline"] == "Cork Coffee opens two cafés in Galway"
+    assert updated.headers["etag"] != first.headers["etag"]
+
+
+def test_reads_during_an_update_are_not_cached_past_its_commit():
+    """A read between an update's flush and its commit may cache the old row, but the commit evicts it"""
+
+    async def run(path):
+        engine, sessions = await seeded_sessions(path)
+        async with sessions() as writer, sessions() as reader:
+            release = (await writer.execute(
+                select(PressRelease).where(PressRelease.slug == "cork-coffee-galway")
+            )).scalar_one()
+            release.headline = "Cork Coffee opens two cafés in Galway"
+            await writer.flush()
+            during = await get_published_release(reader, "cork-coffee-galway")
+            await reader.rollback()
+            await writer.commit()
+            after = await get_published_release(reader, "cork-coffee-galway")
+
+            release.headline = "Rolled back"
+            await writer.flush()
+            await writer.rollback()
+            cached_after_rollback = get_release_cache().get("release:cork-coffee-galway")
+        await engine.dispose()
+        return during, after, cached_after_rollback
+
+    get_release_cache().clear()
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            during, after, cached_after_rollback = asyncio.run(run(os.path.join(tmp, "prs.db")))
+        finally:
+            get_release_cache().clear()
+
+    assert during["release"]["headline"] == "Cork Coffee opens in Galway"
+    assert after["release"]["headline"] == "Cork Coffee opens two cafés in Galway"
+    assert cached_after_rollback == after  # Nothing committed, nothing evicted
+
+
+if __name__ == "__main__":
+    print("🧪 Running release retrieval tests")
+    for test in (
+        test_conditional_headers,
+        test_get_by_slug_is_cached_and_revalidated,
+        test_reads_during_an_update_are_not_cached_past_its_commit,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Tests for latency-aware provider routing with fake local providers"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+from app.agents.router import RouterModel
+
+
+def fake_provider(name, delay=0.0, fail=False):
+    """A local provider that answers with its own name after ``delay`` seconds"""
+    calls = []
+
+    async def respond(messages, info):
+        calls.append(name)
+        await asyncio.sleep(delay)
+        if fail:
+            raise ConnectionError(f"{name} unavailable")
+        return ModelResponse(parts=[TextPart(name)])
+
+    respond.__name__ = name
+    return FunctionModel(respond), calls
+
+
+def test_routes_to_fastest_provider():
+    """After warm-up traffic the faster provider becomes the primary"""
+    slow, slow_calls = fake_provider("slow", delay=0.03)
+    fast, fast_calls = fake_provider("fast", delay=0.001)
+    router = RouterModel(slow, fast)
+    agent = Agent(router)
+
+    async def run():
+        # Seed latency samples as if from earlier traffic
+        router.health[router._key(fast)].record_success(0.001)
+        router.health[router._key(slow)].record_success(0.03)
+        return [(await agent.run("hi")).output for _ in range(3)]
+
+    assert asyncio.run(run()) == ["fast", "fast", "fast"]
+    assert not slow_calls
+
+
+def test_unmeasured_providers_follow_measured_ones():
+    """Providers without latency samples rank after measured ones, in configured priority"""
+    first, _ = fake_provider("first")
+    measured, _ = fake_provider("measured")
+    last, _ = fake_provider("last")
+    router = RouterModel(first, measured, last)
+    assert router.ranked_models() == [first, measured, last]
+
+    router.health[router._key(measured)].record_success(0.5)
+    assert router.ranked_models() == [measured, first, last]
+
+
+def test_exploration_samples_backup_providers():
+    """A share of requests goes to an unsampled backup until it has enough latency samples"""
+    fast, _ = fake_provider("fast")
+    backup, backup_calls = fake_provider("backup", delay=0.005)
+    router = RouterModel(fast, backup, explore_rate=0.2, explore_min_samples=3)
+    router._random.seed(7)
+    router.health[router._key(fast)].record_success(0.001)
+    agent = Agent(router)
+
+    async def run():
+        return [(await agent.run("hi")).output for _ in range(100)]
+
+    outputs = asyncio.run(run())
+    assert len(backup_calls) == 3  # Probed until it had explore_min_samples, then left alone
+    assert outputs.count("fast") == 97
+    assert router.stats()[router._key(backup)]["samples"] == 3
+
+
+def test_stream_outcome_is_recorded_when_it_ends():
+    """A stream that breaks part-way counts as a failure, not a success"""
+    async def broken_stream(messages, info):
+        yield "partial "
+        raise ConnectionError("connection reset")
+
+    async def good_stream(messages, info):
+        yield "all "
+        yield "there"
+
+    broken = FunctionModel(stream_function=broken_stream)
+    router = RouterModel(broken)
+    health = router.health[router._key(broken)]
+
+    async def consume(agent):
+        async with agent.run_stream("hi") as result:
+            return await result.get_output()
+
+    try:
+        asyncio.run(consume(Agent(router)))
+    except ConnectionError:
+        pass
+    else:
+        raise AssertionError("the broken stream should raise")
+    assert list(health.outcomes) == [False]
+
+    good = FunctionModel(stream_function=good_stream)
+    router = RouterModel(good)
+    assert asyncio.run(consume(Agent(router))) == "all there"
+    assert list(router.health[router._key(good)].outcomes) == [True]
+
+
+def test_failover_and_circuit_breaker():
+    """Errors fail over to the next provider and trip the breaker"""
+    broken, broken_calls = fake_provider("broken", fail=True)
+    backup, _ = fake_provider("backup")
+    router = RouterModel(broken, backup, failure_threshold=2, cooldown_seconds=60)
+    agent = Agent(router)
+
+    async def run():
+        return [(await agent.run("hi")).output for _ in range(4)]
+
+    assert asyncio.run(run()) == ["backup"] * 4
+    # After its first failure the broken provider is ranked behind the backup
+    broken_health = router.health[router._key(broken)]
+    assert broken_health.error_rate == 1.0
+    assert router.ranked_models()[0] is backup
+    assert len(broken_calls) == 1
+
+    broken_health.record_failure()
+    assert broken_health.circuit_open
+    assert router.ranked_models() == [backup]
+
+
+def test_hedges_slow_requests():
+    """A request slower than the primary's p95 is raced against the secondary"""
+    primary, _ = fake_provider("primary", delay=0.2)
+    secondary, _ = fake_provider("secondary", delay=0.01)
+    router = RouterModel(primary, secondary, hedge=True, hedge_min_samples=5)
+    for _ in range(10):
+        router.health[router._key(primary)].record_success(0.02)
+        router.health[router._key(secondary)].record_success(0.05)
+    agent = Agent(router)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        output = (await agent.run("hi")).output
+        return output, loop.time() - started
+
+    output, elapsed = asyncio.run(run())
+    assert output == "secondary"
+    assert elapsed < 0.15
+
+
+if __name__ == "__main__":
+    print("🧪 Running provider routing tests")
+    for test in (
+        test_routes_to_fastest_provider,
+        test_unmeasured_providers_follow_measured_ones,
+        test_exploration_samples_backup_providers,
+        test_stream_outcome_is_recorded_when_it_ends,
+        test_failover_and_circuit_breaker,
+        test_hedges_slow_requests,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Tests for full-text search over press releases"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.database import Base, get_db, get_read_db
+from app.models.press_release import PressRelease
+from app.services import search
+from app.services.search import fts5_query, search_press_releases
+
+RELEASES = [
+    # (slug, domain, headline, body, keywords, status, month)
+    ("widgets-plant", "galwaywidgets.ie", "Galway Widgets opens precision plant",
+     "The new plant in Oranmore will employ 50 engineers.", ["manufacturing"], "published", 1),
+    ("coffee-roastery", "corkcoffee.ie", "Cork Coffee expands roastery",
+     "The roastery expansion adds capacity for a new plant-based range & <b>cold brew</b>.", ["food"], "published", 3),
+    ("fintech-funding", "dublinfintech.ie", "Dublin Fintech raises Series A",
+     "Funding will grow the engineering team in Dublin.", ["plants", "investment"], "published", 5),
+    ("widgets-draft", "galwaywidgets.ie", "Galway Widgets plant second phase",
+     "A second plant is planned.", None, "draft", 6),
+]
+
+
+async def seeded_sessions(path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as db:
+        db.add_all([
+            PressRelease(
+                company_name=domain.split(".")[0], company_domain=domain, company_email=f"press@{domain}",
+                headline=headline, body=body, keywords=keywords, slug=slug, status=status,
+                publish_date=datetime(2026, month, 1, tzinfo=timezone.utc),
+            )
+            for slug, domain, headline, body, keywords, status, month in RELEASES
+        ])
+        await db.commit()
+    return engine, sessions
+
+
+def test_fts5_query_quotes_every_term():
+    """User input cannot inject FTS5 syntax and the last word matches as a prefix"""
+    assert fts5_query('plant OR "cork" NEAR(') == '"plant" "OR" "cork" "NEAR"*'
+    assert fts5_query("go ie") == '"go" "ie"'
+    assert fts5_query("  -- ") is None
+
+
+def test_search_ranks_highlights_filters_and_tracks_updates():
+    """Headline matches outrank body matches, filters apply and edits are indexed immediately"""
+
+    async def run(path):
+        engine, sessions = await seeded_sessions(path)
+        async with sessions() as db:
+            plant = await search_press_releases(db, "plant")
+            in_cork = await search_press_releases(db, "plant", company_domain="corkcoffee.ie")
+            early = await search_press_releases(db, "plant", published_before=datetime(2026, 2, 1, tzinfo=timezone.utc))
+            prefix = await search_press_releases(db, "roast")
+            by_keyword = await search_press_releases(db, "investment")
+
+            release = (await db.execute(select(PressRelease).where(PressRelease.slug == "fintech-funding"))).scalar_one()
+            release.headline = "Dublin Fintech raises Series A to expand payments"
+            await db.commit()
+            after_edit = await search_press_releases(db, "payments")
+            await db.execute(delete(PressRelease).where(PressRelease.slug == "coffee-roastery"))
+            await db.commit()
+            after_delete = await search_press_releases(db, "roastery")
+        await engine.dispose()
+        return plant, in_cork, early, prefix, by_keyword, after_edit, after_delete
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plant, in_cork, early, prefix, by_keyword, after_edit, after_delete = asyncio.run(run(os.path.join(tmp, "prs.db")))
+
+    assert [hit["slug"] for hit in plant][0] == "widgets-plant"
+    assert {hit["slug"] for hit in plant} == {"widgets-plant", "coffee-roastery", "fintech-funding"}  # Stemmed
+    assert plant[0]["score"] > plant[-1]["score"]
+    assert plant[0]["headline_highlight"] == "Galway Widgets opens precision <mark>plant</mark>"
+    roastery = next(hit for hit in plant if hit["slug"] == "coffee-roastery")
+    assert "&amp; &lt;b&gt;cold brew&lt;/b&gt;" in roastery["snippet"]
+    assert "<mark>plant</mark>" in roastery["snippet"]
+    assert [hit["slug"] for hit in in_cork] == ["coffee-roastery"]
+    assert [hit["slug"] for hit in early] == ["widgets-plant"]
+    assert [hit["slug"] for hit in prefix] == ["coffee-roastery"]
+    assert [hit["slug"] for hit in by_keyword] == ["fintech-funding"]
+    assert [hit["slug"] for hit in after_edit] == ["fintech-funding"]
+    assert after_delete == []
+
+
+def test_rank_window_counts_only_filtered_matches():
+    """The SQLite rank window holds the newest matches that pass the filters, not any match"""
+
+    async def run(path):
+        engine, sessions = await seeded_sessions(path)
+        async with sessions() as db:
+            newest = await search_press_releases(db, "plant")
+            oldest_company = await search_press_releases(db, "plant", company_domain="galwaywidgets.ie")
+        await engine.dispose()
+        return newest, oldest_company
+
+    original, search.SQLITE_RANK_WINDOW = search.SQLITE_RANK_WINDOW, 2
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            newest, oldest_company = asyncio.run(run(os.path.join(tmp, "prs.db")))
+    finally:
+        search.SQLITE_RANK_WINDOW = original
+
+    # The newest match is a draft; it must not take a place in the window
+    assert {hit["slug"] for hit in newest} == {"coffee-roastery", "fintech-funding"}
+    assert [hit["slug"] for hit in oldest_company] == ["widgets-plant"]
+
+
+def test_search_endpoint():
+    """The API serves ranked hits and is not shadowed by slug retrieval"""
+    from main import app
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, sessions = asyncio.run(seeded_sessions(os.path.join(tmp, "prs.db")))
+
+        async def override_db():
+            async with sessions() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = app.dependency_overrides[get_read_db] = override_db
+        try:
+            client = TestClient(app)
+            found = client.get("/api/v1/press-releases/search", params={"q": "engineers", "company": "galwaywidgets.ie"})
+            empty = client.get("/api/v1/press-releases/search", params={"q": "?!"})
+            missing_q = client.get("/api/v1/press-releases/search")
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_db, None)
+            asyncio.run(engine.dispose())
+
+    assert found.status_code == 200
+    body = found.json()
+    assert body["query"] == "engineers" and [item["slug"] for item in body["items"]] == ["widgets-plant"]
+    assert "<mark>engineers</mark>" in body["items"][0]["snippet"]
+    assert empty.status_code == 200 and empty.json()["items"] == []
+    assert missing_q.status_code == 422
+
+
+if __name__ == "__main__":
+    print("🧪 Running search tests")
+    for test in (
+        test_fts5_query_quotes_every_term,
+        test_search_ranks_highlights_filters_and_tracks_updates,
+        test_rank_window_counts_only_filtered_matches,
+        test_search_endpoint,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Tests for single-flight request coalescing"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_result():
+    """N concurrent callers for one key trigger a single upstream call"""
+    flight = SingleFlight()
+    upstream_calls = 0
+
+    async def slow_generate():
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(0.05)
+        return {"headline": "Shared"}
+
+    async def run():
+        results = await asyncio.gather(*(flight.do("same", slow_generate) for _ in range(5)))
+        other = await flight.do("other", slow_generate)
+        return results, other
+
+    results, other = asyncio.run(run())
+    assert all(result == {"headline": "Shared"} for result in results)
+    assert upstream_calls == 2
+    assert flight.shared == 4
+    assert flight.in_flight() == 0
+
+
+def test_cancelled_waiter_does_not_cancel_others():
+    """A disconnecting client leaves the shared call running for the rest"""
+    flight = SingleFlight()
+
+    async def slow_generate():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("key", slow_generate))
+        second = asyncio.ensure_future(flight.do("key", slow_generate))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "done"
+
+
+def test_errors_propagate_to_all_waiters():
+    """A failing call raises in every waiter and releases the key"""
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    async def run():
+        return await asyncio.gather(
+            flight.do("key", failing), flight.do("key", failing), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.in_flight() == 0
+
+
+if __name__ == "__main__":
+    print("🧪 Running single-flight tests")
+    for test in (
+        test_concurrent_calls_share_one_result,
+        test_cancelled_waiter_does_not_cancel_others,
+        test_errors_propagate_to_all_waiters,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Tests for the embedded SQLite mode: connection pragmas and the single-writer queue"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from contextlib import asynccontextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.database import Base, create_database_engine
+from app.core.sqlite_writer import SQLiteWriteQueue
+from app.models.press_release import PressRelease
+
+
+def release(slug: str) -> PressRelease:
+    return PressRelease(
+        company_name="Cork Coffee", company_domain="corkcoffee.ie", company_email="press@corkcoffee.ie",
+        headline=f"Release {slug}", body="Body.", slug=slug, status="published",
+    )
+
+
+async def embedded(path: str):
+    engine = create_database_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def test_connections_are_tuned():
+    """Every connection gets WAL, the busy timeout and the mmap/cache pragmas"""
+
+    async def run(path):
+        engine, _ = await embedded(path)
+        async with engine.connect() as conn:
+            pragmas = {
+                name: (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+                for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size", "cache_size")
+            }
+        await engine.dispose()
+        return pragmas
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pragmas = asyncio.run(run(os.path.join(tmp, "prs.db")))
+
+    assert pragmas["journal_mode"] == "wal"
+    assert pragmas["synchronous"] == 1  # NORMAL
+    assert pragmas["busy_timeout"] == 5000
+    assert pragmas["mmap_size"] > 0 and pragmas["cache_size"] < 0
+
+
+def test_concurrent_writes_share_transactions():
+    """Concurrent submits are committed in a few batches and a failing write fails alone"""
+
+    async def add(db, slug):
+        db.add(release(slug))
+        return slug
+
+    async def run(path):
+        engine, sessions = await embedded(path)
+        queue = SQLiteWriteQueue(sessions, max_batch=64)
+        written = await asyncio.gather(*(queue.submit(lambda db, i=i: add(db, f"release-{i}")) for i in range(200)))
+        batches = queue.batches
+
+        # A duplicate slug violates the unique index; its neighbours still commit
+        outcomes = await asyncio.gather(
+            queue.submit(lambda db: add(db, "fresh-1")),
+            queue.submit(lambda db: add(db, "release-0")),
+            queue.submit(lambda db: add(db, "fresh-2")),
+            return_exceptions=True,
+        )
+        await queue.stop()
+        async with sessions() as db:
+            count = (await db.execute(select(func.count()).select_from(PressRelease))).scalar_one()
+            indexed = (await db.execute(text("SELECT count(*) FROM press_releases_fts"))).scalar_one()
+        await engine.dispose()
+        return written, batches, outcomes, count, indexed
+
+    with tempfile.TemporaryDirectory() as tmp:
+        written, batches, outcomes, count, indexed = asyncio.run(run(os.path.join(tmp, "prs.db")))
+
+    assert written == [f"release-{i}" for i in range(200)]
+    assert batches <= 8  # 200 writes, at most 64 per transaction
+    assert outcomes[0] == "fresh-1" and outcomes[2] == "fresh-2"
+    assert isinstance(outcomes[1], IntegrityError)
+    assert count == indexed == 202
+
+
+def test_readers_are_not_blocked_by_an_open_write():
+    """Under WAL a reader sees the last committed state while a write transaction is open"""
+
+    async def run(path):
+        engine, sessions = await embedded(path)
+        queue = SQLiteWriteQueue(sessions)
+        await queue.submit(lambda db: asyncio.sleep(0, db.add(release("committed"))))
+        writing, reading_done = asyncio.Event(), asyncio.Event()
+
+        async def slow_write(db):
+            db.add(release("in-flight"))
+            await db.flush()
+            writing.set()
+            await reading_done.wait()
+
+        write = asyncio.create_task(queue.submit(slow_write))
+        await writing.wait()
+        async with sessions() as db:
+            seen = (await db.execute(select(PressRelease.slug))).scalars().all()
+        reading_done.set()
+        await write
+        await queue.stop()
+        await engine.dispose()
+        return seen
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seen = asyncio.run(run(os.path.join(tmp, "prs.db")))
+
+    assert seen == ["committed"]
+
+
+def test_stop_waits_for_the_write_in_flight():
+    """Stopping mid-batch lets that batch commit before the rest are written, one writer at a time"""
+
+    async def run(path):
+        engine, sessions = await embedded(path)
+        open_sessions, overlaps = [0], []
+
+        @asynccontextmanager
+        async def counted_sessions():
+            open_sessions[0] += 1
+            overlaps.append(open_sessions[0] > 1)
+            try:
+                async with sessions() as db:
+                    yield db
+            finally:
+                open_sessions[0] -= 1
+
+        queue = SQLiteWriteQueue(counted_sessions, max_batch=1)
+        started, release_write = asyncio.Event(), asyncio.Event()
+
+        async def write(db, slug, block=False):
+            if block:
+                started.set()
+                await release_write.wait()
+            db.add(release(slug))
+            return slug
+
+        first = asyncio.create_task(queue.submit(lambda db: write(db, "first", block=True)))
+        await started.wait()
+        rest = [asyncio.create_task(queue.submit(lambda db, i=i: write(db, f"queued-{i}"))) for i in range(3)]
+        await asyncio.sleep(0)
+        stopping = asyncio.create_task(queue.stop())
+        await asyncio.sleep(0.01)
+        release_write.set()
+        await stopping
+        written = await asyncio.gather(first, *rest)
+        async with sessions() as db:
+            slugs = set((await db.execute(select(PressRelease.slug))).scalars().all())
+        await engine.dispose()
+        return written, slugs, overlaps, queue.running
+
+    with tempfile.TemporaryDirectory() as tmp:
+        written, slugs, overlaps, running = asyncio.run(run(os.path.join(tmp, "prs.db")))
+
+    assert written == ["first", "queued-0", "queued-1", "queued-2"]
+    assert slugs == set(written)
+    assert not any(overlaps)
+    assert running is False and SQLiteWriteQueue(None).running is False  # Safe outside a loop
+
+
+if __name__ == "__main__":
+    print("🧪 Running embedded SQLite tests")
+    for test in (
+        test_connections_are_tuned,
+        test_concurrent_writes_share_transactions,
+        test_readers_are_not_blocked_by_an_open_write,
+        test_stop_waits_for_the_write_in_flight,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
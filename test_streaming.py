@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tests for streaming press release generation"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from app.agents.streaming import PartialFieldDiffer, partial_output_args
+
+
+class _ToolCall:
+    part_kind = "tool-call"
+
+    def __init__(self, args):
+        self.args = args
+
+
+class _Response:
+    def __init__(self, args):
+        self.parts = [_ToolCall(args)]
+
+
+def test_differ_on_partial_json():
+    """Scalar fields are emitted once complete, body is streamed as deltas"""
+    payload = json.dumps({"headline": "Cork firm expands", "body": "First para. Second para.", "seo_title": "Expansion"})
+    differ = PartialFieldDiffer()
+    events = []
+    for end in range(5, len(payload) + 5, 5):
+        partial = partial_output_args(_Response(payload[:end]))
+        if partial:
+            events.extend(differ.feed(partial))
+    events.extend(differ.feed(json.loads(payload), final=True))
+
+    assert events[0] == ("field", {"field": "headline", "value": "Cork firm expands"})
+    body = "".join(data["text"] for event, data in events if event == "delta")
+    assert body == "First para. Second para."
+    assert events[-1] == ("field", {"field": "seo_title", "value": "Expansion"})
+    assert sum(1 for event, _ in events if event == "field") == 2
+
+
+def test_generate_stream_endpoint():
+    """The SSE endpoint sends the headline first and finishes with the full release"""
+    from main import app
+
+    client = TestClient(app)
+    response = client.post("/api/v1/press-releases/generate/stream", json={
+        "company_name": "Test Company",
+        "announcement": "a new product launch in Galway",
+        "company_info": "a Galway software company",
+        "contact_email": "press@example.ie",
+    })
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+
+    assert events[0][0] == "field" and events[0][1]["field"] == "headline"
+    assert events[-1][0] == "done"
+    streamed_body = "".join(data["text"] for event, data in events if event == "delta")
+    assert streamed_body == events[-1][1]["body"]
+
+
+if __name__ == "__main__":
+    print("🧪 Running streaming tests")
+    for test in (test_differ_on_partial_json, test_generate_stream_endpoint):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Tests for HyperLogLog unique-visitor estimation"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.database import Base
+from app.core.hyperloglog import HyperLogLog
+from app.models.press_release import PressRelease, VisitorSketch
+from app.services.analytics import ViewCounter, estimate_unique_visitors
+
+
+def test_estimates_stay_within_error_bounds():
+    """Small and large cardinalities are estimated within a few standard errors"""
+    for n in (10, 1000, 50000):
+        sketch = HyperLogLog()
+        sketch.update(f"visitor-{i}" for i in range(n))
+        sketch.update(f"visitor-{i}" for i in range(n))  # Repeat visits do not count
+        assert abs(sketch.estimate() - n) <= max(1, 0.05 * n), (n, sketch.estimate())
+
+
+def test_merge_is_a_union_and_serialization_is_compact():
+    """Merged sketches estimate the union; a round trip keeps every register"""
+    a, b = HyperLogLog(), HyperLogLog()
+    a.update(f"visitor-{i}" for i in range(0, 6000))
+    b.update(f"visitor-{i}" for i in range(4000, 10000))
+    union = HyperLogLog.union([a, b])
+    assert abs(union.estimate() - 10000) <= 500
+
+    data = union.to_bytes()
+    assert len(data) < union.size
+    assert HyperLogLog.from_bytes(data).registers == union.registers
+    assert len(HyperLogLog().to_bytes()) < 64  # An empty sketch is a few bytes
+
+    try:
+        a.merge(HyperLogLog(precision=10))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("merged sketches of different precision")
+
+
+def test_visitors_are_flushed_and_unioned():
+    """Flushes merge into stored sketches, set unique_visitors and answer unions"""
+
+    async def run(path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with sessions() as db:
+            db.add_all([
+                PressRelease(
+                    company_name="Cork Coffee", company_domain="corkcoffee.ie", company_email="press@corkcoffee.ie",
+                    headline=f"Release {i}", body="Body.", slug=f"release-{i}", status="published",
+                )
+                for i in range(2)
+            ])
+            await db.commit()
+            updated_before = (await db.execute(select(PressRelease.updated_at))).scalars().all()
+            first, second = (await db.execute(select(PressRelease.id).order_by(PressRelease.slug))).scalars().all()
+
+        counter = ViewCounter(sessions)
+        # First release: visitors 0-2999, seen over two flushes; second: visitors 2000-3999
+        for i in range(2000):
+            counter.record(first, visitor=f"v{i}", company_domain="corkcoffee.ie")
+        await counter.flush()
+        for i in range(1000, 3000):
+            counter.record(first, visitor=f"v{i}", company_domain="corkcoffee.ie")
+        for i in range(2000, 4000):
+            counter.record(second, visitor=f"v{i}", company_domain="corkcoffee.ie")
+        await counter.flush()
+
+        today = datetime.now(timezone.utc).date()
+        async with sessions() as db:
+            stored = dict((await db.execute(select(PressRelease.id, PressRelease.unique_visitors))).all())
+            views = dict((await db.execute(select(PressRelease.id, PressRelease.view_count))).all())
+            updated_after = (await db.execute(select(PressRelease.updated_at))).scalars().all()
+            sketches = (await db.execute(select(VisitorSketch))).scalars().all()
+            both = await estimate_unique_visitors(db, release_ids=[first, second])
+            company_today = await estimate_unique_visitors(db, company_domains=["corkcoffee.ie"], since=today, until=today)
+            last_year = await estimate_unique_visitors(
+                db, release_ids=[first], since=date(today.year - 1, 1, 1), until=date(today.year - 1, 12, 31)
+            )
+        await engine.dispose()
+        stored = [stored[first], stored[second]]
+        views = [views[first], views[second]]
+        return stored, views, updated_before, updated_after, sketches, both, company_today, last_year
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stored, views, updated_before, updated_after, sketches, both, company_today, last_year = asyncio.run(
+            run(os.path.join(tmp, "prs.db"))
+        )
+
+    assert views == [4000, 2000]
+    assert abs(stored[0] - 3000) <= 150 and abs(stored[1] - 2000) <= 100
+    assert updated_after == updated_before  # Counter flushes are not edits
+    assert len(sketches) == 6  # Lifetime and today, for each release and the company
+    assert max(len(s.sketch) for s in sketches) < 4096
+    assert abs(both - 4000) <= 200
+    assert abs(company_today - 4000) <= 200
+    assert last_year == 0
+
+
+if __name__ == "__main__":
+    print("🧪 Running unique visitor tests")
+    for test in (
+        test_estimates_stay_within_error_bounds,
+        test_merge_is_a_union_and_serialization_is_compact,
+        test_visitors_are_flushed_and_unioned,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
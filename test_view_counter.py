@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Tests for write-behind batched view counting"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.database import Base, get_db, get_read_db, run_write
+from app.core.sqlite_writer import SQLiteWriteQueue
+from app.models.press_release import PressRelease
+from app.services.analytics import ViewCounter
+from app.services.press_releases import get_release_cache
+
+
+async def seeded_sessions(path: str, releases: int = 3):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as db:
+        db.add_all([
+            PressRelease(
+                company_name="Cork Coffee", company_domain="corkcoffee.ie", company_email="press@corkcoffee.ie",
+                headline=f"Release {i}", body="Body.", slug=f"release-{i}", status="published",
+            )
+            for i in range(releases)
+        ])
+        await db.commit()
+        ids = (await db.execute(select(PressRelease.id).order_by(PressRelease.slug))).scalars().all()
+    return engine, sessions, ids
+
+
+async def view_counts(sessions):
+    async with sessions() as db:
+        return dict((await db.execute(select(PressRelease.slug, PressRelease.view_count))).all())
+
+
+def test_views_are_flushed_in_one_batch():
+    """Thousands of views become one executemany per flush, with stop() writing the remainder"""
+
+    async def run(path):
+        engine, sessions, ids = await seeded_sessions(path)
+        updates = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, parameters, context, executemany:
+                updates.append(executemany) if statement.startswith("UPDATE") else None
+        )
+        counter = ViewCounter(sessions, flush_interval=3600)
+        await counter.start()
+        for i in range(5000):
+            counter.record(ids[i % 2])
+        flushed = await counter.flush()
+        after_flush = await view_counts(sessions)
+        counter.record(ids[2], views=7)
+        await counter.stop()
+        after_stop = await view_counts(sessions)
+        await engine.dispose()
+        return flushed, updates, after_flush, after_stop, counter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        flushed, updates, after_flush, after_stop, counter = asyncio.run(run(os.path.join(tmp, "prs.db")))
+
+    assert flushed == 2
+    assert updates[0] is True  # One batched statement for both releases
+    assert after_flush == {"release-0": 2500, "release-1": 2500, "release-2": 0}
+    assert after_stop["release-2"] == 7
+    assert not counter.running and counter.pending == {}
+
+
+def test_failed_flush_keeps_the_views():
+    """Deltas from a failed write are merged back and written by the next flush"""
+
+    async def run(path):
+        engine, sessions, ids = await seeded_sessions(path)
+        counter = ViewCounter(sessions)
+        counter.record(ids[0], views=3)
+
+        def broken_sessions():
+            raise OSError("database unavailable")
+
+        counter.session_factory = broken_sessions
+        try:
+            await counter.flush()
+        except OSError:
+            pass
+        counter.record(ids[0])
+        pending = counter.pending
+        counter.session_factory = sessions
+        await counter.flush()
+        counts = await view_counts(sessions)
+        await engine.dispose()
+        return pending, counts, ids[0]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pending, counts, release_id = asyncio.run(run(os.path.join(tmp, "prs.db")))
+
+    assert pending == {release_id: 4}
+    assert counts["release-0"] == 4
+
+
+def test_flushes_join_the_write_queue():
+    """Given a writer, a flush shares the SQLite writer's transaction with concurrent writes"""
+
+    async def run(path):
+        engine, sessions, ids = await seeded_sessions(path)
+        queue = SQLiteWriteQueue(sessions)
+        counter = ViewCounter(sessions, write=queue.submit)
+        counter.record(ids[0], views=5, visitor="visitor-1")
+
+        async def retitle(db):
+            await db.execute(PressRelease.__table__.update().where(PressRelease.id == ids[1]).values(headline="New"))
+
+        await asyncio.gather(counter.flush(), queue.submit(retitle))
+        batches = queue.batches
+        await queue.stop()
+        counts = await view_counts(sessions)
+        await engine.dispose()
+        return batches, counts
+
+    with tempfile.TemporaryDirectory() as tmp:
+        batches, counts = asyncio.run(run(os.path.join(tmp, "prs.db")))
+
+    from app.api.v1.press_releases import view_counter
+    assert view_counter.write is run_write  # The app's counter writes through the shared writer
+    assert batches == 1
+    assert counts["release-0"] == 5
+
+
+def test_slug_reads_record_views():
+    """Reads by slug, including 304s and cache hits, are counted"""
+    from main import app
+    from app.api.v1.press_releases import view_counter
+
+    get_release_cache().clear()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, sessions, _ = asyncio.run(seeded_sessions(os.path.join(tmp, "prs.db")))
+
+        async def override_db():
+            async with sessions() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = app.dependency_overrides[get_read_db] = override_db
+        original_factory, view_counter.session_factory = view_counter.session_factory, sessions
+        original_write, view_counter.write = view_counter.write, None
+        view_counter._pending.clear()
+        try:
+            client = TestClient(app)
+            etag = client.get("/api/v1/press-releases/release-1").headers["etag"]
+            client.get("/api/v1/press-releases/release-1")
+            client.get("/api/v1/press-releases/release-1", headers={"If-None-Match": etag})
+            client.get("/api/v1/press-releases/no-such-release")
+            asyncio.run(view_counter.stop())  # What the app lifespan runs on shutdown
+            counts = asyncio.run(view_counts(sessions))
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_db, None)
+            view_counter.session_factory = original_factory
+            view_counter.write = original_write
+            asyncio.run(engine.dispose())
+            get_release_cache().clear()
+
+    assert counts == {"release-0": 0, "release-1": 3, "release-2": 0}
+
+
+if __name__ == "__main__":
+    print("🧪 Running view counter tests")
+    for test in (
+        test_views_are_flushed_in_one_batch,
+        test_failed_flush_keeps_the_views,
+        test_flushes_join_the_write_queue,
+        test_slug_reads_record_views,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""Open-loop load test for the PressWire API
+
+Drives /generate, /enhance, the press release listing and search at fixed request
+rates and reports p50/p95/p99 latency, throughput and errors per scenario.
+By default the app runs in-process (no server, no API keys) with the mock
+generator's latency simulator standing in for the LLM provider, so worker
+counts can be sized and regressions caught offline:
+
+    python tests/load/loadtest.py --rate generate=10 --rate enhance=5 --rate list=50 \\
+        --duration 30 --latency long_tail --median 1.5 --error-rate 0.01 --workers 8
+
+Pass ``--base-url`` to load a running deployment instead.
+
+Requests are scheduled on a fixed timetable whether or not earlier ones
+have finished, and latency is measured from the scheduled start, so a
+saturated server shows up as growing latency rather than a lower rate.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx
+
+API = "/api/v1/press-releases"
+
+SAMPLE_RELEASE = """Galway Widgets opens new precision plant in Oranmore
+
+GALWAY, Ireland - Galway Widgets today opened a new precision manufacturing plant in Oranmore, creating 50 jobs.
+
+"This plant lets us serve medical device customers across Europe," said Aoife Byrne, CEO of Galway Widgets.
+
+About Galway Widgets
+Galway Widgets designs and manufactures precision components for the medical device industry."""
+
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+def _generate(i: int) -> Request:
+    # Unique announcements keep single-flight coalescing out of the measurement
+    return "POST", f"{API}/generate", {
+        "company_name": "Galway Widgets",
+        "announcement": f"the opening of production line {i} at its Oranmore plant",
+        "company_info": "a precision components manufacturer based in Galway",
+        "contact_email": "press@galwaywidgets.ie",
+    }
+
+
+def _enhance(i: int) -> Request:
+    return "POST", f"{API}/enhance", {"content": f"{SAMPLE_RELEASE}\n\nReference {i}."}
+
+
+COMPANIES = ("galwaywidgets.ie", "corkcoffee.ie", "dublinfintech.ie")
+
+
+def _list(i: int) -> Request:
+    # Alternate the full listing with per-company listings
+    company = f"&company={COMPANIES[i % 3]}" if i % 2 else ""
+    return "GET", f"{API}/?limit=20{company}", None
+
+
+SEARCH_TERMS = ("precision plant", "medical devices", "Oranmore jobs", "Galway")
+
+
+def _search(i: int) -> Request:
+    # Every seeded release matches, so this is the broad-query worst case
+    company = f"&company={COMPANIES[i % 3]}" if i % 2 else ""
+    return "GET", f"{API}/search?q={SEARCH_TERMS[i % len(SEARCH_TERMS)]}{company}", None
+
+
+SCENARIOS: Dict[str, Callable[[int], Request]] = {
+    "generate": _generate,
+    "enhance": _enhance,
+    "list": _list,
+    "search": _search,
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (``q`` in 0-100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+@dataclass
+class ScenarioResult:
+    """Latencies and outcomes for one scenario"""
+    name: str
+    target_rps: float
+    duration: float
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second over the whole run"""
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "scenario": self.name,
+            "target_rps": self.target_rps,
+            "requests": self.requests,
+            "throughput_rps": round(self.throughput, 2),
+            "error_rate": round(self.error_rate, 4),
+            "p50": round(percentile(self.latencies, 50), 4),
+            "p95": round(percentile(self.latencies, 95), 4),
+            "p99": round(percentile(self.latencies, 99), 4),
+            "max": round(max(self.latencies, default=0.0), 4),
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items(), key=str)},
+        }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    rps: float,
+    duration: float,
+) -> ScenarioResult:
+    """Fire ``rps * duration`` requests on a fixed schedule and record each latency"""
+    result = ScenarioResult(name=name, target_rps=rps, duration=duration)
+    build = SCENARIOS[name]
+    total = int(rps * duration)
+    started = time.monotonic()
+
+    async def fire(i: int, scheduled: float) -> None:
+        method, path, body = build(i)
+        try:
+            response = await client.request(method, path, json=body)
+            result.statuses[response.status_code] += 1
+            if response.status_code >= 400:
+                result.errors += 1
+        except httpx.HTTPError as e:
+            result.statuses[type(e).__name__] += 1
+            result.errors += 1
+        result.latencies.append(time.monotonic() - scheduled)
+
+    tasks = []
+    for i in range(total):
+        scheduled = started + i / rps
+        delay = scheduled - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(fire(i, scheduled)))
+    await asyncio.gather(*tasks)
+    result.elapsed = time.monotonic() - started
+    return result
+
+
+@contextmanager
+def in_process_app(
+    jobs_path: str,
+    latency: str = "lognormal",
+    median: float = 1.0,
+    sigma: float = 0.5,
+    tail_probability: float = 0.02,
+    tail_multiplier: float = 8.0,
+    error_rate: float = 0.0,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> Iterator[Any]:
+    """The app wired to a fresh job queue and a simulated provider, restored afterwards"""
+    from main import app
+    from app.agents import pr_generator_mock
+    from app.api.v1.press_releases import job_workers
+    from app.core.jobs import SQLiteJobQueue
+
+    original = (pr_generator_mock.simulator, job_workers.queue, job_workers.workers)
+    pr_generator_mock.simulator = pr_generator_mock.LatencySimulator(
+        distribution=latency,
+        median_seconds=median,
+        sigma=sigma,
+        tail_probability=tail_probability,
+        tail_multiplier=tail_multiplier,
+        error_rate=error_rate,
+        seed=seed,
+    )
+    job_workers.queue = SQLiteJobQueue(jobs_path)
+    if workers is not None:
+        job_workers.workers = workers
+    try:
+        yield app
+    finally:
+        pr_generator_mock.simulator, job_workers.queue, job_workers.workers = original
+
+
+async def seed_database(path: str, releases: int):
+    """A SQLite database at ``path`` holding ``releases`` published press releases"""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from app.core.database import Base
+    from app.models.press_release import PressRelease
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    async with sessions() as db:
+        db.add_all([
+            PressRelease(
+                company_name=COMPANIES[i % 3].split(".")[0],
+                company_domain=COMPANIES[i % 3],
+                company_email=f"press@{COMPANIES[i % 3]}",
+                headline=f"Load test release {i}",
+                body=SAMPLE_RELEASE,
+                slug=f"load-test-release-{i}",
+                status="published",
+                publish_date=started + timedelta(hours=i),
+            )
+            for i in range(releases)
+        ])
+        await db.commit()
+    return engine, sessions
+
+
+async def run_load_test(
+    rates: Dict[str, float],
+    duration: float,
+    base_url: Optional[str] = None,
+    timeout: float = 120.0,
+    releases: int = 500,
+    **simulation: Any,
+) -> List[ScenarioResult]:
+    """Run every scenario in ``rates`` concurrently for ``duration`` seconds
+
+    In-process runs list and search a temporary database seeded with ``releases``
+    press releases.
+    """
+    unknown = set(rates) - set(SCENARIOS)
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+            return await _run_scenarios(client, rates, duration)
+
+    from app.api.v1.press_releases import job_workers
+    from app.core.database import get_db, get_read_db
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            in_process_app(os.path.join(tmp, "jobs.db"), **simulation) as app:
+        engine, sessions = await seed_database(os.path.join(tmp, "presswire.db"), releases)
+
+        async def load_test_db():
+            async with sessions() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = app.dependency_overrides[get_read_db] = load_test_db
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://loadtest", timeout=timeout, limits=limits
+            ) as client:
+                await job_workers.start()
+                try:
+                    return await _run_scenarios(client, rates, duration)
+                finally:
+                    await job_workers.stop()
+                    await job_workers.queue.close()
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_db, None)
+            await engine.dispose()
+
+
+async def _run_scenarios(client: httpx.AsyncClient, rates: Dict[str, float], duration: float) -> List[ScenarioResult]:
+    return list(await asyncio.gather(
+        *(run_scenario(client, name, rps, duration) for name, rps in rates.items())
+    ))
+
+
+def format_report(results: List[ScenarioResult]) -> str:
+    header = f"{'scenario':<10} {'reqs':>6} {'rps':>8} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        row = result.as_dict()
+        lines.append(
+            f"{row['scenario']:<10} {row['requests']:>6} {row['throughput_rps']:>8.2f} "
+            f"{100 * row['error_rate']:>6.2f} {row['p50']:>8.3f} {row['p95']:>8.3f} "
+            f"{row['p99']:>8.3f} {row['max']:>8.3f}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_rate(value: str) -> Tuple[str, float]:
+    name, _, rps = value.partition("=")
+    if name not in SCENARIOS or not rps:
+        raise argparse.ArgumentTypeError(f"expected one of {', '.join(SCENARIOS)} as NAME=RPS")
+    return name, float(rps)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rate", action="append", type=_parse_rate, metavar="NAME=RPS",
+                        help="scenario request rate (repeatable; default generate=5 enhance=5 list=20)")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per run")
+    parser.add_argument("--base-url", help="load a running server instead of the in-process app")
+    parser.add_argument("--latency", default="lognormal", choices=["none", "fixed", "lognormal", "long_tail"])
+    parser.add_argument("--median", type=float, default=1.0, help="median simulated LLM latency (s)")
+    parser.add_argument("--sigma", type=float, default=0.5, help="lognormal shape")
+    parser.add_argument("--tail-probability", type=float, default=0.02)
+    parser.add_argument("--tail-multiplier", type=float, default=8.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="simulated provider error rate")
+    parser.add_argument("--workers", type=int, help="generation job workers (in-process only)")
+    parser.add_argument("--releases", type=int, default=500, help="releases to seed for listing and search (in-process only)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    rates = dict(args.rate or [("generate", 5), ("enhance", 5), ("list", 20)])
+    simulation = {} if args.base_url else {
+        "latency": args.latency,
+        "median": args.median,
+        "sigma": args.sigma,
+        "tail_probability": args.tail_probability,
+        "tail_multiplier": args.tail_multiplier,
+        "error_rate": args.error_rate,
+        "workers": args.workers,
+        "seed": args.seed,
+    }
+    results = asyncio.run(run_load_test(
+        rates, args.duration, base_url=args.base_url, releases=args.releases, **simulation
+    ))
+    if args.json:
+        print(json.dumps([result.as_dict() for result in results], indent=2))
+    else:
+        print(format_report(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Write-throughput benchmark for the embedded SQLite mode
+
+Runs the same workload - concurrent coroutines each inserting releases
+one at a time while readers page the listing - three ways:
+
+    default   plain aiosqlite engine, rollback journal, one commit per write
+    tuned     create_database_engine (WAL, mmap, cache pragmas), one commit per write
+    queued    tuned engine with writes batched by SQLiteWriteQueue
+
+    python tests/load/sqlite_writes.py --writers 50 --writes 40 --readers 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base, create_database_engine
+from app.core.sqlite_writer import SQLiteWriteQueue, begin_write
+from app.models.press_release import PressRelease
+from app.services.press_releases import list_press_release_page
+
+MODES = ("default", "tuned", "queued")
+
+
+def make_release(writer: int, i: int) -> PressRelease:
+    return PressRelease(
+        company_name="Galway Widgets",
+        company_domain="galwaywidgets.ie",
+        company_email="press@galwaywidgets.ie",
+        headline=f"Release {writer}-{i}",
+        body="Galway Widgets today opened a new precision manufacturing plant in Oranmore, creating 50 jobs.",
+        slug=f"release-{writer}-{i}",
+        status="published",
+        publish_date=datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=writer * 10000 + i),
+    )
+
+
+async def run_mode(mode: str, path: str, writers: int, writes: int, readers: int) -> Dict[str, Any]:
+    url = f"sqlite+aiosqlite:///{path}"
+    engine = create_async_engine(url) if mode == "default" else create_database_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    queue = SQLiteWriteQueue(sessions) if mode == "queued" else None
+    errors, reads = 0, 0
+    writing = True
+
+    async def insert(db: AsyncSession, release: PressRelease) -> None:
+        db.add(release)
+
+    async def writer(n: int) -> None:
+        nonlocal errors
+        for i in range(writes):
+            try:
+                if queue is not None:
+                    await queue.submit(lambda db, r=make_release(n, i): insert(db, r))
+                else:
+                    async with sessions() as db:
+                        if mode != "default":
+                            await begin_write(db)
+                        db.add(make_release(n, i))
+                        await db.commit()
+            except OperationalError:
+                errors += 1  # "database is locked" once the busy timeout runs out
+
+    async def reader() -> None:
+        nonlocal reads
+        while writing:
+            async with sessions() as db:
+                await list_press_release_page(db, limit=20)
+            reads += 1
+
+    reader_tasks = [asyncio.create_task(reader()) for _ in range(readers)]
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(n) for n in range(writers)))
+    elapsed = time.perf_counter() - started
+    writing = False
+    await asyncio.gather(*reader_tasks)
+    if queue is not None:
+        await queue.stop()
+    await engine.dispose()
+
+    committed = writers * writes - errors
+    return {
+        "mode": mode,
+        "writes": committed,
+        "errors": errors,
+        "seconds": elapsed,
+        "writes_per_second": committed / elapsed,
+        "reads": reads,
+        "transactions": queue.batches if queue is not None else committed,
+    }
+
+
+async def run_benchmark(writers: int, writes: int, readers: int) -> list:
+    results = []
+    for mode in MODES:
+        with tempfile.TemporaryDirectory() as tmp:
+            results.append(await run_mode(mode, os.path.join(tmp, "bench.db"), writers, writes, readers))
+    return results
+
+
+def format_report(results: list) -> str:
+    header = f"{'mode':<8} {'writes':>7} {'errors':>7} {'txns':>6} {'writes/s':>9} {'speedup':>8} {'reads':>6}"
+    lines = [header, "-" * len(header)]
+    baseline = results[0]["writes_per_second"] or 1.0
+    for row in results:
+        lines.append(
+            f"{row['mode']:<8} {row['writes']:>7} {row['errors']:>7} {row['transactions']:>6} "
+            f"{row['writes_per_second']:>9.0f} {row['writes_per_second'] / baseline:>7.1f}x {row['reads']:>6}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=50, help="concurrent writing coroutines")
+    parser.add_argument("--writes", type=int, default=40, help="inserts per writer")
+    parser.add_argument("--readers", type=int, default=4, help="concurrent coroutines paging the listing")
+    args = parser.parse_args()
+    print(format_report(asyncio.run(run_benchmark(args.writers, args.writes, args.readers))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Short load runs that check the harness and catch gross latency regressions
+
+They run on the wall clock, so the latency and throughput bounds are
+deliberately loose: a busy CI machine must not fail them, a request that
+hangs or a scenario that stalls still does.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from loadtest import percentile, run_load_test
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_mixed_load_meets_rate_and_latency():
+    """At a sustainable rate every scenario keeps up and latency tracks the simulated provider"""
+    results = asyncio.run(run_load_test(
+        {"generate": 20, "enhance": 10, "list": 40},
+        duration=1.5,
+        latency="fixed",
+        median=0.05,
+        workers=4,
+    ))
+    by_name = {result.name: result.as_dict() for result in results}
+
+    for name, rps in (("generate", 20), ("enhance", 10), ("list", 40)):
+        row = by_name[name]
+        assert row["requests"] == int(rps * 1.5)
+        assert row["error_rate"] == 0
+        assert row["throughput_rps"] > 0.25 * rps
+    assert 0.05 <= by_name["generate"]["p50"] < 2.0  # Never faster than the simulated provider
+    assert by_name["generate"]["p99"] < 5.0
+    assert by_name["list"]["p99"] < 2.0
+
+
+def test_injected_errors_are_reported():
+    """Provider failures surface as error responses in the report"""
+    results = asyncio.run(run_load_test(
+        {"enhance": 40},
+        duration=1.0,
+        latency="none",
+        error_rate=0.5,
+        seed=11,
+    ))
+    row = results[0].as_dict()
+    assert 0.3 < row["error_rate"] < 0.7
+    assert set(row["statuses"]) == {"200", "500"}
+
+
+if __name__ == "__main__":
+    print("🧪 Running load smoke tests")
+    for test in (test_percentile_nearest_rank, test_mixed_load_meets_rate_and_latency, test_injected_errors_are_reported):
+        test()
+        print(f"✅ {test.__name__}")